@@ -0,0 +1,47 @@
+ALL_CUSTOMERS = 'All Customers'
+
+# Nama kolom KPI -> label tampilan (sama dengan label kartu KPI di app.py)
+KPI_LABELS = {
+    "total_revenue": "Total Pendapatan",
+    "total_orders": "Total Pesanan",
+    "avg_review_score": "Rata-rata Skor Ulasan",
+    "total_customers": "Total Pelanggan",
+}
+
+
+def kpi_by_segment(master_orders_df):
+    # Semua KPI untuk setiap segmen dalam satu groupby, tanpa menyalin data.
+    # Baris 'All Customers' diturunkan dari jumlah per segmen: setiap pesanan
+    # dan pelanggan hanya punya satu segmen, jadi nunique per segmen bisa
+    # dijumlahkan; rata-rata skor dihitung ulang dari jumlah dan cacahnya.
+    grouped = master_orders_df.groupby('Segment', dropna=False).agg(
+        total_revenue=('payment_value', 'sum'),
+        total_orders=('order_id', 'nunique'),
+        review_sum=('review_score', 'sum'),
+        review_count=('review_score', 'count'),
+        total_customers=('customer_unique_id', 'nunique'),
+    )
+    totals = grouped.sum()
+
+    kpi_df = grouped[grouped.index.notna()].copy()
+    kpi_df.loc[ALL_CUSTOMERS] = totals
+    kpi_df["avg_review_score"] = kpi_df["review_sum"] / kpi_df["review_count"]
+    kpi_df[["total_orders", "total_customers"]] = kpi_df[["total_orders", "total_customers"]].astype(int)
+    kpi_df.index.name = 'Segment'
+    return kpi_df[list(KPI_LABELS)]
+
+
+def rfm_segment_summary(rfm_segmentation_df):
+    # Jumlah pelanggan dan rata-rata Recency/Frequency/Monetary per segmen
+    return (
+        rfm_segmentation_df
+        .groupby("Segment")
+        .agg(
+            customers=("customer_unique_id", "count"),
+            avg_recency=("Recency", "mean"),
+            avg_frequency=("Frequency", "mean"),
+            avg_monetary=("Monetary", "mean"),
+        )
+        .round(2)
+        .reset_index()
+    )
@@ -0,0 +1,185 @@
+"""API HTTP/JSON lokal untuk angka-angka agregat dashboard.
+
+Alat lain bisa mengambil KPI, pendapatan bulanan atau rata-rata RFM tanpa
+menjalankan ulang skrip Streamlit dan tanpa merender grafik apa pun.
+
+Contoh pemakaian:
+
+    python dashboard/api_server.py --port 8600
+    curl -i http://127.0.0.1:8600/kpi?segment=Champions
+
+Endpoint:
+    /health            sidik jari data yang sedang dilayani
+    /kpi               KPI semua segmen (?segment=... untuk satu segmen)
+    /monthly-revenue   pendapatan bulanan
+    /orders-monthly    jumlah pesanan bulanan
+    /rfm/segments      jumlah pelanggan dan rata-rata RFM per segmen
+
+Setiap respons membawa ETag yang diturunkan dari sidik jari file data.
+Klien yang mengirim If-None-Match dengan ETag yang sama mendapat 304 tanpa body.
+"""
+import argparse
+import hashlib
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import aggregates            # Agregasi KPI yang sama dengan app.py
+import data_loader           # Pemuatan data CSV tanpa ketergantungan Streamlit
+
+
+def _records(df):
+    # DataFrame -> list of dict yang bisa di-JSON-kan (tanggal dalam format ISO)
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def _kpi(data, params):
+    kpi_df = aggregates.kpi_by_segment(data["master_orders_df"]).reset_index()
+    segment = params.get("segment")
+    if segment is not None:
+        kpi_df = kpi_df[kpi_df["Segment"] == segment]
+        if kpi_df.empty:
+            return None
+        return _records(kpi_df)[0]
+    return _records(kpi_df)
+
+
+def _monthly_revenue(data, params):
+    return _records(data["monthly_revenue_df"])
+
+
+def _orders_monthly(data, params):
+    return _records(data["orders_monthly_df"])
+
+
+def _rfm_segments(data, params):
+    return _records(aggregates.rfm_segment_summary(data["rfm_segmentation_df"]))
+
+
+# Path -> (fungsi, parameter query yang dibaca fungsi tersebut). Parameter lain
+# (misal ?t=<timestamp> untuk cache-busting) diabaikan, sehingga tidak menambah
+# entri cache respons dan tidak mengubah ETag.
+ENDPOINTS = {
+    "/kpi": (_kpi, ("segment",)),
+    "/monthly-revenue": (_monthly_revenue, ()),
+    "/orders-monthly": (_orders_monthly, ()),
+    "/rfm/segments": (_rfm_segments, ()),
+}
+
+
+class AggregateStore:
+    # Data dan respons JSON yang di-cache per sidik jari file sumber.
+    # Jika salah satu CSV berubah, data dimuat ulang dan cache respons dikosongkan.
+
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir
+        self.fingerprint = None
+        self.data = None
+        self.responses = {}
+        self.lock = threading.Lock()
+
+    def current(self):
+        fingerprint = data_loader.source_fingerprint(self.data_dir)
+        with self.lock:
+            if fingerprint != self.fingerprint:
+                self.data = data_loader.load_data_dict(self.data_dir)
+                self.fingerprint = fingerprint
+                self.responses = {}
+            return self.fingerprint, self.data
+
+    def response(self, path, params):
+        # Kembalikan (etag, body) atau None jika resource tidak ditemukan
+        fingerprint, data = self.current()
+        accepted = ENDPOINTS[path][1] if path in ENDPOINTS else ()
+        params = {name: value for name, value in params.items() if name in accepted}
+        cache_key = (fingerprint, path, tuple(sorted(params.items())))
+        cached = self.responses.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if path == "/health":
+            payload = {"status": "ok", "fingerprint": fingerprint}
+        else:
+            payload = ENDPOINTS[path][0](data, params)
+            if payload is None:
+                return None
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        etag = '"' + hashlib.sha1(repr(cache_key).encode()).hexdigest() + '"'
+        with self.lock:
+            self.responses[cache_key] = (etag, body)
+        return etag, body
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match boleh berisi beberapa ETag, termasuk ETag lemah (W/"...")
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def make_handler(store):
+    class AggregateHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            path = url.path.rstrip("/") or "/"
+            if path != "/health" and path not in ENDPOINTS:
+                return self._send_json(404, {"error": f"Endpoint {path} tidak dikenal", "endpoints": ["/health", *ENDPOINTS]})
+
+            result = store.response(path, dict(parse_qsl(url.query)))
+            if result is None:
+                return self._send_json(404, {"error": "Data tidak ditemukan"})
+            etag, body = result
+
+            if _etag_matches(self.headers.get("If-None-Match"), etag):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return AggregateHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API JSON lokal untuk agregat dashboard.")
+    parser.add_argument("--host", default="127.0.0.1", help="Alamat bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8600, help="Port (default: 8600)")
+    parser.add_argument("--data-dir", default=None, help="Folder CSV sumber (default: folder dashboard)")
+    args = parser.parse_args(argv)
+
+    store = AggregateStore(args.data_dir)
+    store.current()  # Muat data sekali di awal agar permintaan pertama tidak lambat
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(store))
+    print(f"Melayani agregat dashboard di http://{args.host}:{args.port}/ (Ctrl+C untuk berhenti)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,100 +1,72 @@
 import streamlit as st       # Untuk membangun aplikasi web interaktif
-import pandas as pd          # Untuk manipulasi dan analisis data
-import numpy as np           # Untuk operasi numerik
-import matplotlib.pyplot as plt # Untuk membuat plot statis
-import seaborn as sns        # Untuk visualisasi statistik yang lebih indah
-import matplotlib.ticker as mticker # Untuk format sumbu plot
-from pathlib import Path              # Untuk manajemen path file
+
+import aggregates            # Agregasi KPI yang dipakai bersama (tanpa Streamlit)
+import cache                 # Cache terbatas (memori, LRU/TTL) untuk data, agregat dan grafik
+import charts                # Fungsi pembuat grafik (dipakai bersama skrip ekspor)
+import cohorts               # Matriks retensi kohort pelanggan (vektorisasi numpy)
+import customer_index        # Indeks pelanggan -> pesanan untuk drill-down
+import data_loader           # Pemuatan data CSV tanpa ketergantungan Streamlit
+import leaderboard           # Top-K pelanggan dengan seleksi parsial (argpartition)
+import quantile_sketch       # Sketsa kuantil (t-digest) untuk persentil waktu pengiriman
+import figure_encoding       # Pemilihan format/DPI gambar sesuai batas ukuran
 
 st.set_page_config(layout="wide")
 
-# --- Atur gaya Matplotlib untuk latar belakang gelap ---
-# Blok ini memastikan gaya tema gelap yang konsisten untuk semua plot
-plt.style.use('dark_background')
-plt.rcParams.update({
-    "figure.facecolor": "black",
-    "axes.facecolor": "black",
-    "savefig.facecolor": "black",
-    "text.color": "white",
-    "axes.labelcolor": "white",
-    "xtick.color": "white",
-    "ytick.color": "white",
-    "grid.color": "gray",
-    "axes.edgecolor": "white",
-    "patch.edgecolor": "white",
-    "axes.titlecolor": "white",
-    "legend.labelcolor": "white",
-    "legend.title_fontsize": 'medium', # Pastikan judul legenda terlihat
-    "legend.fontsize": 'small',        # Pastikan label legenda terlihat
-})
+# Gaya Matplotlib (tema gelap) dipasang oleh charts.py sekali per proses, saat
+# grafik pertama digambar; matplotlib/seaborn tidak diimpor sebelum itu.
 
 # --- Muat Data ---
-@st.cache_data
-def load_data():
-
-    BASE_DIR = Path(__file__).resolve().parent
-
-    # Muat semua file CSV yang diperlukan (menggunakan Path agar path relatif always benar)
-    master_orders_df = pd.read_csv(BASE_DIR / 'master_orders.csv')
-    monthly_revenue_df = pd.read_csv(BASE_DIR / 'monthly_revenue.csv')
-    orders_monthly_df = pd.read_csv(BASE_DIR / 'orders_monthly.csv')
-    category_review_scores_df = pd.read_csv(BASE_DIR / 'category_review_scores.csv')
-    state_review_summary_df = pd.read_csv(BASE_DIR / 'state_review_summary.csv')
-    high_value_product_preferences_df = pd.read_csv(BASE_DIR / 'high_value_product_preferences.csv', index_col=0)
-    customer_value_df = pd.read_csv(BASE_DIR / 'customer_value.csv')
-    payment_customer_df = pd.read_csv(BASE_DIR / 'payment_customer.csv')
-    items_products_df = pd.read_csv(BASE_DIR / 'items_products.csv') # Baru: Muat items_products
-
-    # Konversi kolom 'month' ke objek datetime
-    monthly_revenue_df['month'] = pd.to_datetime(monthly_revenue_df['month'])
-    orders_monthly_df['month'] = pd.to_datetime(orders_monthly_df['month'])
-
-    # Konversi kolom tanggal di master_orders_df
-    date_cols = [
-        'order_purchase_timestamp', 'order_approved_at',
-        'order_delivered_carrier_date', 'order_delivered_customer_date',
-        'order_estimated_delivery_date'
-    ]
-    for col in date_cols:
-        master_orders_df[col] = pd.to_datetime(master_orders_df[col], errors='coerce') # Gunakan errors='coerce' untuk menangani masalah parsing
-
-    # Pastikan customer_unique_id bertipe string untuk penggabungan yang kuat
-    master_orders_df['customer_unique_id'] = master_orders_df['customer_unique_id'].astype(str)
-
-    # Muat rfm_segmentation_df dan pastikan 'customer_unique_id' dan 'Segment' ditangani dengan benar
-    rfm_segmentation_df = pd.read_csv(BASE_DIR / 'rfm_segmentation.csv')
-    rfm_segmentation_df['customer_unique_id'] = rfm_segmentation_df['customer_unique_id'].astype(str)
-    # Pastikan kolom 'Segment' ada dan bertipe string
-    if 'Segment' not in rfm_segmentation_df.columns:
-        st.error("Error: Kolom 'Segment' tidak ditemukan di rfm_segmentation.csv. Pastikan CSV berisi data tersegmentasi.")
-        # Fallback atau munculkan error jika Segment penting dan hilang
-        rfm_segmentation_df['Segment'] = 'Unknown'
-    rfm_segmentation_df['Segment'] = rfm_segmentation_df['Segment'].astype(str)
-
-    # Hapus kolom 'Segment' yang ada dari master_orders_df jika ada, untuk menghindari masalah dengan kolom yang kadaluarsa
-    if 'Segment' in master_orders_df.columns:
-        master_orders_df = master_orders_df.drop(columns=['Segment'])
-
-    # Gabungkan 'Segment' yang ada dari rfm_segmentation_df kembali ke master_orders_df
-    master_orders_df = master_orders_df.merge(
-        rfm_segmentation_df[['customer_unique_id', 'Segment']],
-        on='customer_unique_id',
-        how='left'
-    )
+# Sidik jari file sumber (nama, ukuran, waktu modifikasi) menjadi argumen semua
+# fungsi ber-cache di bawah ini: mengganti salah satu CSV otomatis membuat data,
+# agregat dan grafik turunannya dihitung ulang. Cache dibagikan ke semua sesi
+# tanpa menyalin DataFrame (lihat cache.py).
+data_fingerprint = data_loader.source_fingerprint()
 
-    return (
-        master_orders_df, monthly_revenue_df, orders_monthly_df,
-        rfm_segmentation_df, category_review_scores_df, state_review_summary_df,
-        high_value_product_preferences_df, customer_value_df, payment_customer_df,
-        items_products_df
-    )
+
+@cache.memoize(cache.DATA)
+def load_data(fingerprint):
+    # Logika pemuatan ada di data_loader.py agar bisa dipakai ulang oleh skrip CLI
+    return data_loader.load_data(on_error=st.error)
 
 (
     master_orders_df, monthly_revenue_df, orders_monthly_df,
     rfm_segmentation_df, category_review_scores_df, state_review_summary_df,
     high_value_product_preferences_df, customer_value_df, payment_customer_df,
     items_products_df
-) = load_data()
+) = load_data(data_fingerprint)
+
+
+@cache.memoize(cache.AGGREGATES)
+def get_customer_index(fingerprint):
+    # Dibangun sekali per versi data dan dibagikan ke semua sesi tanpa disalin
+    master_orders_df, _, _, rfm_segmentation_df, _, _, _, _, _, items_products_df = load_data(fingerprint)
+    return customer_index.CustomerIndex(master_orders_df, items_products_df, rfm_segmentation_df)
+
+
+@cache.memoize(cache.AGGREGATES)
+def get_leaderboard(fingerprint):
+    # Tabel dan indeks kelompok dibangun sekali per versi data; hasil top-K per
+    # (metrik, K, kelompok) di-cache terpisah oleh get_top_customers (cache.AGGREGATES)
+    return leaderboard.Leaderboard(load_data(fingerprint)[3], get_customer_index(fingerprint))
+
+
+@cache.memoize(cache.AGGREGATES)
+def get_top_customers(fingerprint, metric, k, group_by, group_value):
+    # Satu entri cache per kombinasi (metrik, K, kelompok); memorinya dihitung dalam anggaran cache
+    return get_leaderboard(fingerprint).top(metric, k, group_by, group_value)
+
+
+@cache.memoize(cache.AGGREGATES)
+def get_delivery_sketches(fingerprint):
+    # Satu t-digest per (skor ulasan, negara bagian, kategori), dibangun sekali
+    master_orders_df, *_, items_products_df = load_data(fingerprint)
+    return quantile_sketch.build_delivery_sketches(master_orders_df, items_products_df)
+
+
+@cache.memoize(cache.AGGREGATES)
+def get_delivery_percentiles(fingerprint, by, filters):
+    # Hasil penggabungan digest per (pengelompokan, filter), di-cache seperti agregat lain
+    return get_delivery_sketches(fingerprint).query(by=by, filters=filters)
 
 
 # --- Judul Dashboard ---
@@ -113,37 +85,257 @@ selected_section = st.sidebar.radio(
     ]
 )
 
-# --- Filter Segment untuk KPI ---
-all_segments = ['All Customers'] + list(master_orders_df['Segment'].dropna().unique())
-selected_segment_for_kpi = st.sidebar.selectbox(
-    "Filter KPI berdasarkan Segmen Pelanggan:",
-    options=all_segments
+# --- Pengaturan Tampilan Grafik ---
+# Lebar tampilan klien menentukan DPI gambar; piksel di atas lebar ini hanya membuang bandwidth
+chart_viewport_width = st.sidebar.select_slider(
+    "Lebar tampilan grafik (px):",
+    options=[800, 1200, 1600, 2400],
+    value=1200
 )
+show_chart_sizes = st.sidebar.checkbox("Tampilkan ukuran gambar grafik", value=False)
+page_size_placeholder = st.sidebar.empty()
+encoded_page_bytes = []
+
+
+def show_chart(key, plot_func, *args, columns=1, params=()):
+    # Pengganti st.pyplot: gambar grafik dengan plot_func(*args), encode sesuai batas
+    # ukuran per grafik dan lebar tampilan, lalu simpan hasilnya di cache.FIGURES.
+    # Rerun berikutnya (dari sesi mana pun) dengan data, lebar tampilan dan params
+    # yang sama langsung memakai gambar yang sudah di-encode tanpa matplotlib.
+    # args harus berasal dari data bertanda data_fingerprint; nilai widget lain yang
+    # memengaruhi grafik dimasukkan ke params (hashable).
+    # Mengembalikan None jika plot_func tidak menghasilkan grafik.
+    policy = figure_encoding.policy_for(key)
+    viewport_width = chart_viewport_width // columns
+
+    def render():
+        fig = plot_func(*args)
+        if fig is None:
+            return None
+        encoded = figure_encoding.encode_figure(
+            fig,
+            byte_budget=policy.byte_budget,
+            viewport_width=viewport_width,
+            simple=policy.simple
+        )
+        charts.close(fig)
+        return encoded
+
+    encoded = cache.FIGURES.get_or_compute(
+        (key, plot_func.__code__, data_fingerprint, viewport_width, policy, params), render,
+        tag=data_fingerprint,
+    )
+    if encoded is None:
+        return None
+    st.image(encoded.data.decode("utf-8") if encoded.format == "svg" else encoded.data)
+    encoded_page_bytes.append(encoded.nbytes)
+    if show_chart_sizes:
+        dpi_label = f" @ {encoded.dpi} dpi" if encoded.dpi else ""
+        st.caption(
+            f"{encoded.format.upper()}{dpi_label} · {figure_encoding.format_size(encoded.nbytes)}"
+            f" (batas {figure_encoding.format_size(policy.byte_budget)})"
+        )
+    return encoded
+
+
+# --- KPI untuk semua segmen (satu groupby, di-cache) ---
+@cache.memoize(cache.AGGREGATES)
+def get_kpi_table(fingerprint):
+    return aggregates.kpi_by_segment(load_data(fingerprint)[0])
+
+
+# --- Retensi kohort (satu np.bincount atas seluruh pesanan, di-cache) ---
+@cache.memoize(cache.AGGREGATES)
+def get_cohort_retention(fingerprint):
+    # Kode pelanggan diambil dari indeks yang sudah di-cache, tanpa factorize id string lagi
+    return cohorts.cohort_retention(load_data(fingerprint)[0], get_customer_index(fingerprint).row_codes())
+
+
+# --- Fragmen (bagian yang dijalankan ulang secara terpisah) ---
+# Setiap fungsi @st.fragment hanya dijalankan ulang saat widget DI DALAM fragmen
+# tersebut berubah; widget di sidebar (bagian, lebar grafik) tetap memicu rerun penuh.
+# Dependensi tiap fragmen dicatat di komentarnya. Catatan: fragmen tidak boleh
+# menulis ke st.sidebar, jadi filter KPI berada di area utama di atas kartu KPI.
+
+@st.fragment
+def kpi_panel():
+    # Bergantung pada: widget selected_segment_for_kpi, get_kpi_table() (cache.AGGREGATES).
+    # Mengganti segmen hanya menjalankan ulang kartu KPI, bukan grafik di bagian aktif;
+    # saat berpindah bagian, fragmen ini hanya membaca tabel KPI yang sudah di-cache.
+    kpi_table_df = get_kpi_table(data_fingerprint)
+
+    # --- Filter Segment untuk KPI ---
+    all_segments = [aggregates.ALL_CUSTOMERS] + [s for s in kpi_table_df.index if s != aggregates.ALL_CUSTOMERS]
+    selected_segment_for_kpi = st.selectbox(
+        "Filter KPI berdasarkan Segmen Pelanggan:",
+        options=all_segments,
+        key="selected_segment_for_kpi"
+    )
+
+    # --- Ambil KPI segmen yang dipilih dari tabel (tanpa memfilter/menyalin master_orders_df) ---
+    kpi_row = kpi_table_df.loc[selected_segment_for_kpi]
+    total_revenue_kpi = kpi_row['total_revenue']
+    total_orders_kpi = int(kpi_row['total_orders'])
+    average_review_score_kpi = kpi_row['avg_review_score']
+    total_customers_kpi = int(kpi_row['total_customers'])
+
+    # --- Kartu KPI ---
+    st.subheader(f"Indikator Kinerja Utama (KPI) untuk {selected_segment_for_kpi}")
+    col_kpi1, col_kpi2, col_kpi3, col_kpi4 = st.columns(4)
+
+    with col_kpi1:
+        st.metric(label="Total Pendapatan", value=f"R${total_revenue_kpi:,.2f}")
+    with col_kpi2:
+        st.metric(label="Total Pesanan", value=f"{total_orders_kpi:,}")
+    with col_kpi3:
+        st.metric(label="Rata-rata Skor Ulasan", value=f"{average_review_score_kpi:.2f} / 5.0")
+    with col_kpi4:
+        st.metric(label="Total Pelanggan", value=f"{total_customers_kpi:,}")
+
+    with st.expander("Perbandingan KPI Antar Segmen"):
+        st.dataframe(
+            kpi_table_df.rename(columns=aggregates.KPI_LABELS)
+            .style.format({
+                "Total Pendapatan": "R$ {:,.2f}",
+                "Total Pesanan": "{:,}",
+                "Rata-rata Skor Ulasan": "{:.2f}",
+                "Total Pelanggan": "{:,}",
+            })
+        )
+        # Isi expander tetap dieksekusi walau tertutup, jadi grafik hanya digambar jika diminta
+        if st.toggle("Tampilkan grafik perbandingan", value=False):
+            show_chart("kpi_comparison", charts.plot_kpi_comparison, kpi_table_df)
 
-# Filter data untuk KPI berdasarkan segmen yang dipilih
-if selected_segment_for_kpi == 'All Customers':
-    kpi_data_df = master_orders_df.copy()
-else:
-    kpi_data_df = master_orders_df[master_orders_df['Segment'] == selected_segment_for_kpi].copy()
-
-# --- Hitung KPI berdasarkan data yang difilter ---
-total_revenue_kpi = kpi_data_df['payment_value'].sum()
-total_orders_kpi = kpi_data_df['order_id'].nunique()
-average_review_score_kpi = kpi_data_df['review_score'].mean()
-total_customers_kpi = kpi_data_df['customer_unique_id'].nunique()
-
-# --- Kartu KPI ---
-st.subheader(f"Indikator Kinerja Utama (KPI) untuk {selected_segment_for_kpi}")
-col_kpi1, col_kpi2, col_kpi3, col_kpi4 = st.columns(4)
-
-with col_kpi1:
-    st.metric(label="Total Pendapatan", value=f"R${total_revenue_kpi:,.2f}")
-with col_kpi2:
-    st.metric(label="Total Pesanan", value=f"{total_orders_kpi:,}")
-with col_kpi3:
-    st.metric(label="Rata-rata Skor Ulasan", value=f"{average_review_score_kpi:.2f} / 5.0")
-with col_kpi4:
-    st.metric(label="Total Pelanggan", value=f"{total_customers_kpi:,}")
+
+@st.fragment
+def top_customers_panel():
+    # Bergantung pada: widget leaderboard (metrik, K, kelompok) dan drill-down pelanggan,
+    # get_leaderboard() dan get_customer_index() (cache.AGGREGATES).
+    # Drill-down memakai hasil leaderboard, jadi keduanya berada di fragmen yang sama.
+    with st.expander("Top Pelanggan Berdasarkan Total Pengeluaran"):
+        st.subheader("Top Pelanggan Berdasarkan Total Pengeluaran")
+        customers_board = get_leaderboard(data_fingerprint)
+        col_metric, col_k, col_group, col_group_value = st.columns(4)
+        with col_metric:
+            ranking_metric_label = st.selectbox("Urutkan berdasarkan:", options=list(leaderboard.METRICS))
+        with col_k:
+            top_k = st.number_input("Jumlah pelanggan (K):", min_value=1, max_value=1000, value=10, step=5)
+        with col_group:
+            ranking_group_label = st.selectbox("Kelompokkan per:", options=["Semua Pelanggan"] + list(leaderboard.GROUPS))
+        ranking_group = leaderboard.GROUPS.get(ranking_group_label)
+        ranking_group_value = None
+        if ranking_group is not None:
+            with col_group_value:
+                ranking_group_value = st.selectbox(f"{ranking_group_label}:", options=customers_board.group_values(ranking_group))
+
+        top_customers_spending = (
+            get_top_customers(data_fingerprint, leaderboard.METRICS[ranking_metric_label], int(top_k), ranking_group, ranking_group_value)
+            .rename(columns={'Monetary': 'Total Pengeluaran', 'customer_state': 'Negara Bagian'})
+        )
+        st.dataframe(
+            top_customers_spending[['customer_unique_id', 'Segment', 'Negara Bagian', 'Total Pengeluaran', 'Frequency', 'Jumlah Pesanan', 'Recency']]
+            .style.format({"Total Pengeluaran": "R$ {:,.2f}"})
+        )
+        st.markdown("""
+        **Insight**: Pelanggan teratas berdasarkan total pengeluaran menunjukkan bahwa nilai transaksi tertinggi seringkali berasal dari pembelian tunggal atau sangat sedikit dengan nilai pesanan yang sangat besar, bukan frekuensi pembelian yang tinggi. Ini menyoroti segmen pelanggan 'High Value' yang didorong oleh besarnya nilai setiap transaksi.
+        """
+        )
+
+    with st.expander("Drill-down Pelanggan"):
+        st.subheader("Drill-down Pelanggan")
+        customers_idx = get_customer_index(data_fingerprint)
+        col_pick, col_manual = st.columns(2)
+        with col_pick:
+            picked_customer_id = st.selectbox(
+                "Pilih dari pelanggan teratas:",
+                options=list(top_customers_spending['customer_unique_id'])
+            )
+        with col_manual:
+            typed_customer_id = st.text_input("Atau masukkan customer_unique_id:").strip()
+        drilldown_customer_id = typed_customer_id or picked_customer_id
+
+        if not drilldown_customer_id:
+            st.write("Tidak ada pelanggan untuk ditampilkan.")
+        elif drilldown_customer_id not in customers_idx:
+            st.write(f"Pelanggan `{drilldown_customer_id}` tidak ditemukan.")
+        else:
+            customer_rfm = customers_idx.rfm(drilldown_customer_id)
+            customer_orders = customers_idx.orders(drilldown_customer_id)
+            customer_items = customers_idx.items(drilldown_customer_id)
+
+            col_seg, col_rec, col_freq, col_mon = st.columns(4)
+            if not customer_rfm.empty:
+                rfm_row = customer_rfm.iloc[0]
+                col_seg.metric(label="Segmen", value=rfm_row['Segment'])
+                col_rec.metric(label="Recency (Hari)", value=f"{rfm_row['Recency']:,.0f}")
+                col_freq.metric(label="Frequency (Pesanan)", value=f"{rfm_row['Frequency']:,.0f}")
+                col_mon.metric(label="Monetary", value=f"R${rfm_row['Monetary']:,.2f}")
+
+            st.markdown(f"**Riwayat Pesanan** ({len(customer_orders):,} pesanan)")
+            order_cols = [
+                'order_id', 'order_purchase_timestamp', 'order_status', 'customer_state',
+                'payment_value', 'delivery_time_days', 'review_score'
+            ]
+            st.dataframe(
+                customer_orders[[c for c in order_cols if c in customer_orders.columns]]
+                .sort_values('order_purchase_timestamp'),
+                hide_index=True
+            )
+            st.markdown(f"**Item yang Dibeli** ({len(customer_items):,} item)")
+            st.dataframe(customer_items, hide_index=True)
+
+
+@st.fragment
+def delivery_percentiles_panel():
+    # Bergantung pada: widget pengelompokan/filter persentil, get_delivery_sketches() (cache.AGGREGATES).
+    st.markdown("### Persentil Waktu Pengiriman (p50 / p90 / p99)")
+    delivery_sketches = get_delivery_sketches(data_fingerprint)
+    percentile_dims = {
+        "Skor Ulasan": "review_score",
+        "Negara Bagian": "customer_state",
+        "Kategori Produk": "product_category_name_english",
+    }
+    col_by, col_filter_dim, col_filter_value = st.columns(3)
+    with col_by:
+        percentile_by_labels = st.multiselect(
+            "Kelompokkan berdasarkan:",
+            options=list(percentile_dims),
+            default=["Skor Ulasan"]
+        )
+    with col_filter_dim:
+        percentile_filter_label = st.selectbox(
+            "Filter tambahan:",
+            options=["Tanpa Filter"] + list(percentile_dims)
+        )
+    percentile_filters = ()
+    if percentile_filter_label != "Tanpa Filter":
+        percentile_filter_dim = percentile_dims[percentile_filter_label]
+        with col_filter_value:
+            percentile_filter_value = st.selectbox(
+                f"{percentile_filter_label}:",
+                options=delivery_sketches.dim_values(percentile_filter_dim)
+            )
+        percentile_filters = ((percentile_filter_dim, percentile_filter_value),)
+
+    percentile_by = tuple(percentile_dims[label] for label in percentile_by_labels)
+    delivery_percentiles_df = get_delivery_percentiles(data_fingerprint, percentile_by, percentile_filters)
+    if len(percentile_by) == 1 and not delivery_percentiles_df.empty:
+        show_chart(
+            "delivery_percentiles", charts.plot_delivery_percentiles, delivery_percentiles_df, percentile_by[0],
+            params=(percentile_by, percentile_filters)
+        )
+    st.dataframe(
+        delivery_percentiles_df.rename(columns={"total_orders": "Jumlah Pesanan", "mean": "Rata-rata"})
+        .style.format({"Rata-rata": "{:.1f}", "p50": "{:.1f}", "p90": "{:.1f}", "p99": "{:.1f}"}),
+        hide_index=True
+    )
+    st.caption(
+        "Persentil dihitung dari sketsa t-digest per kombinasi skor x negara bagian x kategori utama pesanan "
+        "(kategori item pertama), sehingga nilainya merupakan perkiraan dengan galat kecil."
+    )
+
+
+kpi_panel()
 
 # --- Konten berdasarkan Pilihan Sidebar (menggunakan master_orders_df yang tidak difilter untuk visualisasi) ---
 
@@ -152,45 +344,7 @@ if selected_section == "Ringkasan Umum Data":
 
     with st.expander("Distribusi Variabel Numerik"):
         st.subheader("Distribusi Variabel Numerik Utama")
-        numeric_cols = [
-            "payment_value", "total_price", "total_freight",
-            "delivery_time_days", "total_items", "unique_sellers",
-            "review_score"
-        ]
-        # --- Dedicated variable for log-scaled columns ---
-        log_scaled_cols = ["payment_value", "total_price", "total_freight", "delivery_time_days"]
-
-        n_cols = 3
-        n_rows = (len(numeric_cols) + n_cols - 1) // n_cols
-
-        fig_num, axes_num = plt.subplots(n_rows, n_cols, figsize=(n_cols * 5, n_rows * 4))
-        axes_num = axes_num.flatten() # Ratakan untuk iterasi mudah
-
-        for i, col in enumerate(numeric_cols):
-            ax = axes_num[i]
-            if col in log_scaled_cols:
-                sns.histplot(master_orders_df[col].dropna(), bins=50, kde=True, log_scale=True, ax=ax, color='cyan')
-                ax.set_title(f"Distribusi {col.replace('_', ' ').title()} (Skala Log)", fontsize=10, color='white')
-            elif col in ["total_items", "unique_sellers", "review_score"]:
-                # Pastikan bins sesuai untuk nilai diskrit, misal, nilai maksimal + 1
-                bins = int(master_orders_df[col].max()) if master_orders_df[col].nunique() > 1 else 1 # Tangani kasus nilai unik tunggal
-                sns.histplot(master_orders_df[col].dropna(), bins=bins, kde=False, ax=ax, color='lime')
-                ax.set_title(f"Distribusi {col.replace('_', ' ').title()}", fontsize=10, color='white')
-            else:
-                sns.histplot(master_orders_df[col].dropna(), bins=30, kde=True, ax=ax, color='gold')
-                ax.set_title(f"Distribusi {col.replace('_', ' ').title()}", fontsize=10, color='white')
-            ax.set_xlabel(col.replace('_', ' ').title(), fontsize=8, color='white')
-            ax.set_ylabel("Frekuensi", fontsize=8, color='white')
-            ax.tick_params(axis='x', colors='white')
-            ax.tick_params(axis='y', colors='white')
-
-        for i in range(len(numeric_cols), len(axes_num)):
-            fig_num.delaxes(axes_num[i]) # Hapus subplot kosong
-
-        plt.tight_layout(rect=[0, 0, 1, 0.96]) # Sesuaikan layout untuk mencegah tumpang tindih judul
-        fig_num.suptitle("Distribusi Variabel Numerik Utama", fontsize=14, color='white')
-        st.pyplot(fig_num)
-        plt.close(fig_num)
+        show_chart("numeric_distributions", charts.plot_numeric_distributions, master_orders_df)
         st.markdown("""
         **Insight**: Visualisasi ini menunjukkan distribusi variabel numerik utama seperti nilai pembayaran, harga total, biaya pengiriman, dan waktu pengiriman. Mayoritas transaksi memiliki nilai rendah, dengan 'ekor panjang' dari transaksi bernilai tinggi. Waktu pengiriman bervariasi, dan skor ulasan cenderung tinggi. Skala log digunakan untuk mengatasi kemiringan data yang ekstrem, yang konsisten dengan pola penjualan e-commerce di mana sebagian besar transaksi bernilai kecil dan sebagian kecil bernilai sangat tinggi.
         """
@@ -202,21 +356,7 @@ if selected_section == "Ringkasan Umum Data":
 
         with col1:
             st.markdown("### Status Pesanan")
-            order_status_summary_df = master_orders_df["order_status"].value_counts(normalize=True).mul(100).round(2).reset_index(name="Percentage (%)")
-            order_status_summary_df.columns = ['order_status', 'Percentage (%)']
-            fig_status, ax_status = plt.subplots(figsize=(6, 4))
-            sns.barplot(x="Percentage (%)", y="order_status", data=order_status_summary_df, palette='viridis', ax=ax_status, hue="order_status", legend=False)
-            ax_status.set_xlabel("Persentase (%)", color='white')
-            ax_status.set_ylabel("Status Pesanan", color='white')
-            ax_status.tick_params(axis='x', colors='white')
-            ax_status.tick_params(axis='y', colors='white')
-            for index, value in enumerate(order_status_summary_df["Percentage (%)"]):
-                ax_status.text(value + 0.5, index, f'{value:.1f}%', va='center', fontsize=8, color='white')
-            # Adjust xlim to provide enough space for labels
-            ax_status.set_xlim(right=order_status_summary_df["Percentage (%)"].max() * 1.15) # Add 15% padding
-            plt.tight_layout()
-            st.pyplot(fig_status)
-            plt.close(fig_status)
+            show_chart("order_status", charts.plot_order_status, master_orders_df, columns=3)
             st.markdown("""
             **Insight**: Hampir semua pesanan berhasil dikirim ('delivered') sekitar 97%, menunjukkan efisiensi operasional yang tinggi. Persentase pesanan yang dibatalkan atau tidak tersedia sangat kecil, yang merupakan indikator positif untuk pengalaman pelanggan secara keseluruhan dan manajemen operasional.
             """
@@ -224,20 +364,7 @@ if selected_section == "Ringkasan Umum Data":
 
         with col2:
             st.markdown("### Jumlah Metode Pembayaran per Pesanan")
-            payment_types_summary_df = master_orders_df["payment_types"].value_counts(normalize=True).mul(100).round(2).reset_index(name="Percentage (%)")
-            payment_types_summary_df.columns = ['payment_types', 'Percentage (%)']
-            fig_payment, ax_payment = plt.subplots(figsize=(4, 4)) # Adjusted figsize to be more square-like for vertical bars
-            sns.barplot(x="payment_types", y="Percentage (%)", data=payment_types_summary_df, palette='plasma', ax=ax_payment, hue="payment_types", legend=False) # Vertical bar plot
-            ax_payment.set_xlabel("Jumlah Metode Pembayaran Digunakan", color='white') # Updated x-label
-            ax_payment.set_ylabel("Persentase (%)", color='white') # Updated y-label
-            ax_payment.tick_params(axis='x', colors='white')
-            ax_payment.tick_params(axis='y', colors='white')
-            for index, value in enumerate(payment_types_summary_df["Percentage (%)"]):
-                ax_payment.text(index, value + 0.5, f'{value:.1f}%', ha='center', fontsize=8, color='white')
-            ax_payment.set_ylim(top=payment_types_summary_df["Percentage (%)"].max() * 1.15)
-            plt.tight_layout()
-            st.pyplot(fig_payment)
-            plt.close(fig_payment)
+            show_chart("payment_types", charts.plot_payment_types, master_orders_df, columns=3)
             st.markdown("""
             **Insight**: Mayoritas pesanan (lebih dari 99%) hanya menggunakan satu jenis metode pembayaran. Ini menunjukkan preferensi pelanggan untuk proses pembayaran yang sederhana dan langsung, atau mungkin bahwa transaksi jarang membutuhkan kombinasi metode pembayaran.
             """
@@ -245,25 +372,7 @@ if selected_section == "Ringkasan Umum Data":
 
         with col3:
             st.markdown("### Distribusi Skor Ulasan")
-            review_score_summary_df = master_orders_df["review_score"].value_counts(normalize=True).mul(100).round(2).reset_index(name="Percentage (%)")
-            review_score_summary_df.columns = ['review_score', 'Percentage (%)']
-            fig_review, ax_review = plt.subplots(figsize=(6, 4))
-            sns.barplot(x="review_score", y="Percentage (%)", data=review_score_summary_df, palette='rocket_r', ax=ax_review, hue="review_score", legend=False)
-            ax_review.set_xlabel("Skor Ulasan", color='white')
-            ax_review.set_ylabel("Persentase (%)", color='white')
-            ax_review.tick_params(axis='x', colors='white')
-            ax_review.tick_params(axis='y', colors='white')
-            for p in ax_review.patches:
-                ax_review.annotate(
-                    f'{p.get_height():.1f}%',
-                    (p.get_x() + p.get_width() / 2, p.get_height()),
-                    ha='center', va='bottom', fontsize=8, color='white', xytext=(0, 5), textcoords='offset points'
-                )
-            # Adjust ylim to provide enough space for labels
-            ax_review.set_ylim(top=review_score_summary_df["Percentage (%)"].max() * 1.15) # Add 15% padding
-            plt.tight_layout()
-            st.pyplot(fig_review)
-            plt.close(fig_review)
+            show_chart("review_score_distribution", charts.plot_review_score_distribution, master_orders_df, columns=3)
             st.markdown("""
             **Insight**: Distribusi skor ulasan menunjukkan bahwa sebagian besar pelanggan (lebih dari 80%) memberikan skor tinggi (4 dan 5), menandakan tingkat kepuasan yang umumnya baik. Skor 5 adalah yang paling dominan, diikuti oleh skor 4. Skor rendah (1 dan 2) jauh lebih jarang muncul, mengindikasikan pengalaman positif mayoritas pelanggan.
             """
@@ -275,17 +384,7 @@ if selected_section == "Ringkasan Umum Data":
 
         with col_ts1:
             st.markdown("### Volume Pesanan Bulanan")
-            fig_orders_monthly, ax_orders_monthly = plt.subplots(figsize=(8, 4))
-            ax_orders_monthly.plot(orders_monthly_df["month"], orders_monthly_df["order_count"], marker="o", color='cyan')
-            ax_orders_monthly.set_title("Volume Pesanan Bulanan", fontsize=10, color='white')
-            ax_orders_monthly.set_xlabel("Bulan", fontsize=8, color='white')
-            ax_orders_monthly.set_ylabel("Jumlah Pesanan", fontsize=8, color='white')
-            ax_orders_monthly.tick_params(labelsize=7, rotation=45, colors='white')
-            ax_orders_monthly.grid(axis="y", linestyle="--", alpha=0.6)
-            ax_orders_monthly.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'{int(x):,}'))
-            plt.tight_layout()
-            st.pyplot(fig_orders_monthly)
-            plt.close(fig_orders_monthly)
+            show_chart("orders_monthly", charts.plot_orders_monthly, orders_monthly_df, columns=2)
             st.markdown("""
             **Insight**: Grafik menunjukkan tren pertumbuhan jumlah pesanan bulanan yang stabil dari akhir 2016 hingga pertengahan 2018. Ini mengindikasikan ekspansi pasar atau peningkatan adopsi platform. Penurunan tajam di akhir periode mungkin disebabkan oleh data yang tidak lengkap untuk bulan-bulan terakhir.
             """
@@ -293,17 +392,7 @@ if selected_section == "Ringkasan Umum Data":
 
         with col_ts2:
             st.markdown("### Tren Pendapatan Bulanan")
-            fig_monthly_revenue, ax_monthly_revenue = plt.subplots(figsize=(8, 4))
-            ax_monthly_revenue.plot(monthly_revenue_df["month"], monthly_revenue_df["total_revenue"], marker="o", color='lime')
-            ax_monthly_revenue.set_title("Tren Pendapatan Bulanan", fontsize=10, color='white')
-            ax_monthly_revenue.set_xlabel("Bulan", fontsize=8, color='white')
-            ax_monthly_revenue.set_ylabel("Pendapatan (R$)", fontsize=8, color='white')
-            ax_monthly_revenue.tick_params(labelsize=7, rotation=45, colors='white')
-            ax_monthly_revenue.grid(axis="y", linestyle="--", alpha=0.6)
-            ax_monthly_revenue.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'R${x/1_000_000:.1f}M'))
-            plt.tight_layout()
-            st.pyplot(fig_monthly_revenue)
-            plt.close(fig_monthly_revenue)
+            show_chart("monthly_revenue", charts.plot_monthly_revenue, monthly_revenue_df, columns=2)
             st.markdown("""
             **Insight**: Mirip dengan volume pesanan, pendapatan bulanan menunjukkan tren kenaikan yang konsisten, mencapai puncaknya pada pertengahan 2018. Ini mencerminkan pertumbuhan bisnis secara keseluruhan, dengan fluktuasi musiman yang mungkin terkait dengan event belanja. Penurunan di akhir periode kemungkinan besar karena ketidaklengkapan data.
             """
@@ -315,33 +404,7 @@ elif selected_section == "Analisis Kepuasan Pelanggan":
 
     with st.expander("Top & Bottom Kategori Produk berdasarkan Rata-rata Review Score"):
         st.subheader("Top & Bottom Kategori Produk berdasarkan Rata-rata Review Score")
-        top_bottom_categories = (
-            category_review_scores_df
-            .sort_values('avg_review_score', ascending=False)
-            .pipe(lambda df: pd.concat([df.head(10), df.tail(10)]))
-            .sort_values('avg_review_score', ascending=False) # Changed to ascending=False
-        )
-        fig_cat_review, ax_cat_review = plt.subplots(figsize=(10, 6))
-        sns.barplot(
-            x='avg_review_score',
-            y='product_category_name_english',
-            data=top_bottom_categories,
-            ax=ax_cat_review,
-            palette='coolwarm',
-            hue='product_category_name_english',
-            legend=False
-        )
-        ax_cat_review.set_title('Top & Bottom Kategori Produk berdasarkan Rata-rata Review Score', fontsize=12, color='white')
-        ax_cat_review.set_xlabel('Rata-rata Review Score', fontsize=10, color='white')
-        ax_cat_review.set_ylabel('Kategori Produk', fontsize=10, color='white')
-        ax_cat_review.tick_params(axis='x', colors='white')
-        ax_cat_review.tick_params(axis='y', colors='white')
-        for index, value in enumerate(top_bottom_categories['avg_review_score']):
-            ax_cat_review.text(value + 0.05, index, f'{value:.2f}', va='center', fontsize=8, color='white')
-        ax_cat_review.set_xlim(right=top_bottom_categories['avg_review_score'].max() * 1.15) # Adjust x-axis limit for labels
-        plt.tight_layout()
-        st.pyplot(fig_cat_review)
-        plt.close(fig_cat_review)
+        show_chart("category_review_scores", charts.plot_category_review_scores, category_review_scores_df)
         st.markdown("""
         **Insight**: Kategori produk seperti 'cds_dvds_musicals' dan 'fashion_childrens_clothes' memiliki skor ulasan rata-rata tertinggi, menunjukkan kepuasan tinggi di segmen tersebut. Sebaliknya, 'security_and_services' dan 'office_furniture' memiliki skor terendah, menyoroti area untuk perbaikan. Ini menunjukkan bahwa jenis produk sangat mempengaruhi kepuasan, dengan produk-produk tertentu yang secara konsisten menghasilkan pengalaman pelanggan yang lebih baik atau lebih buruk.
         """
@@ -349,33 +412,7 @@ elif selected_section == "Analisis Kepuasan Pelanggan":
 
     with st.expander("Top & Bottom Negara Bagian berdasarkan Rata-rata Review Score"):
         st.subheader("Top & Bottom Negara Bagian berdasarkan Rata-rata Review Score")
-        top_bottom_states = (
-            state_review_summary_df
-            .sort_values('avg_review_score', ascending=False)
-            .pipe(lambda df: pd.concat([df.head(10), df.tail(10)]))
-            .sort_values('avg_review_score', ascending=False) # Changed to ascending=False
-        )
-        fig_state_review, ax_state_review = plt.subplots(figsize=(10, 6))
-        sns.barplot(
-            x='avg_review_score',
-            y='customer_state',
-            data=top_bottom_states,
-            ax=ax_state_review,
-            palette='coolwarm',
-            hue='customer_state',
-            legend=False
-        )
-        ax_state_review.set_title('Top & Bottom Negara Bagian berdasarkan Rata-rata Review Score', fontsize=12, color='white')
-        ax_state_review.set_xlabel('Rata-rata Review Score', fontsize=10, color='white')
-        ax_state_review.set_ylabel('Negara Bagian', fontsize=10, color='white')
-        ax_state_review.tick_params(axis='x', colors='white')
-        ax_state_review.tick_params(axis='y', colors='white')
-        for index, value in enumerate(top_bottom_states['avg_review_score']):
-            ax_state_review.text(value + 0.05, index, f'{value:.2f}', va='center', fontsize=8, color='white')
-        ax_state_review.set_xlim(right=top_bottom_states['avg_review_score'].max() * 1.15) # Adjust x-axis limit for labels
-        plt.tight_layout()
-        st.pyplot(fig_state_review)
-        plt.close(fig_state_review)
+        show_chart("state_review_scores", charts.plot_state_review_scores, state_review_summary_df)
         st.markdown("""
         **Insight**: Kepuasan pelanggan bervariasi secara geografis. Negara bagian seperti AP, AM, dan PR menunjukkan skor ulasan lebih tinggi, mungkin karena logistik yang lebih baik atau kualitas produk yang lebih sesuai untuk wilayah tersebut. Sebaliknya, RR, AL, dan MA memiliki skor lebih rendah, menunjukkan area yang memerlukan perhatian khusus dalam peningkatan layanan atau pemahaman ekspektasi pelanggan lokal.
         """
@@ -383,129 +420,17 @@ elif selected_section == "Analisis Kepuasan Pelanggan":
 
     with st.expander("Delivery Time vs Review Score"):
         st.subheader("Delivery Time vs Review Score")
-        # Create review_delivery_summary_df for Streamlit
-        review_delivery_summary_df = (
-            master_orders_df
-            .groupby("review_score", as_index=False)
-            .agg(
-                avg_delivery_time_days=("delivery_time_days", "mean"),
-                total_orders=("delivery_time_days", "count")
-            )
-        )
-        review_delivery_summary_df["avg_delivery_time_days"] = (
-            review_delivery_summary_df["avg_delivery_time_days"].round().astype(int)
-        )
-
-        fig_delivery_review, ax_delivery_review = plt.subplots(figsize=(10, 6))
-
-        # Define custom color map
-        color_map = {score: 'red' if score == 1.0 else 'green' if score == 5.0 else 'skyblue'
-                     for score in review_delivery_summary_df['review_score']}
-
-        sns.barplot(
-            x="review_score",
-            y="avg_delivery_time_days",
-            data=review_delivery_summary_df,
-            hue="review_score",
-            palette=color_map,
-            legend=False,
-            ax=ax_delivery_review
-        )
-        ax_delivery_review.set_title("Average Delivery Time vs Review Score", fontsize=14, color='white')
-        ax_delivery_review.set_xlabel("Review Score", fontsize=12, color='white')
-        ax_delivery_review.set_ylabel("Average Delivery Time (Days)", fontsize=12, color='white')
-        ax_delivery_review.grid(axis='y', linestyle='--', alpha=0.6)
-        ax_delivery_review.tick_params(axis='x', colors='white')
-        ax_delivery_review.tick_params(axis='y', colors='white')
-
-        # Add data labels
-        for p in ax_delivery_review.patches:
-            ax_delivery_review.annotate(
-                f'{int(p.get_height())}',
-                (p.get_x() + p.get_width() / 2., p.get_height()),
-                ha='center',
-                va='center',
-                fontsize=10,
-                color='white', # Set text color to white for dark background
-                xytext=(0, 5),
-                textcoords='offset points'
-            )
-
-        # Adjust y-axis limit for padding
-        ax_delivery_review.set_ylim(0, review_delivery_summary_df['avg_delivery_time_days'].max() * 1.1)
-
-        plt.tight_layout()
-        st.pyplot(fig_delivery_review)
-        plt.close(fig_delivery_review)
+        show_chart("delivery_time_vs_review", charts.plot_delivery_time_vs_review, master_orders_df)
         st.markdown("""
         **Insight**: Ada **korelasi negatif yang sangat kuat** antara waktu pengiriman dan skor ulasan: semakin lama waktu pengiriman, semakin rendah skor ulasan yang diberikan pelanggan. Pesanan dengan skor 1.0 memiliki rata-rata waktu pengiriman terlama (sekitar 21 hari, ditandai merah), sedangkan skor 5.0 memiliki rata-rata waktu pengiriman tercepat (sekitar 10 hari, ditandai hijau), menegaskan pentingnya kecepatan dan ketepatan waktu pengiriman untuk kepuasan pelanggan.
         """
         )
 
+        delivery_percentiles_panel()
+
     with st.expander("Review Score Distribution by Order Status"):
         st.subheader("Review Score Distribution by Order Status")
-        # Create order_status_review_scores_df for Streamlit
-        order_status_review_scores_df = (
-            master_orders_df
-            .groupby('order_status')['review_score']
-            .mean()
-            .round(2)
-            .sort_values(ascending=False)
-            .reset_index()
-        )
-
-        fig_status_review, ax_status_review = plt.subplots(figsize=(12, 7))
-
-        # Define custom color map
-        status_colors = {
-            'delivered': 'green',
-            'approved': 'skyblue',
-            'created': 'skyblue',
-            'invoiced': 'skyblue',
-            'processing': 'skyblue',
-            'shipped': 'skyblue',
-            'unavailable': 'red',
-            'canceled': 'red'
-        }
-        colors_for_plot = [status_colors.get(status, 'gray') for status in order_status_review_scores_df['order_status']]
-
-        sns.barplot(
-            x="order_status",
-            y="review_score",
-            data=order_status_review_scores_df, # Use the prepared dataframe
-            palette=colors_for_plot, # Use custom color palette
-            hue="order_status",      # Set hue for distinct colors per bar
-            legend=False,            # Disable legend as colors are self-explanatory
-            ax=ax_status_review
-        )
-        ax_status_review.set_title("Average Review Score by Order Status", fontsize=16, color='white')
-        ax_status_review.set_xlabel("Order Status", fontsize=12, color='white')
-        ax_status_review.set_ylabel("Review Score", fontsize=12, color='white')
-        # Corrected lines for tick_params and set_xticklabels
-        ax_status_review.tick_params(axis='x', colors='white')
-        ax_status_review.set_xticklabels(ax_status_review.get_xticklabels(), rotation=45, ha='right')
-        ax_status_review.tick_params(axis='y', colors='white')
-        ax_status_review.grid(axis='y', linestyle='--', alpha=0.7);
-
-        # Add data labels
-        for p in ax_status_review.patches:
-            ax_status_review.annotate(
-                f'{p.get_height():.2f}',
-                (p.get_x() + p.get_width() / 2., p.get_height()),
-                ha='center',
-                va='bottom',
-                fontsize=10,
-                color='white',
-                xytext=(0, 5),
-                textcoords='offset points'
-            )
-
-        # Set y-axis limit
-        ax_status_review.set_ylim(0, 5.0);
-
-        plt.tight_layout()
-        st.pyplot(fig_status_review)
-        plt.close(fig_status_review)
+        show_chart("review_by_order_status", charts.plot_review_by_order_status, master_orders_df)
         st.markdown("""
         **Insight**: Status pesanan secara langsung memengaruhi kepuasan pelanggan. Pesanan yang 'canceled' atau 'unavailable' (ditandai merah) memiliki skor ulasan rata-rata yang sangat rendah (sekitar 1.5-1.8), yang logis karena pesanan tersebut tidak berhasil diselesaikan. Sebaliknya, pesanan yang berhasil 'delivered' (ditandai hijau) memiliki skor rata-rata tertinggi (4.16), menunjukkan bahwa penyelesaian transaksi yang sukses adalah kunci kepuasan.
         """
@@ -513,31 +438,7 @@ elif selected_section == "Analisis Kepuasan Pelanggan":
 
     with st.expander("Matriks Korelasi Antar Variabel Utama"):
         st.subheader("Matriks Korelasi Antar Variabel Utama")
-        numeric_for_corr = [
-            "payment_value", "total_price", "total_freight",
-            "delivery_time_days", "total_items", "unique_sellers",
-            "review_score"
-        ]
-        corr_matrix = master_orders_df[numeric_for_corr].corr()
-        fig_corr, ax_corr = plt.subplots(figsize=(10, 8))
-        sns.heatmap(
-            corr_matrix,
-            annot=True,
-            fmt=".2f",
-            cmap="coolwarm",
-            center=0,
-            linewidths=0.5,
-            linecolor="white",
-            cbar_kws={"shrink": 0.8},
-            ax=ax_corr,
-            annot_kws={"color": "white"} # Ensure annotation text is white
-        )
-        ax_corr.set_title("Matriks Koreelasi Antar Variabel Utama", fontsize=14, color='white')
-        ax_corr.tick_params(axis='x', colors='white')
-        ax_corr.tick_params(axis='y', colors='white')
-        plt.tight_layout()
-        st.pyplot(fig_corr)
-        plt.close(fig_corr)
+        show_chart("correlation_matrix", charts.plot_correlation_matrix, master_orders_df)
         st.markdown("""
         **Insight**: Heatmap korelasi menunjukkan bahwa `delivery_time_days` memiliki korelasi negatif terkuat dengan `review_score` (-0.33), sekali lagi menekankan secara kuantitatif pentingnya pengiriman yang cepat. `total_price` dan `payment_value` memiliki korelasi positif yang sangat kuat (0.97), seperti yang diharapkan. Faktor lain seperti `total_items`, `unique_sellers`, dan `total_freight` memiliki korelasi sangat lemah dengan `review_score`, menunjukkan bahwa dampaknya terhadap kepuasan tidak signifikan.
         """
@@ -547,75 +448,16 @@ elif selected_section == "Analisis Pelanggan Bernilai Tinggi":
     st.header("3. Analisis Pelanggan Bernilai Tinggi")
     st.write("Karakteristik pelanggan seperti apa yang memberikan nilai transaksi tertinggi, dan bagaimana pola perilaku belanjanya?")
 
-    with st.expander("Top Pelanggan Berdasarkan Total Pengeluaran"):
-        st.subheader("Top Pelanggan Berdasarkan Total Pengeluaran")
-        top_customers_spending = (
-            rfm_segmentation_df[['customer_unique_id', 'Monetary', 'Segment']]
-            .sort_values(by='Monetary', ascending=False)
-            .head(10)
-            .rename(columns={'Monetary': 'Total Pengeluaran'})
-        )
-        st.dataframe(top_customers_spending.style.format({"Total Pengeluaran": "R$ {:,.2f}"}))
-        st.markdown("""
-        **Insight**: Pelanggan teratas berdasarkan total pengeluaran menunjukkan bahwa nilai transaksi tertinggi seringkali berasal dari pembelian tunggal atau sangat sedikit dengan nilai pesanan yang sangat besar, bukan frekuensi pembelian yang tinggi. Ini menyoroti segmen pelanggan 'High Value' yang didorong oleh besarnya nilai setiap transaksi.
-        """
-        )
+    top_customers_panel()
 
     with st.expander("Preferensi Kategori Produk Pelanggan Bernilai Tinggi"):
         st.subheader("Preferensi Kategori Produk Pelanggan Bernilai Tinggi")
-        high_value_customer_ids = rfm_segmentation_df[
-            rfm_segmentation_df['Segment'] == 'Champions'
-        ]['customer_unique_id']
-
-        high_value_orders = master_orders_df[
-            master_orders_df['customer_unique_id'].isin(high_value_customer_ids)
-        ]
-
-        high_value_product_data = high_value_orders.merge(
-            items_products_df,
-            on='order_id',
-            how='inner'
+        encoded_hv_products = show_chart(
+            "high_value_products", charts.plot_high_value_products,
+            master_orders_df, rfm_segmentation_df, items_products_df
         )
 
-        if not high_value_product_data.empty:
-            high_value_product_preferences_filtered = (
-                high_value_product_data
-                ['product_category_name_english']
-                .value_counts()
-                .rename_axis("product_category_name_english")
-                .reset_index(name="Number of Orders")
-            )
-            high_value_product_preferences_filtered["Percentage (%)"] = (
-                high_value_product_preferences_filtered["Number of Orders"]
-                / high_value_product_preferences_filtered["Number of Orders"].sum() * 100
-            ).round(1)
-
-            fig_hv_products, ax_hv_products = plt.subplots(figsize=(10, 5))
-            sns.barplot(
-                x="Number of Orders",
-                y="product_category_name_english",
-                data=high_value_product_preferences_filtered.head(10),
-                ax=ax_hv_products,
-                palette='viridis',
-                hue="product_category_name_english",
-                legend=False
-            )
-            for p in ax_hv_products.patches:
-                ax_hv_products.annotate(
-                    f'{int(p.get_width())}',
-                    (p.get_width(), p.get_y() + p.get_height() / 2),
-                    ha='left', va='center', fontsize=8, color='white',
-                    xytext=(5, 0), textcoords='offset points'
-                )
-            ax_hv_products.set_title("Top 10 Kategori Produk untuk Pelanggan Bernilai Tinggi (Champions)", color='white')
-            ax_hv_products.set_xlabel("Jumlah Pesanan", color='white')
-            ax_hv_products.set_ylabel("Kategori Produk", color='white')
-            ax_hv_products.grid(axis="x", linestyle="--", alpha=0.4)
-            ax_hv_products.tick_params(axis='x', colors='white')
-            ax_hv_products.tick_params(axis='y', colors='white')
-            plt.tight_layout()
-            st.pyplot(fig_hv_products)
-            plt.close(fig_hv_products)
+        if encoded_hv_products is not None:
             st.markdown("""
             **Insight**: Pelanggan bernilai tinggi ('Champions') menunjukkan preferensi yang kuat terhadap kategori produk tertentu seperti `bed_bath_table`, `computers_accessories`, dan `furniture_decor`. Ini mengindikasikan bahwa produk rumah tangga, teknologi, dan dekorasi adalah daya tarik utama bagi segmen ini, memberikan peluang untuk penawaran yang ditargetkan dan strategi *cross-selling* yang efektif.
             """
@@ -625,43 +467,30 @@ elif selected_section == "Analisis Pelanggan Bernilai Tinggi":
 
     with st.expander("Distribusi Frekuensi Pembelian per Pelanggan"):
         st.subheader("Distribusi Frekuensi Pembelian per Pelanggan")
-        fig_freq_dist, ax_freq_dist = plt.subplots(figsize=(10, 5))
-        sns.histplot(customer_value_df["total_orders"], bins=30, ax=ax_freq_dist, color='orange') # Fixed bins to 30
-        ax_freq_dist.set_title("Distribusi Jumlah Pesanan per Pelanggan", fontsize=12, color='white')
-        ax_freq_dist.set_xlabel("Total Pesanan", fontsize=10, color='white')
-        ax_freq_dist.set_ylabel("Jumlah Pelanggan", fontsize=10, color='white')
-        ax_freq_dist.grid(axis='y', linestyle="--", alpha=0.6)
-        ax_freq_dist.tick_params(axis='x', colors='white')
-        ax_freq_dist.tick_params(axis='y', colors='white')
-        plt.tight_layout()
-        st.pyplot(fig_freq_dist)
-        plt.close(fig_freq_dist)
+        show_chart("order_frequency", charts.plot_order_frequency, customer_value_df)
         st.markdown("""
         **Insight**: Sebagian besar pelanggan memiliki frekuensi pembelian yang sangat rendah, seringkali hanya satu pesanan. Ini menunjukkan bahwa meskipun ada pelanggan dengan nilai transaksi tinggi, mereka tidak selalu melakukan pembelian berulang secara sering. Model bisnis ini cenderung berorientasi pada transaksi besar satu kali daripada membangun loyalitas melalui frekuensi pembelian.
         """
         )
 
+    with st.expander("Retensi Kohort Pelanggan"):
+        st.subheader("Retensi Kohort Pelanggan")
+        cohort_retention_df = get_cohort_retention(data_fingerprint)
+        if cohort_retention_df.empty:
+            st.info("Tidak ada data pesanan untuk membentuk kohort.")
+        else:
+            show_chart("cohort_retention", charts.plot_cohort_retention, cohort_retention_df)
+            if st.checkbox("Tampilkan tabel retensi kohort", key="show_cohort_table"):
+                # Nama kolom dijadikan string: campuran 'cohort_size' dan offset bulan (int) tidak didukung Arrow
+                st.dataframe(cohort_retention_df.round(2).rename(columns=str))
+            st.markdown("""
+        **Insight**: Setiap baris adalah kohort pelanggan berdasarkan bulan pembelian pertamanya, dan setiap kolom menunjukkan persentase pelanggan kohort tersebut yang kembali berbelanja pada bulan ke-n setelahnya. Nilai retensi yang sangat kecil di semua kohort menegaskan bahwa sebagian besar pelanggan hanya berbelanja sekali, sehingga program retensi (misalnya penawaran pembelian kedua) berpotensi besar meningkatkan pendapatan. Sel kosong berarti bulan tersebut berada di luar rentang data.
+        """
+            )
+
     with st.expander("Frekuensi vs Rata-rata Nilai Pesanan"):
         st.subheader("Frekuensi vs Rata-rata Nilai Pesanan")
-        fig_freq_aov, ax_freq_aov = plt.subplots(figsize=(10, 6))
-        sns.scatterplot(
-            x="total_orders",
-            y="avg_order_value",
-            data=customer_value_df,
-            alpha=0.5,
-            ax=ax_freq_aov,
-            color='gold'
-        )
-        ax_freq_aov.set_title("Frekuensi vs Rata-rata Nilai Pesanan", fontsize=12, color='white')
-        ax_freq_aov.set_xlabel("Total Pesanan", fontsize=10, color='white')
-        ax_freq_aov.set_ylabel("Rata-rata Nilai Pesanan (R$)", fontsize=10, color='white')
-        ax_freq_aov.grid(axis='both', linestyle="--", alpha=0.6)
-        ax_freq_aov.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, p: f'{x/1000:.0f}K'))
-        ax_freq_aov.tick_params(axis='x', colors='white')
-        ax_freq_aov.tick_params(axis='y', colors='white')
-        plt.tight_layout()
-        st.pyplot(fig_freq_aov)
-        plt.close(fig_freq_aov)
+        show_chart("frequency_vs_aov", charts.plot_frequency_vs_aov, customer_value_df)
         st.markdown("""
         **Insight**: Scatter plot mengkonfirmasi bahwa sebagian besar pelanggan memiliki frekuensi pesanan yang rendah (umumnya 1), tetapi dengan rentang nilai pesanan rata-rata yang bervariasi, termasuk beberapa *outlier* dengan nilai yang sangat tinggi. Ini menegaskan bahwa pelanggan bernilai tinggi tidak selalu merupakan pembeli yang sering, melainkan mereka yang melakukan pembelian besar pada satu atau sedikit kesempatan, yang membentuk karakteristik utama segmen pelanggan bernilai tinggi.
         """
@@ -669,24 +498,7 @@ elif selected_section == "Analisis Pelanggan Bernilai Tinggi":
 
     with st.expander("Kompleksitas Pembayaran vs Nilai Pelanggan"):
         st.subheader("Kompleksitas Pembayaran vs Nilai Pelanggan")
-        fig_payment_value_scatter, ax_payment_value_scatter = plt.subplots(figsize=(10, 6))
-        sns.scatterplot(
-            x="payment_types",
-            y="total_spent",
-            data=payment_customer_df,
-            alpha=0.5,
-            ax=ax_payment_value_scatter,
-            color='lightblue'
-        )
-        ax_payment_value_scatter.set_title("Kompleksitas Pembayaran vs Nilai Pelanggan", fontsize=12, color='white')
-        ax_payment_value_scatter.set_xlabel("Jumlah Jenis Pembayaran yang Digunakan", color='white')
-        ax_payment_value_scatter.set_ylabel("Total Pengeluaran (R$)", color='white')
-        ax_payment_value_scatter.grid(axis='both', linestyle="--", alpha=0.6)
-        ax_payment_value_scatter.tick_params(axis='x', colors='white')
-        ax_payment_value_scatter.tick_params(axis='y', colors='white')
-        plt.tight_layout()
-        st.pyplot(fig_payment_value_scatter)
-        plt.close(fig_payment_value_scatter)
+        show_chart("payment_complexity", charts.plot_payment_complexity, payment_customer_df)
         st.markdown("""
         **Insight**: Tidak ada korelasi yang jelas antara jumlah jenis pembayaran yang digunakan dan total pengeluaran pelanggan. Pelanggan bernilai tinggi tidak cenderung menggunakan lebih banyak jenis pembayaran. Hal ini menunjukkan bahwa kompleksitas metode pembayaran bukan faktor pembeda signifikan untuk mengidentifikasi pelanggan bernilai tinggi, dan fokus harus pada nilai transaksi itu sendiri.
         """
@@ -697,39 +509,7 @@ elif selected_section == "Analisis RFM":
 
     with st.expander("Distribusi Pelanggan Berdasarkan Segmen RFM"):
         st.subheader("Distribusi Pelanggan Berdasarkan Segmen RFM")
-        rfm_segment_summary_df = (
-            rfm_segmentation_df["Segment"]
-            .value_counts(normalize=True)
-            .mul(100)
-            .round(1)
-            .reset_index(name="Persentase (%)")
-        )
-        rfm_segment_summary_df = rfm_segment_summary_df.rename(columns={'index': 'Segment'})
-
-        fig_rfm_dist, ax_rfm_dist = plt.subplots(figsize=(8, 5))
-        sns.barplot(
-            x="Segment",
-            y="Persentase (%)",
-            data=rfm_segment_summary_df,
-            palette='viridis',
-            hue="Segment",
-            legend=False,
-            ax=ax_rfm_dist
-        )
-        ax_rfm_dist.set_title("Distribusi Pelanggan Berdasarkan Segmen RFM", fontsize=12, color='white')
-        ax_rfm_dist.set_xlabel("Segmen RFM", color='white')
-        ax_rfm_dist.set_ylabel("Persentase Pelanggan (%)", color='white')
-        ax_rfm_dist.tick_params(axis='x', rotation=30, colors='white')
-        ax_rfm_dist.tick_params(axis='y', colors='white')
-        ax_rfm_dist.set_ylim(0, rfm_segment_summary_df["Persentase (%)"].max() * 1.15) # Adjust ylim for labels
-        for p in ax_rfm_dist.patches:
-            percentage = f'{p.get_height():.1f}%'
-            x = p.get_x() + p.get_width() / 2
-            y = p.get_height()
-            ax_rfm_dist.annotate(percentage, (x, y), ha='center', va='bottom', fontsize=8, color='white', xytext=(0, 5), textcoords='offset points')
-        plt.tight_layout()
-        st.pyplot(fig_rfm_dist)
-        plt.close(fig_rfm_dist)
+        show_chart("rfm_segment_distribution", charts.plot_rfm_segment_distribution, rfm_segmentation_df)
         st.markdown("""
         **Insight**: Segmen 'Others' dan 'At Risk' memiliki proporsi pelanggan terbesar, mengindikasikan sebagian besar basis pelanggan tidak aktif baru-baru ini atau berada dalam kelompok 'lain-lain'. Segmen 'Champions' dan 'New Customers' memiliki ukuran yang serupa, menunjukkan keseimbangan antara pelanggan terbaik dan yang baru diperoleh.
         """
@@ -737,55 +517,7 @@ elif selected_section == "Analisis RFM":
 
     with st.expander("Rata-rata Metrik RFM per Segmen"):
         st.subheader("Rata-rata Metrik RFM per Segmen")
-        rfm_avg_metrics_readable_df = (
-            rfm_segmentation_df
-            .groupby("Segment")[["Recency", "Frequency", "Monetary"]]
-            .mean()
-            .round(2)
-            .rename(columns={
-                "Recency": "Avg Recency (Hari)",
-                "Frequency": "Avg Frequency (Pesanan)",
-                "Monetary": "Avg Monetary Value (R$)"
-            })
-            .sort_values("Avg Recency (Hari)", ascending=True)
-            .reset_index()
-        )
-
-        fig_avg_rfm, axes_avg_rfm = plt.subplots(1, 3, figsize=(18, 5))
-
-        sns.barplot(x="Segment", y="Avg Recency (Hari)", data=rfm_avg_metrics_readable_df, palette="Blues_r", hue="Segment", legend=False, ax=axes_avg_rfm[0])
-        axes_avg_rfm[0].set_title("Rata-rata Recency", fontsize=12, color='white')
-        axes_avg_rfm[0].set_xlabel("Segmen RFM", color='white')
-        axes_avg_rfm[0].set_ylabel("Hari Sejak Pembelian Terakhir", color='white')
-        axes_avg_rfm[0].tick_params(axis='x', colors='white')
-        axes_avg_rfm[0].tick_params(axis='y', colors='white')
-        for p in axes_avg_rfm[0].patches:
-            axes_avg_rfm[0].annotate(f"{p.get_height():.0f}", (p.get_x() + p.get_width() / 2, p.get_height()), ha="center", va="bottom", fontsize=8, color='white')
-        axes_avg_rfm[0].set_ylim(top=rfm_avg_metrics_readable_df["Avg Recency (Hari)"].max() * 1.15) # Adjusted ylim
-
-        sns.barplot(x="Segment", y="Avg Frequency (Pesanan)", data=rfm_avg_metrics_readable_df, palette="Greens_r", hue="Segment", legend=False, ax=axes_avg_rfm[1])
-        axes_avg_rfm[1].set_title("Rata-rata Frekuensi", fontsize=12, color='white')
-        axes_avg_rfm[1].set_xlabel("Segmen RFM", color='white')
-        axes_avg_rfm[1].set_ylabel("Jumlah Pesanan", color='white')
-        axes_avg_rfm[1].tick_params(axis='x', colors='white')
-        axes_avg_rfm[1].tick_params(axis='y', colors='white')
-        for p in axes_avg_rfm[1].patches:
-            axes_avg_rfm[1].annotate(f"{p.get_height():.1f}", (p.get_x() + p.get_width() / 2, p.get_height()), ha="center", va="bottom", fontsize=8, color='white')
-        axes_avg_rfm[1].set_ylim(top=rfm_avg_metrics_readable_df["Avg Frequency (Pesanan)"].max() * 1.15) # Adjusted ylim
-
-        sns.barplot(x="Segment", y="Avg Monetary Value (R$)", data=rfm_avg_metrics_readable_df, palette="Oranges_r", hue="Segment", legend=False, ax=axes_avg_rfm[2])
-        axes_avg_rfm[2].set_title("Rata-rata Nilai Moneter", fontsize=12, color='white')
-        axes_avg_rfm[2].set_xlabel("Segmen RFM", color='white')
-        axes_avg_rfm[2].set_ylabel("Pengeluaran Rata-rata (R$)", color='white')
-        axes_avg_rfm[2].tick_params(axis='x', colors='white')
-        axes_avg_rfm[2].tick_params(axis='y', colors='white')
-        for p in axes_avg_rfm[2].patches:
-            axes_avg_rfm[2].annotate(f"{p.get_height():,.0f}", (p.get_x() + p.get_width() / 2, p.get_height()), ha="center", va="bottom", fontsize=8, color='white')
-        axes_avg_rfm[2].set_ylim(top=rfm_avg_metrics_readable_df["Avg Monetary Value (R$)"].max() * 1.15) # Adjusted ylim
-
-        plt.tight_layout()
-        st.pyplot(fig_avg_rfm)
-        plt.close(fig_avg_rfm)
+        show_chart("rfm_segment_averages", charts.plot_rfm_segment_averages, rfm_segmentation_df)
         st.markdown("""
         **Insight**: Pelanggan 'Champions' memiliki Recency terendah (paling baru berbelanja) dan Monetary tertinggi, menjadikannya pelanggan paling berharga. 'New Customers' juga memiliki Recency rendah tetapi Frequency rendah, menunjukkan potensi pertumbuhan. 'At Risk' memiliki Recency tinggi, tetapi Frequency dan Monetary moderat, memerlukan strategi re-engagement.
         """
@@ -793,39 +525,7 @@ elif selected_section == "Analisis RFM":
 
     with st.expander("Rata-rata Skor Ulasan per Segmen RFM"):
         st.subheader("Rata-rata Skor Ulasan per Segmen RFM")
-        rfm_review_scores_filtered = (
-            master_orders_df
-            .groupby("Segment", as_index=False)["review_score"]
-            .mean()
-            .round(2)
-            .sort_values("review_score", ascending=False)
-        )
-        fig_rfm_review, ax_rfm_review = plt.subplots(figsize=(11, 6))
-        sns.barplot(
-            data=rfm_review_scores_filtered,
-            x="Segment",
-            y="review_score",
-            palette="viridis",
-            hue="Segment",
-            legend=False,
-            ax=ax_rfm_review
-        )
-        ax_rfm_review.set_title("Rata-rata Skor Ulasan per Segmen RFM", fontsize=15, weight="bold", color='white')
-        ax_rfm_review.set_xlabel("Segmen RFM", fontsize=12, color='white')
-        ax_rfm_review.set_ylabel("Rata-rata Skor Ulasan", fontsize=12, color='white')
-        ax_rfm_review.set_ylim(0, 5) # Ensure y-axis doesn't go below 0
-        ax_rfm_review.grid(axis="y", linestyle="--", alpha=0.4)
-        ax_rfm_review.tick_params(axis='x', colors='white')
-        ax_rfm_review.tick_params(axis='y', colors='white')
-        for p in ax_rfm_review.patches:
-            ax_rfm_review.annotate(
-                f"{p.get_height():.2f}",
-                (p.get_x() + p.get_width() / 2, p.get_height()),
-                ha="center", va="bottom", fontsize=10, xytext=(0, 5), textcoords="offset points", color='white'
-            )
-        plt.tight_layout()
-        st.pyplot(fig_rfm_review)
-        plt.close(fig_rfm_review)
+        show_chart("rfm_review_scores", charts.plot_rfm_review_scores, master_orders_df)
         st.markdown("""
         **Insight**: Segmen 'Champions' dan 'New Customers' menunjukkan skor ulasan rata-rata tertinggi, yang diharapkan karena mereka adalah pelanggan paling terlibat atau baru. Menariknya, 'Loyal Customers' memiliki skor terendah di antara segmen yang dikategorikan, menunjukkan bahwa loyalitas tidak selalu berarti kepuasan puncak dan memerlukan investigasi lebih lanjut.
         """
@@ -834,77 +534,7 @@ elif selected_section == "Analisis RFM":
     with st.expander("Distribusi Geografis Segmen RFM (Top Negara Bagian)"):
         st.subheader("Distribusi Geografis Segmen RFM (Top Negara Bagian)")
 
-        customer_geo_segment_counts = (
-            master_orders_df.groupby(["customer_state", "Segment"])["customer_unique_id"]
-            .nunique() # Count unique customers within each state-segment group
-            .reset_index(name="Total Customers")
-        )
-
-        total_customers_per_state_geo = (
-            master_orders_df.groupby("customer_state")["customer_unique_id"]
-            .nunique()
-            .reset_index(name="Total Customers in State")
-        )
-
-        customer_geo_segment_percent = customer_geo_segment_counts.merge(
-            total_customers_per_state_geo, on="customer_state", how="left"
-        )
-        customer_geo_segment_percent["Segment Percentage (%)"] = (
-            customer_geo_segment_percent["Total Customers"]
-            / customer_geo_segment_percent["Total Customers in State"]
-            * 100
-        ).round(2)
-
-        top_10_states = (
-            total_customers_per_state_geo
-            .sort_values("Total Customers in State", ascending=False)
-            .head(10)["customer_state"]
-        )
-
-        pivoted_data_percent = (
-            customer_geo_segment_percent[
-                customer_geo_segment_percent["customer_state"].isin(top_10_states)
-            ]
-            .pivot_table(
-                index="customer_state",
-                columns="Segment",
-                values="Segment Percentage (%)",
-                fill_value=0
-            )
-            .loc[top_10_states]
-        )
-
-        fig_geo_segment, ax_geo_segment = plt.subplots(figsize=(14, 8))
-        pivoted_data_percent.plot(
-            kind="bar",
-            stacked=True,
-            colormap="crest",
-            edgecolor="white",
-            ax=ax_geo_segment
-        )
-
-        for container in ax_geo_segment.containers:
-            for i, patch in enumerate(container.patches):
-                height = patch.get_height()
-                # Adjust text position for better visibility inside or just outside bars
-                if height > 5: # Threshold for displaying label
-                    x = patch.get_x() + patch.get_width() / 2
-                    y = patch.get_y() + height / 2
-                    ax_geo_segment.text(x, y, f'{height:.1f}%',
-                                        ha='center', va='center', fontsize=7, color='white',
-                                        rotation=90 if height < 10 else 0)
-
-        ax_geo_segment.set_title("Komposisi Segmen RFM di 10 Negara Bagian Teratas", fontsize=15, weight="bold", color='white')
-        ax_geo_segment.set_xlabel("Negara Bagian Pelanggan", fontsize=12, color='white')
-        ax_geo_segment.set_ylabel("Distribusi Pelanggan (%)", fontsize=12, color='white')
-        ax_geo_segment.tick_params(axis='x', colors='white')
-        ax_geo_segment.tick_params(axis='y', colors='white')
-        ax_geo_segment.grid(axis="y", linestyle="--", alpha=0.5)
-
-        ax_geo_segment.legend(title="Segmen RFM", bbox_to_anchor=(1.02, 1), loc="upper left", title_fontsize='medium', facecolor='black', edgecolor='white', labelcolor='white')
-        plt.tight_layout()
-        st.pyplot(fig_geo_segment)
-        plt.close(fig_geo_segment)
+        show_chart("rfm_geo_distribution", charts.plot_rfm_geo_distribution, master_orders_df)
         st.markdown("""
         **Insight**: Sao Paulo (SP) secara konsisten memiliki jumlah pelanggan tertinggi di seluruh segmen RFM. Distribusi proporsional segmen RFM relatif konsisten di negara bagian teratas, menunjukkan pola perilaku pelanggan yang serupa di wilayah utama. Ini memberikan peluang untuk kampanye regional yang tertarget, misalnya, fokus pada re-engagement di wilayah dengan proporsi pelanggan 'At Risk' yang lebih tinggi.
         """
@@ -943,3 +573,48 @@ elif selected_section == "Kesimpulan Utama Analisis":
             *   **Kompleksitas Pembayaran Tidak Signifikans**: Tidak ada korelasi signifikan antara jumlah jenis pembayaran yang digunakan (`payment_types`) dan total pengeluaran, menunjukkan bahwa kompleksitas pembayaran bukan pembeda untuk pelanggan bernilai tinggi.
         """
         )
+
+# --- Diagnostik cache (hit/miss/eviksi dan memori yang ditempati) ---
+# Dibaca di akhir skrip agar angka rerun ini ikut terhitung; rerun fragmen tidak memperbaruinya.
+for stats in cache.stats():
+    if stats.oversize:
+        # Nilai yang tidak muat tidak pernah disimpan, jadi dihitung ulang di setiap rerun
+        st.sidebar.warning(
+            f"Cache {stats.name}: {stats.oversize}x nilai sebesar hingga "
+            f"{figure_encoding.format_size(stats.largest_oversize)} melebihi batas "
+            f"{figure_encoding.format_size(stats.max_bytes)} dan tidak disimpan. "
+            f"Naikkan DASHBOARD_CACHE_{stats.name.upper()}_MB."
+        )
+with st.sidebar.expander("Diagnostik Cache"):
+    if st.button("Kosongkan cache"):
+        cache.clear_all()
+    cache_stats = cache.stats()
+    st.dataframe(
+        [
+            {
+                "Cache": stats.name,
+                "Entri": stats.entries,
+                "Memori": figure_encoding.format_size(stats.resident_bytes),
+                "Batas": figure_encoding.format_size(stats.max_bytes),
+                "Hit": stats.hits,
+                "Miss": stats.misses,
+                "Hit rate": f"{stats.hits / (stats.hits + stats.misses):.0%}" if stats.hits + stats.misses else "-",
+                "Eviksi": stats.evictions,
+                "Kedaluwarsa": stats.expirations,
+                "Terlalu besar": stats.oversize,
+            }
+            for stats in cache_stats
+        ],
+        hide_index=True
+    )
+    st.caption(
+        f"Total memori cache: {figure_encoding.format_size(sum(stats.resident_bytes for stats in cache_stats))}"
+        f" dari {figure_encoding.format_size(sum(stats.max_bytes for stats in cache_stats))}"
+    )
+
+# --- Total ukuran gambar grafik di halaman ini ---
+if encoded_page_bytes:
+    page_size_placeholder.caption(
+        f"Ukuran grafik di halaman ini: {figure_encoding.format_size(sum(encoded_page_bytes))}"
+        f" ({len(encoded_page_bytes)} gambar)"
+    )
@@ -0,0 +1,261 @@
+import functools
+import logging
+import os                             # Untuk membaca variabel lingkungan
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np           # Untuk operasi numerik
+import pandas as pd          # Untuk manipulasi dan analisis data
+
+# Nilai yang dikembalikan cache adalah objek yang sama (atau view tanpa salinan
+# data), bukan salinan hasil pickle seperti st.cache_data. Copy-on-write membuat
+# penulisan pada view tersebut menyalin datanya lebih dulu, sehingga isi cache
+# tidak bisa ikut berubah. Mulai pandas 3.0 perilaku ini sudah bawaan.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Statistik satu cache, untuk tampilan diagnostik
+CacheStats = namedtuple("CacheStats", [
+    "name", "entries", "resident_bytes", "max_bytes", "max_entries", "ttl",
+    "hits", "misses", "evictions", "expirations", "oversize", "largest_oversize",
+])
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_nbytes(value):
+    # Perkiraan memori yang ditempati sebuah nilai cache
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value.values())
+    # ndarray dan objek turunan (CustomerIndex, Leaderboard, SketchCube) punya atribut nbytes
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, (int, np.integer)):
+        return int(nbytes)
+    return sys.getsizeof(value)
+
+
+def readonly(value):
+    # View tanpa salinan data yang aman dibagikan ke banyak sesi:
+    # DataFrame/Series -> salinan dangkal (copy-on-write), ndarray -> view read-only.
+    # Objek lain (hasil bytes, indeks, sketsa) dibagikan apa adanya seperti st.cache_resource.
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if type(value) is tuple:
+        return tuple(readonly(item) for item in value)
+    return value
+
+
+class BoundedCache:
+    # Cache LRU dengan batas memori (byte), batas jumlah entri opsional dan TTL.
+    # Aman dipakai dari banyak thread (satu thread per sesi Streamlit); nilai
+    # yang sama tidak dihitung dua kali saat beberapa sesi memintanya bersamaan.
+    # Setiap entri boleh diberi tag (misal sidik jari data). Saat entri dibuang
+    # dari cache ini, entri dengan tag yang sama di cache `dependents` ikut
+    # dibuang: nilai turunan (indeks, agregat, grafik) menyimpan referensi ke
+    # DataFrame sumber, dan memori DataFrame itu hanya dihitung selama masih
+    # ada di cache sumbernya.
+
+    def __init__(self, name, max_bytes, max_entries=None, ttl=None, dependents=()):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.dependents = tuple(dependents)
+        self._entries = OrderedDict()   # key -> (value, nbytes, expires_at, tag)
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = self.misses = self.evictions = self.expirations = self.oversize = 0
+        self.largest_oversize = 0
+
+    def _lookup(self, key, now):
+        # Dipanggil dengan self._lock terkunci
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        value, nbytes, expires_at, _ = entry
+        if expires_at is not None and expires_at <= now:
+            self._remove(key)
+            self.expirations += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def _remove(self, key):
+        # Urutan kunci selalu cache sumber -> dependents (dependents tidak pernah
+        # memanggil balik cache sumber), jadi aman dipanggil dengan self._lock terkunci
+        _, nbytes, _, tag = self._entries.pop(key)
+        self._resident_bytes -= nbytes
+        if tag is not None:
+            for store in self.dependents:
+                store.discard_tag(tag)
+
+    def discard_tag(self, tag):
+        # Buang semua entri bertag `tag` (dihitung sebagai eviction)
+        with self._lock:
+            for key in [k for k, (_, _, _, entry_tag) in self._entries.items() if entry_tag == tag]:
+                self._remove(key)
+                self.evictions += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return readonly(value)
+
+    def set(self, key, value, nbytes=None, tag=None):
+        if nbytes is None:
+            nbytes = estimate_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if nbytes > self.max_bytes:
+                # Lebih besar dari seluruh anggaran: dikembalikan ke pemanggil tanpa disimpan,
+                # jadi akan dihitung ulang di setiap pemanggilan. Selalu dilaporkan karena
+                # biasanya berarti anggaran terlalu kecil untuk dataset ini.
+                self.oversize += 1
+                self.largest_oversize = max(self.largest_oversize, nbytes)
+                logger.warning(
+                    "Cache %s: nilai %.1f MB melebihi batas %.1f MB dan tidak disimpan; "
+                    "naikkan DASHBOARD_CACHE_%s_MB",
+                    self.name, nbytes / 2**20, self.max_bytes / 2**20, self.name.upper(),
+                )
+                return False
+            now = time.monotonic()
+            self._evict(nbytes, now)
+            expires_at = now + self.ttl if self.ttl is not None else None
+            self._entries[key] = (value, nbytes, expires_at, tag)
+            self._resident_bytes += nbytes
+            return True
+
+    def _evict(self, incoming_bytes, now):
+        # Buang entri kedaluwarsa dulu, lalu entri yang paling lama tidak dipakai
+        if self.ttl is not None:
+            for key in [k for k, (_, _, expires_at, _) in self._entries.items() if expires_at <= now]:
+                self._remove(key)
+                self.expirations += 1
+        while self._entries and (
+            self._resident_bytes + incoming_bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) >= self.max_entries)
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute, tag=None):
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is not _MISSING:
+                self.hits += 1
+                return readonly(value)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Hanya satu thread yang menghitung nilai untuk key ini; thread lain menunggu
+        # lalu mengambil hasilnya dari cache
+        with key_lock:
+            try:
+                with self._lock:
+                    value = self._lookup(key, time.monotonic())
+                    if value is not _MISSING:
+                        self.hits += 1
+                        return readonly(value)
+                    self.misses += 1
+                value = compute()
+                self.set(key, value, tag=tag)
+                return readonly(value)
+            finally:
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._resident_bytes = 0
+        for store in self.dependents:
+            store.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(
+                self.name, len(self._entries), self._resident_bytes, self.max_bytes, self.max_entries, self.ttl,
+                self.hits, self.misses, self.evictions, self.expirations, self.oversize,
+                self.largest_oversize,
+            )
+
+
+def memoize(store):
+    # Dekorator: hasil fungsi di-cache di `store` dengan key (kode fungsi, argumen).
+    # Kode fungsi ikut menjadi key agar mengubah isi fungsi tidak memakai hasil lama.
+    # Semua argumen harus hashable; sidik jari data (lihat data_loader.source_fingerprint)
+    # harus menjadi argumen pertama agar hasil ikut diperbarui saat CSV berubah.
+    # Argumen pertama juga menjadi tag entri, sehingga hasil turunan dibuang
+    # bersama data sumbernya (lihat BoundedCache.dependents).
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            return store.get_or_compute(
+                (func.__code__, args), lambda: func(*args), tag=args[0] if args else None
+            )
+        return wrapper
+    return decorator
+
+
+def _env_mb(name, default_mb):
+    return int(float(os.environ.get(name, default_mb)) * 2**20)
+
+
+def _env_seconds(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+# Cache bersama untuk seluruh proses (semua sesi). Anggaran bisa diatur lewat
+# variabel lingkungan, misal DASHBOARD_CACHE_DATA_MB=2048.
+AGGREGATES = BoundedCache(
+    "aggregates", _env_mb("DASHBOARD_CACHE_AGGREGATES_MB", 512),
+    ttl=_env_seconds("DASHBOARD_CACHE_TTL", 3600),
+)
+FIGURES = BoundedCache(
+    "figures", _env_mb("DASHBOARD_CACHE_FIGURES_MB", 128),
+    ttl=_env_seconds("DASHBOARD_CACHE_TTL", 3600),
+)
+# Agregat dan grafik sebuah versi data dibuang bersama DataFrame-nya, sehingga
+# tidak ada DataFrame lama yang tetap hidup di luar anggaran DATA sampai TTL habis.
+# Nilai DATA yang melebihi anggarannya tidak disimpan sama sekali; hal itu
+# diperingatkan lewat log dan sidebar (lihat BoundedCache.set).
+DATA = BoundedCache(
+    "data", _env_mb("DASHBOARD_CACHE_DATA_MB", 1024),
+    max_entries=2,   # Dataset aktif + satu versi sebelumnya saat CSV baru saja diganti
+    dependents=(AGGREGATES, FIGURES),
+)
+CACHES = (DATA, AGGREGATES, FIGURES)
+
+
+def stats():
+    return [store.stats() for store in CACHES]
+
+
+def clear_all():
+    for store in CACHES:
+        store.clear()
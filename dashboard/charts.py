@@ -0,0 +1,913 @@
+import importlib
+import os
+from collections import namedtuple
+
+import pandas as pd          # Untuk manipulasi dan analisis data
+
+from aggregates import ALL_CUSTOMERS
+from cohorts import cohort_retention
+from leaderboard import top_k_positions
+from quantile_sketch import build_delivery_sketches
+
+
+class _LazyModule:
+    # Modul yang baru diimpor saat atributnya pertama kali dipakai.
+    # matplotlib dan seaborn (yang ikut menarik scipy) cukup berat, jadi
+    # keduanya tidak diimpor sampai ada grafik yang benar-benar digambar.
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+            _ensure_theme()
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+plt = _LazyModule("matplotlib.pyplot")   # Untuk membuat plot statis
+sns = _LazyModule("seaborn")             # Untuk visualisasi statistik yang lebih indah
+mticker = _LazyModule("matplotlib.ticker") # Untuk format sumbu plot
+
+_theme_applied = False
+
+
+def _ensure_theme():
+    # Tema hanya perlu dipasang sekali per proses, bukan di setiap rerun skrip
+    global _theme_applied
+    if _theme_applied:
+        return
+    _theme_applied = True
+    apply_dark_theme()
+
+
+def apply_dark_theme():
+    # --- Atur gaya Matplotlib untuk latar belakang gelap ---
+    # Blok ini memastikan gaya tema gelap yang konsisten untuk semua plot
+    pyplot = importlib.import_module("matplotlib.pyplot")
+    pyplot.style.use('dark_background')
+    pyplot.rcParams.update({
+        "figure.facecolor": "black",
+        "axes.facecolor": "black",
+        "savefig.facecolor": "black",
+        "text.color": "white",
+        "axes.labelcolor": "white",
+        "xtick.color": "white",
+        "ytick.color": "white",
+        "grid.color": "gray",
+        "axes.edgecolor": "white",
+        "patch.edgecolor": "white",
+        "axes.titlecolor": "white",
+        "legend.labelcolor": "white",
+        "legend.title_fontsize": 'medium', # Pastikan judul legenda terlihat
+        "legend.fontsize": 'small',        # Pastikan label legenda terlihat
+    })
+
+
+def preload():
+    # Impor semua pustaka plotting (dan pasang tema) sekarang juga,
+    # misalnya agar grafik pertama di server yang sudah "hangat" tidak lambat.
+    for module in (plt, sns, mticker):
+        module._load()
+
+
+# Mode startup: default-nya lazy. Set DASHBOARD_EAGER_IMPORTS=1 untuk memuat
+# pustaka plotting langsung saat modul ini diimpor.
+if os.environ.get("DASHBOARD_EAGER_IMPORTS") == "1":
+    preload()
+
+
+def close(fig):
+    # Figure hanya ada jika pyplot sudah dimuat, jadi ini tidak memicu impor baru
+    plt.close(fig)
+
+
+# =====================================================================
+# KPI
+# =====================================================================
+
+def plot_kpi_comparison(kpi_table_df):
+    # kpi_table_df berasal dari aggregates.kpi_by_segment; baris 'All Customers' tidak digambar
+    segment_kpi_df = kpi_table_df.drop(index=ALL_CUSTOMERS, errors='ignore').reset_index()
+    panels = [
+        ("total_revenue", "Total Pendapatan (R$)", "Blues_r", lambda v: f"{v / 1_000_000:.2f}M"),
+        ("total_orders", "Total Pesanan", "Greens_r", lambda v: f"{v:,.0f}"),
+        ("avg_review_score", "Rata-rata Skor Ulasan", "Purples_r", lambda v: f"{v:.2f}"),
+        ("total_customers", "Total Pelanggan", "Oranges_r", lambda v: f"{v:,.0f}"),
+    ]
+
+    fig_kpi, axes_kpi = plt.subplots(1, 4, figsize=(20, 5))
+    for ax, (column, title, palette, label) in zip(axes_kpi, panels):
+        sns.barplot(x="Segment", y=column, data=segment_kpi_df, palette=palette, hue="Segment", legend=False, ax=ax)
+        ax.set_title(title, fontsize=12, color='white')
+        ax.set_xlabel("Segmen RFM", color='white')
+        ax.set_ylabel("")
+        ax.tick_params(axis='x', rotation=30, colors='white')
+        ax.tick_params(axis='y', colors='white')
+        for p in ax.patches:
+            ax.annotate(label(p.get_height()), (p.get_x() + p.get_width() / 2, p.get_height()), ha="center", va="bottom", fontsize=8, color='white')
+        ax.set_ylim(top=segment_kpi_df[column].max() * 1.15)
+    plt.tight_layout()
+    return fig_kpi
+
+
+# =====================================================================
+# 1. Ringkasan Umum Data
+# =====================================================================
+
+def plot_numeric_distributions(master_orders_df):
+    numeric_cols = [
+        "payment_value", "total_price", "total_freight",
+        "delivery_time_days", "total_items", "unique_sellers",
+        "review_score"
+    ]
+    # --- Dedicated variable for log-scaled columns ---
+    log_scaled_cols = ["payment_value", "total_price", "total_freight", "delivery_time_days"]
+
+    n_cols = 3
+    n_rows = (len(numeric_cols) + n_cols - 1) // n_cols
+
+    fig_num, axes_num = plt.subplots(n_rows, n_cols, figsize=(n_cols * 5, n_rows * 4))
+    axes_num = axes_num.flatten() # Ratakan untuk iterasi mudah
+
+    for i, col in enumerate(numeric_cols):
+        ax = axes_num[i]
+        if col in log_scaled_cols:
+            sns.histplot(master_orders_df[col].dropna(), bins=50, kde=True, log_scale=True, ax=ax, color='cyan')
+            ax.set_title(f"Distribusi {col.replace('_', ' ').title()} (Skala Log)", fontsize=10, color='white')
+        elif col in ["total_items", "unique_sellers", "review_score"]:
+            # Pastikan bins sesuai untuk nilai diskrit, misal, nilai maksimal + 1
+            bins = int(master_orders_df[col].max()) if master_orders_df[col].nunique() > 1 else 1 # Tangani kasus nilai unik tunggal
+            sns.histplot(master_orders_df[col].dropna(), bins=bins, kde=False, ax=ax, color='lime')
+            ax.set_title(f"Distribusi {col.replace('_', ' ').title()}", fontsize=10, color='white')
+        else:
+            sns.histplot(master_orders_df[col].dropna(), bins=30, kde=True, ax=ax, color='gold')
+            ax.set_title(f"Distribusi {col.replace('_', ' ').title()}", fontsize=10, color='white')
+        ax.set_xlabel(col.replace('_', ' ').title(), fontsize=8, color='white')
+        ax.set_ylabel("Frekuensi", fontsize=8, color='white')
+        ax.tick_params(axis='x', colors='white')
+        ax.tick_params(axis='y', colors='white')
+
+    for i in range(len(numeric_cols), len(axes_num)):
+        fig_num.delaxes(axes_num[i]) # Hapus subplot kosong
+
+    plt.tight_layout(rect=[0, 0, 1, 0.96]) # Sesuaikan layout untuk mencegah tumpang tindih judul
+    fig_num.suptitle("Distribusi Variabel Numerik Utama", fontsize=14, color='white')
+    return fig_num
+
+
+def plot_order_status(master_orders_df):
+    order_status_summary_df = master_orders_df["order_status"].value_counts(normalize=True).mul(100).round(2).reset_index(name="Percentage (%)")
+    order_status_summary_df.columns = ['order_status', 'Percentage (%)']
+    fig_status, ax_status = plt.subplots(figsize=(6, 4))
+    sns.barplot(x="Percentage (%)", y="order_status", data=order_status_summary_df, palette='viridis', ax=ax_status, hue="order_status", legend=False)
+    ax_status.set_xlabel("Persentase (%)", color='white')
+    ax_status.set_ylabel("Status Pesanan", color='white')
+    ax_status.tick_params(axis='x', colors='white')
+    ax_status.tick_params(axis='y', colors='white')
+    for index, value in enumerate(order_status_summary_df["Percentage (%)"]):
+        ax_status.text(value + 0.5, index, f'{value:.1f}%', va='center', fontsize=8, color='white')
+    # Adjust xlim to provide enough space for labels
+    ax_status.set_xlim(right=order_status_summary_df["Percentage (%)"].max() * 1.15) # Add 15% padding
+    plt.tight_layout()
+    return fig_status
+
+
+def plot_payment_types(master_orders_df):
+    payment_types_summary_df = master_orders_df["payment_types"].value_counts(normalize=True).mul(100).round(2).reset_index(name="Percentage (%)")
+    payment_types_summary_df.columns = ['payment_types', 'Percentage (%)']
+    fig_payment, ax_payment = plt.subplots(figsize=(4, 4)) # Adjusted figsize to be more square-like for vertical bars
+    sns.barplot(x="payment_types", y="Percentage (%)", data=payment_types_summary_df, palette='plasma', ax=ax_payment, hue="payment_types", legend=False) # Vertical bar plot
+    ax_payment.set_xlabel("Jumlah Metode Pembayaran Digunakan", color='white') # Updated x-label
+    ax_payment.set_ylabel("Persentase (%)", color='white') # Updated y-label
+    ax_payment.tick_params(axis='x', colors='white')
+    ax_payment.tick_params(axis='y', colors='white')
+    for index, value in enumerate(payment_types_summary_df["Percentage (%)"]):
+        ax_payment.text(index, value + 0.5, f'{value:.1f}%', ha='center', fontsize=8, color='white')
+    ax_payment.set_ylim(top=payment_types_summary_df["Percentage (%)"].max() * 1.15)
+    plt.tight_layout()
+    return fig_payment
+
+
+def plot_review_score_distribution(master_orders_df):
+    review_score_summary_df = master_orders_df["review_score"].value_counts(normalize=True).mul(100).round(2).reset_index(name="Percentage (%)")
+    review_score_summary_df.columns = ['review_score', 'Percentage (%)']
+    fig_review, ax_review = plt.subplots(figsize=(6, 4))
+    sns.barplot(x="review_score", y="Percentage (%)", data=review_score_summary_df, palette='rocket_r', ax=ax_review, hue="review_score", legend=False)
+    ax_review.set_xlabel("Skor Ulasan", color='white')
+    ax_review.set_ylabel("Persentase (%)", color='white')
+    ax_review.tick_params(axis='x', colors='white')
+    ax_review.tick_params(axis='y', colors='white')
+    for p in ax_review.patches:
+        ax_review.annotate(
+            f'{p.get_height():.1f}%',
+            (p.get_x() + p.get_width() / 2, p.get_height()),
+            ha='center', va='bottom', fontsize=8, color='white', xytext=(0, 5), textcoords='offset points'
+        )
+    # Adjust ylim to provide enough space for labels
+    ax_review.set_ylim(top=review_score_summary_df["Percentage (%)"].max() * 1.15) # Add 15% padding
+    plt.tight_layout()
+    return fig_review
+
+
+def plot_orders_monthly(orders_monthly_df):
+    fig_orders_monthly, ax_orders_monthly = plt.subplots(figsize=(8, 4))
+    ax_orders_monthly.plot(orders_monthly_df["month"], orders_monthly_df["order_count"], marker="o", color='cyan')
+    ax_orders_monthly.set_title("Volume Pesanan Bulanan", fontsize=10, color='white')
+    ax_orders_monthly.set_xlabel("Bulan", fontsize=8, color='white')
+    ax_orders_monthly.set_ylabel("Jumlah Pesanan", fontsize=8, color='white')
+    ax_orders_monthly.tick_params(labelsize=7, rotation=45, colors='white')
+    ax_orders_monthly.grid(axis="y", linestyle="--", alpha=0.6)
+    ax_orders_monthly.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'{int(x):,}'))
+    plt.tight_layout()
+    return fig_orders_monthly
+
+
+def plot_monthly_revenue(monthly_revenue_df):
+    fig_monthly_revenue, ax_monthly_revenue = plt.subplots(figsize=(8, 4))
+    ax_monthly_revenue.plot(monthly_revenue_df["month"], monthly_revenue_df["total_revenue"], marker="o", color='lime')
+    ax_monthly_revenue.set_title("Tren Pendapatan Bulanan", fontsize=10, color='white')
+    ax_monthly_revenue.set_xlabel("Bulan", fontsize=8, color='white')
+    ax_monthly_revenue.set_ylabel("Pendapatan (R$)", fontsize=8, color='white')
+    ax_monthly_revenue.tick_params(labelsize=7, rotation=45, colors='white')
+    ax_monthly_revenue.grid(axis="y", linestyle="--", alpha=0.6)
+    ax_monthly_revenue.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'R${x/1_000_000:.1f}M'))
+    plt.tight_layout()
+    return fig_monthly_revenue
+
+
+# =====================================================================
+# 2. Analisis Kepuasan Pelanggan
+# =====================================================================
+
+def plot_category_review_scores(category_review_scores_df):
+    top_bottom_categories = (
+        category_review_scores_df
+        .sort_values('avg_review_score', ascending=False)
+        .pipe(lambda df: pd.concat([df.head(10), df.tail(10)]))
+        .sort_values('avg_review_score', ascending=False) # Changed to ascending=False
+    )
+    fig_cat_review, ax_cat_review = plt.subplots(figsize=(10, 6))
+    sns.barplot(
+        x='avg_review_score',
+        y='product_category_name_english',
+        data=top_bottom_categories,
+        ax=ax_cat_review,
+        palette='coolwarm',
+        hue='product_category_name_english',
+        legend=False
+    )
+    ax_cat_review.set_title('Top & Bottom Kategori Produk berdasarkan Rata-rata Review Score', fontsize=12, color='white')
+    ax_cat_review.set_xlabel('Rata-rata Review Score', fontsize=10, color='white')
+    ax_cat_review.set_ylabel('Kategori Produk', fontsize=10, color='white')
+    ax_cat_review.tick_params(axis='x', colors='white')
+    ax_cat_review.tick_params(axis='y', colors='white')
+    for index, value in enumerate(top_bottom_categories['avg_review_score']):
+        ax_cat_review.text(value + 0.05, index, f'{value:.2f}', va='center', fontsize=8, color='white')
+    ax_cat_review.set_xlim(right=top_bottom_categories['avg_review_score'].max() * 1.15) # Adjust x-axis limit for labels
+    plt.tight_layout()
+    return fig_cat_review
+
+
+def plot_state_review_scores(state_review_summary_df):
+    top_bottom_states = (
+        state_review_summary_df
+        .sort_values('avg_review_score', ascending=False)
+        .pipe(lambda df: pd.concat([df.head(10), df.tail(10)]))
+        .sort_values('avg_review_score', ascending=False) # Changed to ascending=False
+    )
+    fig_state_review, ax_state_review = plt.subplots(figsize=(10, 6))
+    sns.barplot(
+        x='avg_review_score',
+        y='customer_state',
+        data=top_bottom_states,
+        ax=ax_state_review,
+        palette='coolwarm',
+        hue='customer_state',
+        legend=False
+    )
+    ax_state_review.set_title('Top & Bottom Negara Bagian berdasarkan Rata-rata Review Score', fontsize=12, color='white')
+    ax_state_review.set_xlabel('Rata-rata Review Score', fontsize=10, color='white')
+    ax_state_review.set_ylabel('Negara Bagian', fontsize=10, color='white')
+    ax_state_review.tick_params(axis='x', colors='white')
+    ax_state_review.tick_params(axis='y', colors='white')
+    for index, value in enumerate(top_bottom_states['avg_review_score']):
+        ax_state_review.text(value + 0.05, index, f'{value:.2f}', va='center', fontsize=8, color='white')
+    ax_state_review.set_xlim(right=top_bottom_states['avg_review_score'].max() * 1.15) # Adjust x-axis limit for labels
+    plt.tight_layout()
+    return fig_state_review
+
+
+def plot_delivery_time_vs_review(master_orders_df):
+    # Create review_delivery_summary_df for Streamlit
+    review_delivery_summary_df = (
+        master_orders_df
+        .groupby("review_score", as_index=False)
+        .agg(
+            avg_delivery_time_days=("delivery_time_days", "mean"),
+            total_orders=("delivery_time_days", "count")
+        )
+    )
+    review_delivery_summary_df["avg_delivery_time_days"] = (
+        review_delivery_summary_df["avg_delivery_time_days"].round().astype(int)
+    )
+
+    fig_delivery_review, ax_delivery_review = plt.subplots(figsize=(10, 6))
+
+    # Define custom color map
+    color_map = {score: 'red' if score == 1.0 else 'green' if score == 5.0 else 'skyblue'
+                 for score in review_delivery_summary_df['review_score']}
+
+    sns.barplot(
+        x="review_score",
+        y="avg_delivery_time_days",
+        data=review_delivery_summary_df,
+        hue="review_score",
+        palette=color_map,
+        legend=False,
+        ax=ax_delivery_review
+    )
+    ax_delivery_review.set_title("Average Delivery Time vs Review Score", fontsize=14, color='white')
+    ax_delivery_review.set_xlabel("Review Score", fontsize=12, color='white')
+    ax_delivery_review.set_ylabel("Average Delivery Time (Days)", fontsize=12, color='white')
+    ax_delivery_review.grid(axis='y', linestyle='--', alpha=0.6)
+    ax_delivery_review.tick_params(axis='x', colors='white')
+    ax_delivery_review.tick_params(axis='y', colors='white')
+
+    # Add data labels
+    for p in ax_delivery_review.patches:
+        ax_delivery_review.annotate(
+            f'{int(p.get_height())}',
+            (p.get_x() + p.get_width() / 2., p.get_height()),
+            ha='center',
+            va='center',
+            fontsize=10,
+            color='white', # Set text color to white for dark background
+            xytext=(0, 5),
+            textcoords='offset points'
+        )
+
+    # Adjust y-axis limit for padding
+    ax_delivery_review.set_ylim(0, review_delivery_summary_df['avg_delivery_time_days'].max() * 1.1)
+
+    plt.tight_layout()
+    return fig_delivery_review
+
+
+def plot_delivery_percentiles(percentiles_df, group_col, max_groups=20):
+    # percentiles_df berasal dari quantile_sketch.SketchCube.query(by=(group_col,));
+    # hanya max_groups kelompok dengan pesanan terbanyak yang digambar
+    plot_df = (
+        percentiles_df
+        .nlargest(max_groups, "total_orders")
+        .sort_values(group_col)
+        .melt(id_vars=[group_col], value_vars=["p50", "p90", "p99"], var_name="Persentil", value_name="Hari")
+    )
+    fig_delivery_pct, ax_delivery_pct = plt.subplots(figsize=(12, 6))
+    sns.barplot(
+        x=group_col,
+        y="Hari",
+        hue="Persentil",
+        data=plot_df,
+        palette={"p50": "skyblue", "p90": "orange", "p99": "red"},
+        ax=ax_delivery_pct
+    )
+    ax_delivery_pct.set_title(f"Persentil Waktu Pengiriman per {group_col}", fontsize=14, color='white')
+    ax_delivery_pct.set_xlabel(group_col, fontsize=12, color='white')
+    ax_delivery_pct.set_ylabel("Waktu Pengiriman (Hari)", fontsize=12, color='white')
+    ax_delivery_pct.grid(axis='y', linestyle='--', alpha=0.6)
+    ax_delivery_pct.tick_params(axis='x', colors='white', rotation=45 if plot_df[group_col].nunique() > 8 else 0)
+    ax_delivery_pct.tick_params(axis='y', colors='white')
+    ax_delivery_pct.legend(title="Persentil", facecolor='black', edgecolor='white', labelcolor='white')
+    plt.tight_layout()
+    return fig_delivery_pct
+
+
+def plot_delivery_percentiles_by_score(master_orders_df, items_products_df):
+    # Versi untuk skrip ekspor: bangun sketsa dari data mentah lalu gambar per skor ulasan
+    cube = build_delivery_sketches(master_orders_df, items_products_df)
+    return plot_delivery_percentiles(cube.query(by=("review_score",)), "review_score")
+
+
+def plot_review_by_order_status(master_orders_df):
+    # Create order_status_review_scores_df for Streamlit
+    order_status_review_scores_df = (
+        master_orders_df
+        .groupby('order_status')['review_score']
+        .mean()
+        .round(2)
+        .sort_values(ascending=False)
+        .reset_index()
+    )
+
+    fig_status_review, ax_status_review = plt.subplots(figsize=(12, 7))
+
+    # Define custom color map
+    status_colors = {
+        'delivered': 'green',
+        'approved': 'skyblue',
+        'created': 'skyblue',
+        'invoiced': 'skyblue',
+        'processing': 'skyblue',
+        'shipped': 'skyblue',
+        'unavailable': 'red',
+        'canceled': 'red'
+    }
+    colors_for_plot = [status_colors.get(status, 'gray') for status in order_status_review_scores_df['order_status']]
+
+    sns.barplot(
+        x="order_status",
+        y="review_score",
+        data=order_status_review_scores_df, # Use the prepared dataframe
+        palette=colors_for_plot, # Use custom color palette
+        hue="order_status",      # Set hue for distinct colors per bar
+        legend=False,            # Disable legend as colors are self-explanatory
+        ax=ax_status_review
+    )
+    ax_status_review.set_title("Average Review Score by Order Status", fontsize=16, color='white')
+    ax_status_review.set_xlabel("Order Status", fontsize=12, color='white')
+    ax_status_review.set_ylabel("Review Score", fontsize=12, color='white')
+    # Corrected lines for tick_params and set_xticklabels
+    ax_status_review.tick_params(axis='x', colors='white')
+    ax_status_review.set_xticklabels(ax_status_review.get_xticklabels(), rotation=45, ha='right')
+    ax_status_review.tick_params(axis='y', colors='white')
+    ax_status_review.grid(axis='y', linestyle='--', alpha=0.7);
+
+    # Add data labels
+    for p in ax_status_review.patches:
+        ax_status_review.annotate(
+            f'{p.get_height():.2f}',
+            (p.get_x() + p.get_width() / 2., p.get_height()),
+            ha='center',
+            va='bottom',
+            fontsize=10,
+            color='white',
+            xytext=(0, 5),
+            textcoords='offset points'
+        )
+
+    # Set y-axis limit
+    ax_status_review.set_ylim(0, 5.0);
+
+    plt.tight_layout()
+    return fig_status_review
+
+
+def plot_correlation_matrix(master_orders_df):
+    numeric_for_corr = [
+        "payment_value", "total_price", "total_freight",
+        "delivery_time_days", "total_items", "unique_sellers",
+        "review_score"
+    ]
+    corr_matrix = master_orders_df[numeric_for_corr].corr()
+    fig_corr, ax_corr = plt.subplots(figsize=(10, 8))
+    sns.heatmap(
+        corr_matrix,
+        annot=True,
+        fmt=".2f",
+        cmap="coolwarm",
+        center=0,
+        linewidths=0.5,
+        linecolor="white",
+        cbar_kws={"shrink": 0.8},
+        ax=ax_corr,
+        annot_kws={"color": "white"} # Ensure annotation text is white
+    )
+    ax_corr.set_title("Matriks Koreelasi Antar Variabel Utama", fontsize=14, color='white')
+    ax_corr.tick_params(axis='x', colors='white')
+    ax_corr.tick_params(axis='y', colors='white')
+    plt.tight_layout()
+    return fig_corr
+
+
+# =====================================================================
+# 3. Analisis Pelanggan Bernilai Tinggi
+# =====================================================================
+
+def top_customers_table(rfm_segmentation_df, k=10):
+    # Tabel (bukan grafik): k pelanggan dengan total pengeluaran tertinggi,
+    # dipilih dengan seleksi parsial alih-alih mengurutkan semua pelanggan
+    positions = top_k_positions(rfm_segmentation_df['Monetary'].to_numpy(), k)
+    return (
+        rfm_segmentation_df[['customer_unique_id', 'Monetary', 'Segment']]
+        .iloc[positions]
+        .rename(columns={'Monetary': 'Total Pengeluaran'})
+    )
+
+
+def plot_high_value_products(master_orders_df, rfm_segmentation_df, items_products_df):
+    # Mengembalikan None jika tidak ada data untuk pelanggan 'Champions'
+    high_value_customer_ids = rfm_segmentation_df[
+        rfm_segmentation_df['Segment'] == 'Champions'
+    ]['customer_unique_id']
+
+    high_value_orders = master_orders_df[
+        master_orders_df['customer_unique_id'].isin(high_value_customer_ids)
+    ]
+
+    high_value_product_data = high_value_orders.merge(
+        items_products_df,
+        on='order_id',
+        how='inner'
+    )
+
+    if high_value_product_data.empty:
+        return None
+
+    high_value_product_preferences_filtered = (
+        high_value_product_data
+        ['product_category_name_english']
+        .value_counts()
+        .rename_axis("product_category_name_english")
+        .reset_index(name="Number of Orders")
+    )
+    high_value_product_preferences_filtered["Percentage (%)"] = (
+        high_value_product_preferences_filtered["Number of Orders"]
+        / high_value_product_preferences_filtered["Number of Orders"].sum() * 100
+    ).round(1)
+
+    fig_hv_products, ax_hv_products = plt.subplots(figsize=(10, 5))
+    sns.barplot(
+        x="Number of Orders",
+        y="product_category_name_english",
+        data=high_value_product_preferences_filtered.head(10),
+        ax=ax_hv_products,
+        palette='viridis',
+        hue="product_category_name_english",
+        legend=False
+    )
+    for p in ax_hv_products.patches:
+        ax_hv_products.annotate(
+            f'{int(p.get_width())}',
+            (p.get_width(), p.get_y() + p.get_height() / 2),
+            ha='left', va='center', fontsize=8, color='white',
+            xytext=(5, 0), textcoords='offset points'
+        )
+    ax_hv_products.set_title("Top 10 Kategori Produk untuk Pelanggan Bernilai Tinggi (Champions)", color='white')
+    ax_hv_products.set_xlabel("Jumlah Pesanan", color='white')
+    ax_hv_products.set_ylabel("Kategori Produk", color='white')
+    ax_hv_products.grid(axis="x", linestyle="--", alpha=0.4)
+    ax_hv_products.tick_params(axis='x', colors='white')
+    ax_hv_products.tick_params(axis='y', colors='white')
+    plt.tight_layout()
+    return fig_hv_products
+
+
+def plot_order_frequency(customer_value_df):
+    fig_freq_dist, ax_freq_dist = plt.subplots(figsize=(10, 5))
+    sns.histplot(customer_value_df["total_orders"], bins=30, ax=ax_freq_dist, color='orange') # Fixed bins to 30
+    ax_freq_dist.set_title("Distribusi Jumlah Pesanan per Pelanggan", fontsize=12, color='white')
+    ax_freq_dist.set_xlabel("Total Pesanan", fontsize=10, color='white')
+    ax_freq_dist.set_ylabel("Jumlah Pelanggan", fontsize=10, color='white')
+    ax_freq_dist.grid(axis='y', linestyle="--", alpha=0.6)
+    ax_freq_dist.tick_params(axis='x', colors='white')
+    ax_freq_dist.tick_params(axis='y', colors='white')
+    plt.tight_layout()
+    return fig_freq_dist
+
+
+def plot_cohort_retention(retention_df, max_offset=12):
+    # retention_df berasal dari cohorts.cohort_retention(); kolom 0 (selalu 100%)
+    # tidak digambar, cukup bulan ke-1 sampai max_offset setelah pembelian pertama
+    offsets = [col for col in retention_df.columns if col != 'cohort_size' and 1 <= col <= max_offset]
+    plot_df = retention_df[offsets]
+    fig_cohort, ax_cohort = plt.subplots(figsize=(14, max(6, len(plot_df) * 0.35)))
+    sns.heatmap(
+        plot_df,
+        annot=True,
+        fmt=".1f",
+        cmap="YlOrRd",
+        linewidths=0.5,
+        linecolor="black",
+        cbar_kws={"label": "Retensi (%)", "shrink": 0.8},
+        ax=ax_cohort,
+        annot_kws={"fontsize": 7}
+    )
+    ax_cohort.set_title("Retensi Kohort Pelanggan (% pelanggan yang membeli lagi)", fontsize=14, color='white')
+    ax_cohort.set_xlabel("Bulan Sejak Pembelian Pertama", fontsize=12, color='white')
+    ax_cohort.set_ylabel("Kohort (Bulan Pembelian Pertama)", fontsize=12, color='white')
+    ax_cohort.tick_params(axis='x', colors='white')
+    ax_cohort.tick_params(axis='y', colors='white', rotation=0)
+    plt.tight_layout()
+    return fig_cohort
+
+
+def plot_cohort_retention_from_orders(master_orders_df):
+    # Versi untuk skrip ekspor: hitung matriks kohort dari data mentah lalu gambar
+    return plot_cohort_retention(cohort_retention(master_orders_df))
+
+
+def plot_frequency_vs_aov(customer_value_df):
+    fig_freq_aov, ax_freq_aov = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(
+        x="total_orders",
+        y="avg_order_value",
+        data=customer_value_df,
+        alpha=0.5,
+        ax=ax_freq_aov,
+        color='gold'
+    )
+    ax_freq_aov.set_title("Frekuensi vs Rata-rata Nilai Pesanan", fontsize=12, color='white')
+    ax_freq_aov.set_xlabel("Total Pesanan", fontsize=10, color='white')
+    ax_freq_aov.set_ylabel("Rata-rata Nilai Pesanan (R$)", fontsize=10, color='white')
+    ax_freq_aov.grid(axis='both', linestyle="--", alpha=0.6)
+    ax_freq_aov.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, p: f'{x/1000:.0f}K'))
+    ax_freq_aov.tick_params(axis='x', colors='white')
+    ax_freq_aov.tick_params(axis='y', colors='white')
+    plt.tight_layout()
+    return fig_freq_aov
+
+
+def plot_payment_complexity(payment_customer_df):
+    fig_payment_value_scatter, ax_payment_value_scatter = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(
+        x="payment_types",
+        y="total_spent",
+        data=payment_customer_df,
+        alpha=0.5,
+        ax=ax_payment_value_scatter,
+        color='lightblue'
+    )
+    ax_payment_value_scatter.set_title("Kompleksitas Pembayaran vs Nilai Pelanggan", fontsize=12, color='white')
+    ax_payment_value_scatter.set_xlabel("Jumlah Jenis Pembayaran yang Digunakan", color='white')
+    ax_payment_value_scatter.set_ylabel("Total Pengeluaran (R$)", color='white')
+    ax_payment_value_scatter.grid(axis='both', linestyle="--", alpha=0.6)
+    ax_payment_value_scatter.tick_params(axis='x', colors='white')
+    ax_payment_value_scatter.tick_params(axis='y', colors='white')
+    plt.tight_layout()
+    return fig_payment_value_scatter
+
+
+# =====================================================================
+# 4. Analisis RFM
+# =====================================================================
+
+def plot_rfm_segment_distribution(rfm_segmentation_df):
+    rfm_segment_summary_df = (
+        rfm_segmentation_df["Segment"]
+        .value_counts(normalize=True)
+        .mul(100)
+        .round(1)
+        .reset_index(name="Persentase (%)")
+    )
+    rfm_segment_summary_df = rfm_segment_summary_df.rename(columns={'index': 'Segment'})
+
+    fig_rfm_dist, ax_rfm_dist = plt.subplots(figsize=(8, 5))
+    sns.barplot(
+        x="Segment",
+        y="Persentase (%)",
+        data=rfm_segment_summary_df,
+        palette='viridis',
+        hue="Segment",
+        legend=False,
+        ax=ax_rfm_dist
+    )
+    ax_rfm_dist.set_title("Distribusi Pelanggan Berdasarkan Segmen RFM", fontsize=12, color='white')
+    ax_rfm_dist.set_xlabel("Segmen RFM", color='white')
+    ax_rfm_dist.set_ylabel("Persentase Pelanggan (%)", color='white')
+    ax_rfm_dist.tick_params(axis='x', rotation=30, colors='white')
+    ax_rfm_dist.tick_params(axis='y', colors='white')
+    ax_rfm_dist.set_ylim(0, rfm_segment_summary_df["Persentase (%)"].max() * 1.15) # Adjust ylim for labels
+    for p in ax_rfm_dist.patches:
+        percentage = f'{p.get_height():.1f}%'
+        x = p.get_x() + p.get_width() / 2
+        y = p.get_height()
+        ax_rfm_dist.annotate(percentage, (x, y), ha='center', va='bottom', fontsize=8, color='white', xytext=(0, 5), textcoords='offset points')
+    plt.tight_layout()
+    return fig_rfm_dist
+
+
+def plot_rfm_segment_averages(rfm_segmentation_df):
+    rfm_avg_metrics_readable_df = (
+        rfm_segmentation_df
+        .groupby("Segment")[["Recency", "Frequency", "Monetary"]]
+        .mean()
+        .round(2)
+        .rename(columns={
+            "Recency": "Avg Recency (Hari)",
+            "Frequency": "Avg Frequency (Pesanan)",
+            "Monetary": "Avg Monetary Value (R$)"
+        })
+        .sort_values("Avg Recency (Hari)", ascending=True)
+        .reset_index()
+    )
+
+    fig_avg_rfm, axes_avg_rfm = plt.subplots(1, 3, figsize=(18, 5))
+
+    sns.barplot(x="Segment", y="Avg Recency (Hari)", data=rfm_avg_metrics_readable_df, palette="Blues_r", hue="Segment", legend=False, ax=axes_avg_rfm[0])
+    axes_avg_rfm[0].set_title("Rata-rata Recency", fontsize=12, color='white')
+    axes_avg_rfm[0].set_xlabel("Segmen RFM", color='white')
+    axes_avg_rfm[0].set_ylabel("Hari Sejak Pembelian Terakhir", color='white')
+    axes_avg_rfm[0].tick_params(axis='x', colors='white')
+    axes_avg_rfm[0].tick_params(axis='y', colors='white')
+    for p in axes_avg_rfm[0].patches:
+        axes_avg_rfm[0].annotate(f"{p.get_height():.0f}", (p.get_x() + p.get_width() / 2, p.get_height()), ha="center", va="bottom", fontsize=8, color='white')
+    axes_avg_rfm[0].set_ylim(top=rfm_avg_metrics_readable_df["Avg Recency (Hari)"].max() * 1.15) # Adjusted ylim
+
+    sns.barplot(x="Segment", y="Avg Frequency (Pesanan)", data=rfm_avg_metrics_readable_df, palette="Greens_r", hue="Segment", legend=False, ax=axes_avg_rfm[1])
+    axes_avg_rfm[1].set_title("Rata-rata Frekuensi", fontsize=12, color='white')
+    axes_avg_rfm[1].set_xlabel("Segmen RFM", color='white')
+    axes_avg_rfm[1].set_ylabel("Jumlah Pesanan", color='white')
+    axes_avg_rfm[1].tick_params(axis='x', colors='white')
+    axes_avg_rfm[1].tick_params(axis='y', colors='white')
+    for p in axes_avg_rfm[1].patches:
+        axes_avg_rfm[1].annotate(f"{p.get_height():.1f}", (p.get_x() + p.get_width() / 2, p.get_height()), ha="center", va="bottom", fontsize=8, color='white')
+    axes_avg_rfm[1].set_ylim(top=rfm_avg_metrics_readable_df["Avg Frequency (Pesanan)"].max() * 1.15) # Adjusted ylim
+
+    sns.barplot(x="Segment", y="Avg Monetary Value (R$)", data=rfm_avg_metrics_readable_df, palette="Oranges_r", hue="Segment", legend=False, ax=axes_avg_rfm[2])
+    axes_avg_rfm[2].set_title("Rata-rata Nilai Moneter", fontsize=12, color='white')
+    axes_avg_rfm[2].set_xlabel("Segmen RFM", color='white')
+    axes_avg_rfm[2].set_ylabel("Pengeluaran Rata-rata (R$)", color='white')
+    axes_avg_rfm[2].tick_params(axis='x', colors='white')
+    axes_avg_rfm[2].tick_params(axis='y', colors='white')
+    for p in axes_avg_rfm[2].patches:
+        axes_avg_rfm[2].annotate(f"{p.get_height():,.0f}", (p.get_x() + p.get_width() / 2, p.get_height()), ha="center", va="bottom", fontsize=8, color='white')
+    axes_avg_rfm[2].set_ylim(top=rfm_avg_metrics_readable_df["Avg Monetary Value (R$)"].max() * 1.15) # Adjusted ylim
+
+    plt.tight_layout()
+    return fig_avg_rfm
+
+
+def plot_rfm_review_scores(master_orders_df):
+    rfm_review_scores_filtered = (
+        master_orders_df
+        .groupby("Segment", as_index=False)["review_score"]
+        .mean()
+        .round(2)
+        .sort_values("review_score", ascending=False)
+    )
+    fig_rfm_review, ax_rfm_review = plt.subplots(figsize=(11, 6))
+    sns.barplot(
+        data=rfm_review_scores_filtered,
+        x="Segment",
+        y="review_score",
+        palette="viridis",
+        hue="Segment",
+        legend=False,
+        ax=ax_rfm_review
+    )
+    ax_rfm_review.set_title("Rata-rata Skor Ulasan per Segmen RFM", fontsize=15, weight="bold", color='white')
+    ax_rfm_review.set_xlabel("Segmen RFM", fontsize=12, color='white')
+    ax_rfm_review.set_ylabel("Rata-rata Skor Ulasan", fontsize=12, color='white')
+    ax_rfm_review.set_ylim(0, 5) # Ensure y-axis doesn't go below 0
+    ax_rfm_review.grid(axis="y", linestyle="--", alpha=0.4)
+    ax_rfm_review.tick_params(axis='x', colors='white')
+    ax_rfm_review.tick_params(axis='y', colors='white')
+    for p in ax_rfm_review.patches:
+        ax_rfm_review.annotate(
+            f"{p.get_height():.2f}",
+            (p.get_x() + p.get_width() / 2, p.get_height()),
+            ha="center", va="bottom", fontsize=10, xytext=(0, 5), textcoords="offset points", color='white'
+        )
+    plt.tight_layout()
+    return fig_rfm_review
+
+
+def plot_rfm_geo_distribution(master_orders_df):
+    customer_geo_segment_counts = (
+        master_orders_df.groupby(["customer_state", "Segment"])["customer_unique_id"]
+        .nunique() # Count unique customers within each state-segment group
+        .reset_index(name="Total Customers")
+    )
+
+    total_customers_per_state_geo = (
+        master_orders_df.groupby("customer_state")["customer_unique_id"]
+        .nunique()
+        .reset_index(name="Total Customers in State")
+    )
+
+    customer_geo_segment_percent = customer_geo_segment_counts.merge(
+        total_customers_per_state_geo, on="customer_state", how="left"
+    )
+    customer_geo_segment_percent["Segment Percentage (%)"] = (
+        customer_geo_segment_percent["Total Customers"]
+        / customer_geo_segment_percent["Total Customers in State"]
+        * 100
+    ).round(2)
+
+    top_10_states = (
+        total_customers_per_state_geo
+        .sort_values("Total Customers in State", ascending=False)
+        .head(10)["customer_state"]
+    )
+
+    pivoted_data_percent = (
+        customer_geo_segment_percent[
+            customer_geo_segment_percent["customer_state"].isin(top_10_states)
+        ]
+        .pivot_table(
+            index="customer_state",
+            columns="Segment",
+            values="Segment Percentage (%)",
+            fill_value=0
+        )
+        .loc[top_10_states]
+    )
+
+    fig_geo_segment, ax_geo_segment = plt.subplots(figsize=(14, 8))
+    pivoted_data_percent.plot(
+        kind="bar",
+        stacked=True,
+        colormap="crest",
+        edgecolor="white",
+        ax=ax_geo_segment
+    )
+
+    for container in ax_geo_segment.containers:
+        for i, patch in enumerate(container.patches):
+            height = patch.get_height()
+            # Adjust text position for better visibility inside or just outside bars
+            if height > 5: # Threshold for displaying label
+                x = patch.get_x() + patch.get_width() / 2
+                y = patch.get_y() + height / 2
+                ax_geo_segment.text(x, y, f'{height:.1f}%',
+                                    ha='center', va='center', fontsize=7, color='white',
+                                    rotation=90 if height < 10 else 0)
+
+    ax_geo_segment.set_title("Komposisi Segmen RFM di 10 Negara Bagian Teratas", fontsize=15, weight="bold", color='white')
+    ax_geo_segment.set_xlabel("Negara Bagian Pelanggan", fontsize=12, color='white')
+    ax_geo_segment.set_ylabel("Distribusi Pelanggan (%)", fontsize=12, color='white')
+    ax_geo_segment.tick_params(axis='x', colors='white')
+    ax_geo_segment.tick_params(axis='y', colors='white')
+    ax_geo_segment.grid(axis="y", linestyle="--", alpha=0.5)
+
+    ax_geo_segment.legend(title="Segmen RFM", bbox_to_anchor=(1.02, 1), loc="upper left", title_fontsize='medium', facecolor='black', edgecolor='white', labelcolor='white')
+    plt.tight_layout()
+    return fig_geo_segment
+
+
+# =====================================================================
+# Registri grafik per bagian dashboard
+# =====================================================================
+# Dipakai oleh skrip ekspor (export_report.py) untuk merender setiap bagian
+# tanpa Streamlit. `inputs` adalah nama DataFrame dari data_loader.DATA_KEYS
+# yang diteruskan ke `func` sesuai urutan; `kind` adalah "figure" atau "table".
+ChartSpec = namedtuple("ChartSpec", ["key", "expander", "title", "func", "inputs", "kind"])
+
+SECTIONS = {
+    "Ringkasan Umum Data": [
+        ChartSpec("numeric_distributions", "Distribusi Variabel Numerik", "Distribusi Variabel Numerik Utama",
+                  plot_numeric_distributions, ("master_orders_df",), "figure"),
+        ChartSpec("order_status", "Distribusi Variabel Kategorikal", "Status Pesanan",
+                  plot_order_status, ("master_orders_df",), "figure"),
+        ChartSpec("payment_types", "Distribusi Variabel Kategorikal", "Jumlah Metode Pembayaran per Pesanan",
+                  plot_payment_types, ("master_orders_df",), "figure"),
+        ChartSpec("review_score_distribution", "Distribusi Variabel Kategorikal", "Distribusi Skor Ulasan",
+                  plot_review_score_distribution, ("master_orders_df",), "figure"),
+        ChartSpec("orders_monthly", "Tren Berdasarkan Waktu", "Volume Pesanan Bulanan",
+                  plot_orders_monthly, ("orders_monthly_df",), "figure"),
+        ChartSpec("monthly_revenue", "Tren Berdasarkan Waktu", "Tren Pendapatan Bulanan",
+                  plot_monthly_revenue, ("monthly_revenue_df",), "figure"),
+    ],
+    "Analisis Kepuasan Pelanggan": [
+        ChartSpec("category_review_scores", "Top & Bottom Kategori Produk berdasarkan Rata-rata Review Score",
+                  "Top & Bottom Kategori Produk berdasarkan Rata-rata Review Score",
+                  plot_category_review_scores, ("category_review_scores_df",), "figure"),
+        ChartSpec("state_review_scores", "Top & Bottom Negara Bagian berdasarkan Rata-rata Review Score",
+                  "Top & Bottom Negara Bagian berdasarkan Rata-rata Review Score",
+                  plot_state_review_scores, ("state_review_summary_df",), "figure"),
+        ChartSpec("delivery_time_vs_review", "Delivery Time vs Review Score", "Delivery Time vs Review Score",
+                  plot_delivery_time_vs_review, ("master_orders_df",), "figure"),
+        ChartSpec("delivery_percentiles_by_score", "Delivery Time vs Review Score",
+                  "Persentil Waktu Pengiriman (p50/p90/p99) per Review Score",
+                  plot_delivery_percentiles_by_score, ("master_orders_df", "items_products_df"), "figure"),
+        ChartSpec("review_by_order_status", "Review Score Distribution by Order Status",
+                  "Review Score Distribution by Order Status",
+                  plot_review_by_order_status, ("master_orders_df",), "figure"),
+        ChartSpec("correlation_matrix", "Matriks Korelasi Antar Variabel Utama", "Matriks Korelasi Antar Variabel Utama",
+                  plot_correlation_matrix, ("master_orders_df",), "figure"),
+    ],
+    "Analisis Pelanggan Bernilai Tinggi": [
+        ChartSpec("top_customers", "Top Pelanggan Berdasarkan Total Pengeluaran",
+                  "Top Pelanggan Berdasarkan Total Pengeluaran",
+                  top_customers_table, ("rfm_segmentation_df",), "table"),
+        ChartSpec("high_value_products", "Preferensi Kategori Produk Pelanggan Bernilai Tinggi",
+                  "Preferensi Kategori Produk Pelanggan Bernilai Tinggi",
+                  plot_high_value_products, ("master_orders_df", "rfm_segmentation_df", "items_products_df"), "figure"),
+        ChartSpec("order_frequency", "Distribusi Frekuensi Pembelian per Pelanggan",
+                  "Distribusi Frekuensi Pembelian per Pelanggan",
+                  plot_order_frequency, ("customer_value_df",), "figure"),
+        ChartSpec("cohort_retention", "Retensi Kohort Pelanggan", "Retensi Kohort Pelanggan",
+                  plot_cohort_retention_from_orders, ("master_orders_df",), "figure"),
+        ChartSpec("frequency_vs_aov", "Frekuensi vs Rata-rata Nilai Pesanan", "Frekuensi vs Rata-rata Nilai Pesanan",
+                  plot_frequency_vs_aov, ("customer_value_df",), "figure"),
+        ChartSpec("payment_complexity", "Kompleksitas Pembayaran vs Nilai Pelanggan",
+                  "Kompleksitas Pembayaran vs Nilai Pelanggan",
+                  plot_payment_complexity, ("payment_customer_df",), "figure"),
+    ],
+    "Analisis RFM": [
+        ChartSpec("rfm_segment_distribution", "Distribusi Pelanggan Berdasarkan Segmen RFM",
+                  "Distribusi Pelanggan Berdasarkan Segmen RFM",
+                  plot_rfm_segment_distribution, ("rfm_segmentation_df",), "figure"),
+        ChartSpec("rfm_segment_averages", "Rata-rata Metrik RFM per Segmen", "Rata-rata Metrik RFM per Segmen",
+                  plot_rfm_segment_averages, ("rfm_segmentation_df",), "figure"),
+        ChartSpec("rfm_review_scores", "Rata-rata Skor Ulasan per Segmen RFM", "Rata-rata Skor Ulasan per Segmen RFM",
+                  plot_rfm_review_scores, ("master_orders_df",), "figure"),
+        ChartSpec("rfm_geo_distribution", "Distribusi Geografis Segmen RFM (Top Negara Bagian)",
+                  "Distribusi Geografis Segmen RFM (Top Negara Bagian)",
+                  plot_rfm_geo_distribution, ("master_orders_df",), "figure"),
+    ],
+}
@@ -0,0 +1,63 @@
+import numpy as np           # Untuk operasi numerik
+import pandas as pd          # Untuk manipulasi dan analisis data
+
+
+def cohort_counts(master_orders_df, customer_codes=None):
+    # Matriks kohort (bulan pembelian pertama x bulan sejak pembelian pertama)
+    # berisi jumlah pelanggan unik yang aktif. Pelanggan dan bulan dikodekan
+    # sebagai integer, lalu matriks diisi dengan satu np.bincount 2D,
+    # tanpa groupby bertingkat.
+    # customer_codes: kode integer pelanggan per baris (misal dari
+    # CustomerIndex.row_codes()) agar id string tidak perlu di-factorize ulang.
+    timestamps = master_orders_df['order_purchase_timestamp'].to_numpy()
+    if customer_codes is None:
+        customer_codes, _ = pd.factorize(master_orders_df['customer_unique_id'])
+    valid = ~np.isnat(timestamps) & (customer_codes >= 0)
+    if not valid.any():
+        return pd.DataFrame()
+
+    # Bulan sejak 1970-01 langsung dari datetime64, tanpa aksesor .dt
+    month_codes = timestamps[valid].astype('datetime64[M]').astype(np.int64)
+    first_month = int(month_codes.min())
+    month_codes -= first_month
+    n_months = int(month_codes.max()) + 1
+
+    # Pasangan (pelanggan, bulan) unik, terurut per pelanggan lalu per bulan.
+    # Urutkan lalu buang duplikat bertetangga; jauh lebih cepat dari np.unique.
+    pairs = np.sort(customer_codes[valid].astype(np.int64) * n_months + month_codes)
+    active = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])]
+    customers = active // n_months
+    months = active % n_months
+
+    # Bulan pertama tiap pelanggan = bulan pada pasangan pertamanya
+    starts = np.flatnonzero(np.concatenate([[True], customers[1:] != customers[:-1]]))
+    run_lengths = np.diff(np.concatenate([starts, [len(active)]]))
+    cohorts = np.repeat(months[starts], run_lengths)
+    offsets = months - cohorts
+
+    counts = np.bincount(cohorts * n_months + offsets, minlength=n_months * n_months).reshape(n_months, n_months)
+
+    labels = np.datetime_as_string(np.arange(first_month, first_month + n_months).astype('datetime64[M]'))
+    counts_df = pd.DataFrame(counts, index=labels, columns=range(n_months))
+    counts_df.index.name = 'cohort'
+    counts_df.columns.name = 'months_since_first_purchase'
+    return counts_df
+
+
+def cohort_retention(master_orders_df, customer_codes=None):
+    # Persentase pelanggan kohort yang aktif lagi di setiap bulan setelah
+    # pembelian pertamanya, plus kolom cohort_size. Sel yang berada di luar
+    # rentang data (bulan setelah data terakhir) bernilai NaN, bukan 0.
+    counts_df = cohort_counts(master_orders_df, customer_codes)
+    if counts_df.empty:
+        return counts_df
+    n_months = len(counts_df.columns)
+
+    # Kohort ke-i hanya bisa diamati sampai offset n_months - 1 - i
+    offsets = np.arange(n_months)
+    unobservable = offsets[None, :] > (n_months - 1 - offsets)[:, None]
+
+    cohort_sizes = counts_df[0]
+    retention = counts_df.div(cohort_sizes.where(cohort_sizes > 0), axis=0).mul(100).mask(unobservable)
+    retention.insert(0, 'cohort_size', cohort_sizes)
+    return retention[cohort_sizes > 0]
@@ -0,0 +1,109 @@
+import numpy as np           # Untuk operasi numerik
+import pandas as pd          # Untuk manipulasi dan analisis data
+
+
+def build_csr(keys):
+    # Bangun indeks gaya CSR dari satu kolom kunci:
+    #   sorted_keys  -> kunci unik terurut (untuk pencarian biner)
+    #   rows         -> posisi baris, dikelompokkan per kunci (urutan asli dipertahankan)
+    #   offsets      -> baris milik kunci ke-i ada di rows[offsets[i]:offsets[i + 1]]
+    codes, uniques = pd.factorize(keys, sort=True)
+    valid = codes >= 0  # Kunci kosong (NaN) mendapat kode -1 dan tidak diindeks
+    rows = np.flatnonzero(valid)
+    rows = rows[np.argsort(codes[valid], kind='stable')]
+    counts = np.bincount(codes[valid], minlength=len(uniques))
+    offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return np.asarray(uniques).astype(str), rows, offsets
+
+
+def _find(sorted_keys, key):
+    # Pencarian biner; -1 jika kunci tidak ada
+    i = int(np.searchsorted(sorted_keys, key))
+    if i < len(sorted_keys) and sorted_keys[i] == key:
+        return i
+    return -1
+
+
+class CustomerIndex:
+    # Indeks pelanggan -> pesanan -> item yang dibangun sekali saat data dimuat.
+    # Setiap pencarian hanya menyentuh baris milik pelanggan tersebut,
+    # bukan memindai seluruh master_orders_df.
+
+    def __init__(self, master_orders_df, items_products_df, rfm_segmentation_df):
+        self.master_orders_df = master_orders_df
+        self.items_products_df = items_products_df
+        self.rfm_segmentation_df = rfm_segmentation_df
+
+        self.customer_ids, self.order_rows, self.order_offsets = build_csr(master_orders_df['customer_unique_id'])
+        self.order_ids, self.item_rows, self.item_offsets = build_csr(items_products_df['order_id'])
+
+        # Posisi baris RFM untuk setiap pelanggan (sejajar dengan customer_ids, -1 jika tidak ada)
+        self.rfm_rows = np.full(len(self.customer_ids), -1, dtype=np.int64)
+        rfm_codes = self.codes_for(rfm_segmentation_df['customer_unique_id'])
+        matched = rfm_codes >= 0
+        self.rfm_rows[rfm_codes[matched]] = np.flatnonzero(matched)
+
+    def __len__(self):
+        return len(self.customer_ids)
+
+    @property
+    def nbytes(self):
+        # Memori milik indeks saja; DataFrame sumber dipakai bersama dan tidak dihitung
+        return sum(array.nbytes for array in (
+            self.customer_ids, self.order_rows, self.order_offsets,
+            self.order_ids, self.item_rows, self.item_offsets, self.rfm_rows,
+        ))
+
+    def codes_for(self, customer_ids):
+        # Kode (posisi di customer_ids) untuk banyak id sekaligus lewat pencarian biner; -1 jika tidak ada
+        ids = np.asarray(customer_ids).astype(str)
+        positions = np.searchsorted(self.customer_ids, ids)
+        in_range = positions < len(self.customer_ids)
+        codes = np.full(len(ids), -1, dtype=np.int64)
+        matched = np.zeros(len(ids), dtype=bool)
+        matched[in_range] = self.customer_ids[positions[in_range]] == ids[in_range]
+        codes[matched] = positions[matched]
+        return codes
+
+    def order_counts(self):
+        # Jumlah baris pesanan per pelanggan, sejajar dengan customer_ids
+        return np.diff(self.order_offsets)
+
+    def row_codes(self):
+        # Kode pelanggan untuk setiap baris master_orders_df (-1 untuk id kosong)
+        codes = np.full(len(self.master_orders_df), -1, dtype=np.int64)
+        codes[self.order_rows] = np.repeat(np.arange(len(self.customer_ids)), self.order_counts())
+        return codes
+
+    def first_order_values(self, column):
+        # Nilai `column` dari baris pesanan pertama (urutan asli) setiap pelanggan, sejajar dengan customer_ids
+        return self.master_orders_df[column].to_numpy()[self.order_rows[self.order_offsets[:-1]]]
+
+    def __contains__(self, customer_id):
+        return _find(self.customer_ids, customer_id) >= 0
+
+    def order_positions(self, customer_id):
+        i = _find(self.customer_ids, customer_id)
+        if i < 0:
+            return np.empty(0, dtype=np.int64)
+        return self.order_rows[self.order_offsets[i]:self.order_offsets[i + 1]]
+
+    def orders(self, customer_id):
+        return self.master_orders_df.iloc[self.order_positions(customer_id)]
+
+    def items(self, customer_id):
+        # Item dari semua pesanan pelanggan, lewat indeks order_id -> baris item
+        slices = []
+        for order_id in self.master_orders_df['order_id'].to_numpy()[self.order_positions(customer_id)]:
+            j = _find(self.order_ids, str(order_id))
+            if j >= 0:
+                slices.append(self.item_rows[self.item_offsets[j]:self.item_offsets[j + 1]])
+        rows = np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+        return self.items_products_df.iloc[rows]
+
+    def rfm(self, customer_id):
+        i = _find(self.customer_ids, customer_id)
+        if i < 0 or self.rfm_rows[i] < 0:
+            return self.rfm_segmentation_df.iloc[[]]
+        return self.rfm_segmentation_df.iloc[[self.rfm_rows[i]]]
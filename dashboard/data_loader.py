@@ -0,0 +1,124 @@
+import hashlib                        # Untuk membuat sidik jari (fingerprint) data
+import os                             # Untuk membaca variabel lingkungan
+from pathlib import Path              # Untuk manajemen path file
+
+import pandas as pd          # Untuk manipulasi dan analisis data
+
+# Direktori data bawaan: folder yang sama dengan file ini.
+# Bisa diganti lewat variabel lingkungan DASHBOARD_DATA_DIR.
+BASE_DIR = Path(__file__).resolve().parent
+
+# Nama-nama DataFrame yang dikembalikan load_data(), sesuai urutan tuple-nya
+DATA_KEYS = (
+    "master_orders_df", "monthly_revenue_df", "orders_monthly_df",
+    "rfm_segmentation_df", "category_review_scores_df", "state_review_summary_df",
+    "high_value_product_preferences_df", "customer_value_df", "payment_customer_df",
+    "items_products_df",
+)
+
+# File CSV sumber yang dibaca load_data()
+DATA_FILES = (
+    "master_orders.csv", "monthly_revenue.csv", "orders_monthly.csv",
+    "rfm_segmentation.csv", "category_review_scores.csv", "state_review_summary.csv",
+    "high_value_product_preferences.csv", "customer_value.csv", "payment_customer.csv",
+    "items_products.csv",
+)
+
+
+def resolve_data_dir(base_dir=None):
+    if base_dir is not None:
+        return Path(base_dir)
+    return Path(os.environ.get("DASHBOARD_DATA_DIR", BASE_DIR))
+
+
+def load_data(base_dir=None, on_error=None):
+    # Versi load_data() tanpa Streamlit, dipakai oleh app.py maupun skrip CLI.
+    # on_error dipanggil dengan pesan error (misal st.error); default-nya print.
+    BASE_DIR = resolve_data_dir(base_dir)
+    if on_error is None:
+        on_error = print
+
+    # Muat semua file CSV yang diperlukan (menggunakan Path agar path relatif always benar)
+    master_orders_df = pd.read_csv(BASE_DIR / 'master_orders.csv')
+    monthly_revenue_df = pd.read_csv(BASE_DIR / 'monthly_revenue.csv')
+    orders_monthly_df = pd.read_csv(BASE_DIR / 'orders_monthly.csv')
+    category_review_scores_df = pd.read_csv(BASE_DIR / 'category_review_scores.csv')
+    state_review_summary_df = pd.read_csv(BASE_DIR / 'state_review_summary.csv')
+    high_value_product_preferences_df = pd.read_csv(BASE_DIR / 'high_value_product_preferences.csv', index_col=0)
+    customer_value_df = pd.read_csv(BASE_DIR / 'customer_value.csv')
+    payment_customer_df = pd.read_csv(BASE_DIR / 'payment_customer.csv')
+    items_products_df = pd.read_csv(BASE_DIR / 'items_products.csv') # Baru: Muat items_products
+
+    # Konversi kolom 'month' ke objek datetime
+    monthly_revenue_df['month'] = pd.to_datetime(monthly_revenue_df['month'])
+    orders_monthly_df['month'] = pd.to_datetime(orders_monthly_df['month'])
+
+    # Konversi kolom tanggal di master_orders_df
+    date_cols = [
+        'order_purchase_timestamp', 'order_approved_at',
+        'order_delivered_carrier_date', 'order_delivered_customer_date',
+        'order_estimated_delivery_date'
+    ]
+    for col in date_cols:
+        master_orders_df[col] = pd.to_datetime(master_orders_df[col], errors='coerce') # Gunakan errors='coerce' untuk menangani masalah parsing
+
+    # Pastikan customer_unique_id bertipe string untuk penggabungan yang kuat
+    master_orders_df['customer_unique_id'] = master_orders_df['customer_unique_id'].astype(str)
+
+    # Muat rfm_segmentation_df dan pastikan 'customer_unique_id' dan 'Segment' ditangani dengan benar
+    rfm_segmentation_df = pd.read_csv(BASE_DIR / 'rfm_segmentation.csv')
+    rfm_segmentation_df['customer_unique_id'] = rfm_segmentation_df['customer_unique_id'].astype(str)
+    # Pastikan kolom 'Segment' ada dan bertipe string
+    if 'Segment' not in rfm_segmentation_df.columns:
+        on_error("Error: Kolom 'Segment' tidak ditemukan di rfm_segmentation.csv. Pastikan CSV berisi data tersegmentasi.")
+        # Fallback atau munculkan error jika Segment penting dan hilang
+        rfm_segmentation_df['Segment'] = 'Unknown'
+    rfm_segmentation_df['Segment'] = rfm_segmentation_df['Segment'].astype(str)
+
+    # Hapus kolom 'Segment' yang ada dari master_orders_df jika ada, untuk menghindari masalah dengan kolom yang kadaluarsa
+    if 'Segment' in master_orders_df.columns:
+        master_orders_df = master_orders_df.drop(columns=['Segment'])
+
+    # Gabungkan 'Segment' yang ada dari rfm_segmentation_df kembali ke master_orders_df
+    master_orders_df = master_orders_df.merge(
+        rfm_segmentation_df[['customer_unique_id', 'Segment']],
+        on='customer_unique_id',
+        how='left'
+    )
+
+    return (
+        master_orders_df, monthly_revenue_df, orders_monthly_df,
+        rfm_segmentation_df, category_review_scores_df, state_review_summary_df,
+        high_value_product_preferences_df, customer_value_df, payment_customer_df,
+        items_products_df
+    )
+
+
+def load_data_dict(base_dir=None, on_error=None):
+    # Sama seperti load_data(), tetapi dikembalikan sebagai dict {nama: DataFrame}
+    return dict(zip(DATA_KEYS, load_data(base_dir, on_error=on_error)))
+
+
+def source_fingerprint(base_dir=None):
+    # Sidik jari murah dari file sumber (nama, ukuran, waktu modifikasi).
+    # Berubah setiap kali salah satu CSV diganti, tanpa perlu membaca isinya.
+    base_dir = resolve_data_dir(base_dir)
+    digest = hashlib.sha1()
+    for name in DATA_FILES:
+        path = base_dir / name
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            digest.update(f"{name}:missing;".encode())
+            continue
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def frame_fingerprint(*frames):
+    # Sidik jari isi dari satu atau beberapa DataFrame (kolom, index dan nilai)
+    digest = hashlib.sha1()
+    for df in frames:
+        digest.update(repr(list(df.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
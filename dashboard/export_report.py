@@ -0,0 +1,232 @@
+"""Ekspor laporan statis dari semua bagian dashboard tanpa browser.
+
+Contoh pemakaian:
+
+    python dashboard/export_report.py --output-dir report
+    python dashboard/export_report.py --formats png svg --workers 4
+    python dashboard/export_report.py --section "Analisis RFM" --force
+
+Setiap bagian (lihat charts.SECTIONS) dirender di proses worker terpisah.
+Grafik yang sidik jari datanya tidak berubah sejak proses terakhir dilewati,
+berdasarkan manifest.json di folder output.
+"""
+import argparse
+import functools
+import hashlib
+import html
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Backend non-interaktif untuk worker; harus di-set sebelum pyplot diimpor
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import aggregates            # Modul-modul di bawah ini ikut menentukan isi grafik (lihat code_fingerprint)
+import charts                # Fungsi pembuat grafik yang sama dengan app.py
+import cohorts               # Matriks retensi kohort
+import customer_index        # Indeks pelanggan untuk leaderboard
+import data_loader           # Pemuatan data CSV tanpa ketergantungan Streamlit
+import leaderboard           # Top-K pelanggan
+import quantile_sketch       # Sketsa persentil waktu pengiriman
+
+MANIFEST_NAME = "manifest.json"
+
+# Data yang dimuat sekali per proses worker (lihat _init_worker)
+_WORKER_DATA = None
+
+
+def _init_worker(data_dir):
+    global _WORKER_DATA
+    charts.preload()
+    _WORKER_DATA = data_loader.load_data_dict(data_dir)
+
+
+# Modul yang kodenya menentukan isi grafik: charts (termasuk tema) dan modul
+# yang dipanggil oleh fungsi pembungkus di dalamnya
+CHART_CODE_MODULES = (charts, aggregates, cohorts, customer_index, leaderboard, quantile_sketch)
+
+
+@functools.lru_cache(maxsize=None)
+def code_fingerprint():
+    # Sidik jari kode seluruh modul grafik; fungsi grafik sering hanya pembungkus
+    # (misal plot_cohort_retention_from_orders), jadi kode fungsinya saja tidak cukup
+    digest = hashlib.sha1()
+    for module in CHART_CODE_MODULES:
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()
+
+
+def chart_fingerprint(spec, data, formats):
+    # Gabungan sidik jari data input, kode modul grafik dan format output,
+    # sehingga perubahan pada data, kode maupun --formats memicu render ulang.
+    digest = hashlib.sha1()
+    digest.update(spec.key.encode())
+    digest.update(code_fingerprint().encode())
+    if spec.kind == "figure":
+        digest.update(",".join(sorted(formats)).encode())
+    digest.update(data_loader.frame_fingerprint(*(data[name] for name in spec.inputs)).encode())
+    return digest.hexdigest()
+
+
+def _outputs_exist(output_dir, entry):
+    return all((output_dir / name).exists() for name in entry.get("files", []))
+
+
+def render_section(section, output_dir, formats, previous, force=False):
+    # Dijalankan di proses worker: render semua grafik satu bagian.
+    output_dir = Path(output_dir)
+    data = _WORKER_DATA
+    entries = []
+    for spec in charts.SECTIONS[section]:
+        fingerprint = chart_fingerprint(spec, data, formats)
+        old = previous.get(spec.key)
+        entry = {
+            "key": spec.key,
+            "section": section,
+            "expander": spec.expander,
+            "title": spec.title,
+            "kind": spec.kind,
+            "fingerprint": fingerprint,
+            "files": [],
+            "skipped": False,
+        }
+
+        if (not force and old is not None and old.get("fingerprint") == fingerprint
+                and _outputs_exist(output_dir, old)):
+            entry["files"] = old["files"]
+            entry["skipped"] = True
+            entries.append(entry)
+            continue
+
+        start = time.perf_counter()
+        result = spec.func(*(data[name] for name in spec.inputs))
+        if spec.kind == "table":
+            name = f"{spec.key}.html"
+            (output_dir / name).write_text(result.to_html(index=False, border=0), encoding="utf-8")
+            entry["files"].append(name)
+        elif result is not None:
+            for fmt in formats:
+                name = f"{spec.key}.{fmt}"
+                result.savefig(output_dir / name, format=fmt, bbox_inches="tight")
+                entry["files"].append(name)
+            charts.close(result)
+        entry["render_seconds"] = round(time.perf_counter() - start, 3)
+        entries.append(entry)
+    return entries
+
+
+def write_index(output_dir, entries, generated_at):
+    # Halaman HTML sederhana: satu judul per bagian, satu sub-judul per expander
+    parts = [
+        "<!DOCTYPE html>",
+        "<html><head><meta charset='utf-8'>",
+        "<title>E-commerce Data Analysis Report</title>",
+        "<style>body{background:#000;color:#fff;font-family:sans-serif;margin:2em}"
+        "img{max-width:100%;margin:1em 0}table{border-collapse:collapse}"
+        "td,th{border:1px solid #555;padding:4px 8px}</style>",
+        "</head><body>",
+        "<h1>E-commerce Data Analysis Report</h1>",
+        f"<p>Dibuat: {html.escape(generated_at)}</p>",
+    ]
+    for section in charts.SECTIONS:
+        section_entries = [e for e in entries if e["section"] == section]
+        if not section_entries:
+            continue
+        parts.append(f"<h2>{html.escape(section)}</h2>")
+        current_expander = None
+        for entry in section_entries:
+            if entry["expander"] != current_expander:
+                current_expander = entry["expander"]
+                parts.append(f"<h3>{html.escape(current_expander)}</h3>")
+            if entry["title"] != entry["expander"]:
+                parts.append(f"<h4>{html.escape(entry['title'])}</h4>")
+            if not entry["files"]:
+                parts.append("<p>Tidak ada data untuk grafik ini.</p>")
+            elif entry["kind"] == "table":
+                parts.append((output_dir / entry["files"][0]).read_text(encoding="utf-8"))
+            else:
+                # Tampilkan format pertama, tautkan format lainnya
+                first, *others = entry["files"]
+                parts.append(f"<img src='{html.escape(first)}' alt='{html.escape(entry['title'])}'>")
+                if others:
+                    links = ", ".join(f"<a href='{html.escape(n)}'>{html.escape(n)}</a>" for n in others)
+                    parts.append(f"<p>Format lain: {links}</p>")
+    parts.append("</body></html>")
+    (output_dir / "index.html").write_text("\n".join(parts), encoding="utf-8")
+
+
+def load_manifest(output_dir):
+    path = output_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    return {entry["key"]: entry for entry in manifest.get("charts", [])}
+
+
+def export_report(output_dir, formats=("png",), sections=None, workers=None, data_dir=None, force=False):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sections = list(sections or charts.SECTIONS)
+    previous = load_manifest(output_dir)
+
+    entries = []
+    with ProcessPoolExecutor(
+        max_workers=workers or min(len(sections), os.cpu_count() or 1),
+        initializer=_init_worker,
+        initargs=(str(data_loader.resolve_data_dir(data_dir)),),
+    ) as executor:
+        futures = {
+            executor.submit(render_section, section, str(output_dir), list(formats), previous, force): section
+            for section in sections
+        }
+        for future in as_completed(futures):
+            entries.extend(future.result())
+
+    # Pertahankan entri dari bagian yang tidak diekspor kali ini
+    exported = {e["key"] for e in entries}
+    entries.extend(dict(e, skipped=True) for key, e in previous.items() if key not in exported)
+    order = {spec.key: i for i, spec in enumerate(s for specs in charts.SECTIONS.values() for s in specs)}
+    entries.sort(key=lambda e: order.get(e["key"], len(order)))
+
+    generated_at = time.strftime("%Y-%m-%d %H:%M:%S")
+    with open(output_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": generated_at,
+            "source_fingerprint": data_loader.source_fingerprint(data_dir),
+            "charts": entries,
+        }, f, indent=2)
+    write_index(output_dir, entries, generated_at)
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekspor semua grafik dashboard ke PNG/SVG beserta index.html.")
+    parser.add_argument("--output-dir", default="report", help="Folder tujuan laporan (default: report)")
+    parser.add_argument("--formats", nargs="+", default=["png"], choices=["png", "svg"],
+                        help="Format gambar yang diekspor (default: png)")
+    parser.add_argument("--section", action="append", choices=list(charts.SECTIONS), dest="sections",
+                        help="Hanya ekspor bagian ini (boleh diulang). Default: semua bagian")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses worker (default: jumlah bagian, paling banyak jumlah CPU)")
+    parser.add_argument("--data-dir", default=None, help="Folder CSV sumber (default: folder dashboard)")
+    parser.add_argument("--force", action="store_true", help="Render ulang semua grafik walaupun datanya tidak berubah")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    entries = export_report(
+        args.output_dir, formats=args.formats, sections=args.sections,
+        workers=args.workers, data_dir=args.data_dir, force=args.force,
+    )
+    rendered = sum(1 for e in entries if not e["skipped"])
+    skipped = sum(1 for e in entries if e["skipped"])
+    print(f"{rendered} grafik dirender, {skipped} dilewati (tidak berubah) "
+          f"dalam {time.perf_counter() - start:.1f} detik -> {Path(args.output_dir) / 'index.html'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import io                             # Untuk buffer gambar di memori
+from collections import namedtuple
+
+# Hasil encoding satu figure: bytes gambar, format, DPI yang dipakai dan ukurannya
+EncodedFigure = namedtuple("EncodedFigure", ["data", "format", "dpi", "nbytes"])
+
+# Kebijakan per grafik: batas ukuran (byte) dan apakah grafik cukup sederhana
+# (sedikit elemen, misal bar chart) sehingga SVG biasanya lebih kecil dari raster.
+EncodingPolicy = namedtuple("EncodingPolicy", ["byte_budget", "simple"])
+
+DEFAULT_POLICY = EncodingPolicy(byte_budget=250_000, simple=False)
+
+# Kunci sama dengan charts.SECTIONS[...].key
+CHART_POLICIES = {
+    "kpi_comparison": EncodingPolicy(200_000, True),          # empat panel 20x5
+    "numeric_distributions": EncodingPolicy(400_000, False),   # grid 15x12, 7 histogram + KDE
+    "order_status": EncodingPolicy(60_000, True),
+    "payment_types": EncodingPolicy(60_000, True),
+    "review_score_distribution": EncodingPolicy(60_000, True),
+    "orders_monthly": EncodingPolicy(100_000, True),
+    "monthly_revenue": EncodingPolicy(100_000, True),
+    "category_review_scores": EncodingPolicy(120_000, True),
+    "state_review_scores": EncodingPolicy(120_000, True),
+    "delivery_time_vs_review": EncodingPolicy(80_000, True),
+    "delivery_percentiles": EncodingPolicy(120_000, True),
+    "review_by_order_status": EncodingPolicy(80_000, True),
+    "correlation_matrix": EncodingPolicy(150_000, False),
+    "high_value_products": EncodingPolicy(100_000, True),
+    "order_frequency": EncodingPolicy(100_000, False),
+    "cohort_retention": EncodingPolicy(250_000, False),       # heatmap beranotasi, ratusan label teks
+    "frequency_vs_aov": EncodingPolicy(200_000, False),       # scatter: ribuan titik, SVG terlalu besar
+    "payment_complexity": EncodingPolicy(200_000, False),
+    "rfm_segment_distribution": EncodingPolicy(80_000, True),
+    "rfm_segment_averages": EncodingPolicy(250_000, True),    # tiga panel 18x5
+    "rfm_review_scores": EncodingPolicy(80_000, True),
+    "rfm_geo_distribution": EncodingPolicy(250_000, False),   # 14x8, banyak label teks
+}
+
+MIN_DPI = 40
+MAX_DPI = 200
+WEBP_QUALITY = 85
+
+
+def policy_for(key):
+    return CHART_POLICIES.get(key, DEFAULT_POLICY)
+
+
+def _supports(fig, fmt):
+    return fmt in fig.canvas.get_supported_filetypes()
+
+
+def _render(fig, fmt, dpi=None):
+    buffer = io.BytesIO()
+    kwargs = {"format": fmt, "bbox_inches": "tight"}
+    if dpi is not None:
+        kwargs["dpi"] = dpi
+    if fmt == "webp":
+        kwargs["pil_kwargs"] = {"quality": WEBP_QUALITY, "method": 4}
+    fig.savefig(buffer, **kwargs)
+    return buffer.getvalue()
+
+
+def target_dpi(fig, viewport_width):
+    # DPI yang membuat lebar gambar kira-kira sama dengan lebar tampilan klien;
+    # piksel di atas itu hanya akan diperkecil lagi oleh browser.
+    width_inches = fig.get_size_inches()[0]
+    return int(min(MAX_DPI, max(MIN_DPI, viewport_width / width_inches)))
+
+
+def encode_figure(fig, byte_budget=DEFAULT_POLICY.byte_budget, viewport_width=1200, simple=False):
+    # Pilih format dan DPI agar hasil encoding muat dalam byte_budget.
+    # Urutan: SVG (hanya untuk grafik sederhana), lalu WebP/PNG dengan DPI
+    # yang diturunkan bertahap sampai ukurannya muat atau DPI mencapai MIN_DPI.
+    if simple:
+        data = _render(fig, "svg")
+        if len(data) <= byte_budget:
+            return EncodedFigure(data, "svg", None, len(data))
+
+    raster_formats = [fmt for fmt in ("webp", "png") if _supports(fig, fmt)]
+    best = None
+    for fmt in raster_formats:
+        dpi = target_dpi(fig, viewport_width)
+        while True:
+            data = _render(fig, fmt, dpi)
+            encoded = EncodedFigure(data, fmt, dpi, len(data))
+            if best is None or encoded.nbytes < best.nbytes:
+                best = encoded
+            if encoded.nbytes <= byte_budget or dpi <= MIN_DPI:
+                break
+            # Ukuran raster kira-kira sebanding dengan kuadrat DPI
+            dpi = max(MIN_DPI, int(dpi * (byte_budget / encoded.nbytes) ** 0.5 * 0.95))
+        if best.nbytes <= byte_budget:
+            break
+    return best
+
+
+def format_size(nbytes):
+    if nbytes >= 1_000_000:
+        return f"{nbytes / 1_000_000:.1f} MB"
+    return f"{nbytes / 1_000:.0f} KB"
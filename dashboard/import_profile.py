@@ -0,0 +1,130 @@
+"""Profil waktu impor (cold start) dashboard, untuk dilacak per rilis.
+
+Contoh pemakaian:
+
+    python dashboard/import_profile.py
+    python dashboard/import_profile.py --repeat 5 --json import_profile.json
+
+Setiap skenario dijalankan di interpreter baru dengan `python -X importtime`,
+sehingga hasilnya mencerminkan biaya cold start yang sebenarnya.
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+DASHBOARD_DIR = Path(__file__).resolve().parent
+
+
+def app_imports(app_path=DASHBOARD_DIR / "app.py"):
+    # Modul yang diimpor di tingkat atas app.py, dibaca langsung dari kodenya
+    # agar skenario "startup" tidak tertinggal saat app.py menambah impor baru
+    tree = ast.parse(Path(app_path).read_text(encoding="utf-8"))
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return modules
+
+
+# Skenario yang diukur. "startup" meniru impor di bagian atas app.py;
+# "first_chart" menambahkan biaya pustaka plotting saat grafik pertama digambar.
+_APP_IMPORT_CODE = "import " + ", ".join(app_imports())
+SCENARIOS = {
+    "startup": _APP_IMPORT_CODE,
+    "first_chart": _APP_IMPORT_CODE + "; charts.preload()",
+}
+
+
+def run_scenario(code):
+    # Jalankan satu skenario di proses baru; kembalikan waktu total dan baris importtime
+    env = dict(os.environ, MPLBACKEND="Agg", PYTHONPATH=str(DASHBOARD_DIR))
+    env.pop("DASHBOARD_EAGER_IMPORTS", None)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=DASHBOARD_DIR, env=env, capture_output=True, text=True,
+    )
+    wall_seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Skenario gagal:\n{result.stderr[-2000:]}")
+    return wall_seconds, result.stderr
+
+
+def parse_importtime(stderr):
+    # Format baris: "import time: self [us] | cumulative | imported package".
+    # Waktu "self" setiap modul (di kedalaman mana pun) dijumlahkan per paket
+    # teratasnya. Dengan begitu pandas, numpy, matplotlib, dll. tercatat sebagai
+    # paket sendiri walaupun pertama kali diimpor lewat modul dashboard seperti
+    # charts, dan jumlah semua paket sama dengan total waktu impor.
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        self_us, name = fields[0].strip(), fields[2].strip()
+        top = name.split(".")[0]
+        packages[top] = packages.get(top, 0) + int(self_us)
+    return packages
+
+
+def profile(repeat=3):
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "scenarios": {},
+    }
+    for scenario, code in SCENARIOS.items():
+        walls = []
+        package_runs = []
+        for _ in range(repeat):
+            wall_seconds, stderr = run_scenario(code)
+            walls.append(wall_seconds)
+            package_runs.append(parse_importtime(stderr))
+        # Median per paket agar tidak terpengaruh satu run yang lambat
+        names = set().union(*package_runs)
+        packages_ms = {
+            name: round(statistics.median(run.get(name, 0) for run in package_runs) / 1000, 1)
+            for name in names
+        }
+        report["scenarios"][scenario] = {
+            "wall_ms": round(statistics.median(walls) * 1000, 1),
+            "import_ms": round(sum(packages_ms.values()), 1),
+            "packages_ms": dict(sorted(packages_ms.items(), key=lambda item: -item[1])),
+        }
+    return report
+
+
+def print_report(report, top=10):
+    for scenario, result in report["scenarios"].items():
+        print(f"== {scenario}: {result['wall_ms']:.0f} ms total proses, {result['import_ms']:.0f} ms impor")
+        for name, ms in list(result["packages_ms"].items())[:top]:
+            print(f"   {ms:8.1f} ms  {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ukur waktu impor cold start dashboard.")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan per skenario (default: 3)")
+    parser.add_argument("--top", type=int, default=10, help="Jumlah paket terlama yang ditampilkan (default: 10)")
+    parser.add_argument("--json", dest="json_path", default=None, help="Simpan hasil lengkap ke file JSON ini")
+    args = parser.parse_args(argv)
+
+    report = profile(repeat=args.repeat)
+    print_report(report, top=args.top)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
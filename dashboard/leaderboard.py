@@ -0,0 +1,88 @@
+import numpy as np           # Untuk operasi numerik
+
+from customer_index import build_csr
+
+# Metrik peringkat yang tersedia: label tampilan -> nama kolom di tabel leaderboard
+METRICS = {
+    "Total Pengeluaran (Monetary)": "Monetary",
+    "Frekuensi (Frequency)": "Frequency",
+    "Jumlah Pesanan": "Jumlah Pesanan",
+}
+
+# Pengelompokan opsional: label tampilan -> nama kolom
+GROUPS = {
+    "Segmen": "Segment",
+    "Negara Bagian": "customer_state",
+}
+
+
+def top_k_positions(values, k):
+    # Posisi k nilai terbesar, terurut menurun. Memakai argpartition (O(n))
+    # lalu hanya mengurutkan k kandidat, bukan mengurutkan seluruh array.
+    values = np.asarray(values, dtype=float)
+    values = np.where(np.isnan(values), -np.inf, values)
+    k = max(0, min(int(k), len(values)))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(values):
+        candidates = np.argpartition(-values, k - 1)[:k]
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(-values[candidates], kind='stable')]
+
+
+class Leaderboard:
+    # Leaderboard pelanggan berbasis rfm_segmentation_df, diperkaya dengan jumlah
+    # pesanan dan negara bagian dari CustomerIndex. Hasil top() tidak disimpan
+    # di sini; app.py meng-cache-nya di cache.AGGREGATES agar memorinya ikut
+    # dihitung dalam anggaran cache.
+
+    def __init__(self, rfm_segmentation_df, customers_idx):
+        table = rfm_segmentation_df[['customer_unique_id', 'Segment', 'Recency', 'Frequency', 'Monetary']].reset_index(drop=True)
+        codes = customers_idx.codes_for(table['customer_unique_id'])
+        known = codes >= 0
+
+        order_counts = np.zeros(len(table), dtype=np.int64)
+        order_counts[known] = customers_idx.order_counts()[codes[known]]
+        table['Jumlah Pesanan'] = order_counts
+
+        states = np.full(len(table), None, dtype=object)
+        states[known] = customers_idx.first_order_values('customer_state')[codes[known]]
+        table['customer_state'] = states
+
+        self.table = table
+        self.metric_values = {column: table[column].to_numpy(dtype=float) for column in METRICS.values()}
+        # Indeks CSR per kolom kelompok: nilai kelompok -> baris pelanggan di dalamnya
+        self.groups = {column: build_csr(table[column]) for column in GROUPS.values()}
+
+    @property
+    def nbytes(self):
+        # Memori milik leaderboard saja: kolom yang ditambahkan di sini, array metrik
+        # hasil konversi dan indeks kelompok. Kolom yang diambil dari rfm_segmentation_df
+        # berbagi buffer dengan DataFrame sumber (copy-on-write) dan dihitung di cache DATA.
+        own_columns = ['Jumlah Pesanan', 'customer_state']
+        own_metric_values = [
+            values for column, values in self.metric_values.items()
+            if not np.shares_memory(values, self.table[column].to_numpy())
+        ]
+        return (
+            int(self.table[own_columns].memory_usage(deep=True, index=False).sum())
+            + sum(values.nbytes for values in own_metric_values)
+            + sum(array.nbytes for csr in self.groups.values() for array in csr)
+        )
+
+    def group_values(self, group_by):
+        return list(self.groups[group_by][0])
+
+    def top(self, metric, k, group_by=None, group_value=None):
+        values = self.metric_values[metric]
+        if group_by is None:
+            positions = top_k_positions(values, k)
+        else:
+            group_keys, rows, offsets = self.groups[group_by]
+            i = int(np.searchsorted(group_keys, group_value))
+            if i >= len(group_keys) or group_keys[i] != group_value:
+                return self.table.iloc[[]]
+            members = rows[offsets[i]:offsets[i + 1]]
+            positions = members[top_k_positions(values[members], k)]
+        return self.table.iloc[positions].reset_index(drop=True)
@@ -0,0 +1,295 @@
+"""Uji beban lokal: banyak sesi dashboard bersamaan tanpa browser.
+
+Setiap sesi simulasi adalah satu streamlit.testing.v1.AppTest yang menjalankan
+app.py di thread-nya sendiri, lalu mengikuti skenario navigasi: berpindah
+bagian di sidebar (selected_section) dan mengganti segmen KPI. Semua sesi
+berbagi satu proses, persis seperti satu server Streamlit: cache data, agregat
+dan grafik (cache.py) dipakai bersama, dan render matplotlib bersaing di GIL yang sama.
+
+Contoh pemakaian:
+
+    python dashboard/load_test.py --sessions 20 --iterations 3 --orders 100000
+    python dashboard/load_test.py --sessions 50 --data-dir dashboard --json load_test.json
+
+Laporan berisi latensi rerun p50/p95/p99 (total dan per jenis aksi),
+throughput (rerun per detik), waktu CPU proses, RSS (puncak) dan statistik cache.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Backend non-interaktif; harus di-set sebelum pyplot diimpor
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np           # Untuk operasi numerik
+import pandas as pd          # Untuk membaca daftar segmen
+
+import aggregates            # Label 'All Customers' untuk pilihan segmen KPI
+import cache                 # Statistik cache yang sama dengan yang dipakai app.py
+import data_loader           # Lokasi folder data
+import synthetic_data        # Dataset sintetis dengan skema CSV dashboard
+
+APP_PATH = Path(__file__).resolve().parent / "app.py"
+SECTIONS = [
+    "Ringkasan Umum Data",
+    "Analisis Kepuasan Pelanggan",
+    "Analisis Pelanggan Bernilai Tinggi",
+    "Analisis RFM",
+    "Kesimpulan Utama Analisis",
+]
+PERCENTILES = (50, 95, 99)
+
+try:
+    import psutil            # Opsional: CPU dan RSS proses di semua OS, termasuk Windows
+except ImportError:
+    psutil = None
+
+try:
+    import resource          # Hanya ada di POSIX; cadangan jika psutil tidak terpasang
+except ImportError:
+    resource = None
+
+
+class RssSampler(threading.Thread):
+    # Sampel RSS proses secara berkala selama uji beban (hanya jika psutil tersedia)
+
+    def __init__(self, interval=0.25):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        process = psutil.Process()
+        while not self._stop_event.is_set():
+            self.samples.append(process.memory_info().rss)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _peak_rss_bytes():
+    # RSS puncak proses; None jika OS tidak menyediakannya
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        peak = getattr(memory, "peak_wset", None)   # Windows
+        if peak is not None:
+            return peak
+    if resource is not None:
+        # ru_maxrss dalam KB di Linux, dalam byte di macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
+
+
+def _cpu_seconds():
+    # Waktu CPU (user + system) semua thread proses ini
+    if psutil is not None:
+        times = psutil.Process().cpu_times()
+        return times.user + times.system
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime + usage.ru_stime
+    return time.process_time()
+
+
+def session_script(iterations, segments, rng):
+    # Urutan aksi satu sesi: buka dashboard, lalu per iterasi kunjungi semua bagian
+    # (urutan acak) dan ganti segmen KPI di salah satu bagian.
+    actions = [("initial", None)]
+    for _ in range(iterations):
+        sections = SECTIONS[:]
+        rng.shuffle(sections)
+        for section in sections:
+            actions.append(("section", section))
+        actions.append(("segment", rng.choice(segments)))
+    return actions
+
+
+def run_session(session_id, iterations, segments, seed, timeout, think_time):
+    # Jalankan satu sesi dan kembalikan list (aksi, detik, error)
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session_id)
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    results = []
+    for kind, value in session_script(iterations, segments, rng):
+        start = time.perf_counter()
+        try:
+            if kind == "initial":
+                at.run()
+            elif kind == "section":
+                at.sidebar.radio[0].set_value(value).run()
+            else:
+                # AppTest selalu menjalankan ulang seluruh skrip, termasuk untuk widget
+                # di dalam fragmen; angka ini batas atas dari rerun fragmen di browser.
+                at.selectbox(key="selected_segment_for_kpi").set_value(value).run()
+            error = "; ".join(exc.message for exc in at.exception) or None
+        except Exception as exc:  # Timeout atau error di AppTest sendiri
+            error = f"{type(exc).__name__}: {exc}"
+        results.append((kind, time.perf_counter() - start, error))
+        if think_time:
+            time.sleep(rng.uniform(0, 2 * think_time))
+    return results
+
+
+def _segments(data_dir):
+    # Pilihan segmen KPI, sama dengan opsi selectbox di app.py
+    segments = pd.read_csv(data_loader.resolve_data_dir(data_dir) / "rfm_segmentation.csv", usecols=["Segment"])["Segment"]
+    return [aggregates.ALL_CUSTOMERS] + sorted(segments.astype(str).unique())
+
+
+def summarize(results, wall_seconds):
+    latencies = np.array([seconds for _, seconds, _ in results])
+    summary = {
+        "reruns": len(results),
+        "errors": sum(1 for *_, error in results if error),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_reruns_per_s": round(len(results) / wall_seconds, 3) if wall_seconds else None,
+        "latency_ms": _latency_stats(latencies),
+        "latency_ms_by_action": {},
+    }
+    for kind in ("initial", "section", "segment"):
+        kind_latencies = np.array([seconds for k, seconds, _ in results if k == kind])
+        if len(kind_latencies):
+            summary["latency_ms_by_action"][kind] = _latency_stats(kind_latencies)
+    return summary
+
+
+def _latency_stats(latencies):
+    values = np.percentile(latencies * 1000, PERCENTILES)
+    stats = {f"p{p}": round(float(v), 1) for p, v in zip(PERCENTILES, values)}
+    stats["mean"] = round(float(latencies.mean() * 1000), 1)
+    stats["max"] = round(float(latencies.max() * 1000), 1)
+    return stats
+
+
+def run_load_test(sessions=10, iterations=2, data_dir=None, orders=50_000, seed=0,
+                  timeout=120, think_time=0.0, warmup=True):
+    # Siapkan data, jalankan semua sesi bersamaan, kembalikan ringkasan (dict)
+    temp_dir = None
+    if data_dir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix="dashboard-load-")
+        data_dir = synthetic_data.write_dataset(temp_dir.name, n_orders=orders, seed=seed)
+    # app.py membaca lokasi data dari variabel lingkungan (lihat data_loader.resolve_data_dir);
+    # nilai lamanya dikembalikan setelah uji agar pemanggil tidak menunjuk folder sementara yang sudah dihapus
+    previous_data_dir = os.environ.get("DASHBOARD_DATA_DIR")
+    os.environ["DASHBOARD_DATA_DIR"] = str(Path(data_dir).resolve())
+    try:
+        segments = _segments(data_dir)
+        if warmup:
+            # Satu sesi lebih dulu agar cache dingin (pemuatan CSV, indeks) tidak
+            # tercampur ke latensi rerun yang diukur
+            warmup_results = run_session(-1, 1, segments, seed, timeout, 0.0)
+            warmup_errors = [error for *_, error in warmup_results if error]
+            if warmup_errors:
+                raise RuntimeError(f"Sesi pemanasan gagal: {warmup_errors[0]}")
+
+        sampler = RssSampler() if psutil is not None else None
+        if sampler is not None:
+            sampler.start()
+        cpu_start = _cpu_seconds()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            futures = [
+                pool.submit(run_session, session_id, iterations, segments, seed, timeout, think_time)
+                for session_id in range(sessions)
+            ]
+            results = [item for future in futures for item in future.result()]
+        wall_seconds = time.perf_counter() - start
+        cpu_seconds = _cpu_seconds() - cpu_start
+        if sampler is not None:
+            sampler.stop()
+
+        summary = summarize(results, wall_seconds)
+        summary.update({
+            "sessions": sessions,
+            "iterations": iterations,
+            "data_dir": str(data_dir) if temp_dir is None else f"sintetis ({orders:,} pesanan)",
+            "warmup": warmup,
+            "cpu_seconds": round(cpu_seconds, 2),
+            # >1 berarti lebih dari satu inti terpakai (misal saat encoding gambar melepas GIL)
+            "cpu_utilization": round(cpu_seconds / wall_seconds, 2) if wall_seconds else None,
+        })
+        peak_rss = _peak_rss_bytes()
+        if sampler is not None and sampler.samples:
+            summary["rss_mb_p50"] = round(float(np.percentile(sampler.samples, 50)) / 2**20, 1)
+            summary["rss_mb_max"] = round(max(sampler.samples) / 2**20, 1)
+            peak_rss = max(peak_rss or 0, max(sampler.samples))
+        summary["peak_rss_mb"] = round(peak_rss / 2**20, 1) if peak_rss else None
+        summary["cache"] = [stats._asdict() for stats in cache.stats()]
+        summary["first_errors"] = sorted({error for *_, error in results if error})[:5]
+        return summary
+    finally:
+        if previous_data_dir is None:
+            os.environ.pop("DASHBOARD_DATA_DIR", None)
+        else:
+            os.environ["DASHBOARD_DATA_DIR"] = previous_data_dir
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+
+def format_report(summary):
+    lines = [
+        f"Sesi: {summary['sessions']} x {summary['iterations']} iterasi, data: {summary['data_dir']}",
+        f"Rerun: {summary['reruns']} ({summary['errors']} error) dalam {summary['wall_seconds']:.1f} detik"
+        f" -> {summary['throughput_reruns_per_s']:.2f} rerun/detik",
+        "",
+        f"{'Aksi':<10}{'p50 (ms)':>12}{'p95 (ms)':>12}{'p99 (ms)':>12}{'maks (ms)':>12}",
+    ]
+    rows = [("semua", summary["latency_ms"])] + list(summary["latency_ms_by_action"].items())
+    for label, stats in rows:
+        lines.append(f"{label:<10}{stats['p50']:>12,.1f}{stats['p95']:>12,.1f}{stats['p99']:>12,.1f}{stats['max']:>12,.1f}")
+    lines += [
+        "",
+        f"CPU: {summary['cpu_seconds']:.1f} detik ({summary['cpu_utilization']:.2f} inti rata-rata)",
+        (f"RSS puncak: {summary['peak_rss_mb']:,.1f} MB" if summary["peak_rss_mb"] else "RSS puncak: tidak tersedia")
+        + (f" (median selama uji: {summary['rss_mb_p50']:,.1f} MB)" if "rss_mb_p50" in summary else ""),
+    ]
+    for stats in summary["cache"]:
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "-"
+        lines.append(
+            f"Cache {stats['name']}: {stats['entries']} entri, {stats['resident_bytes'] / 2**20:,.1f}"
+            f" / {stats['max_bytes'] / 2**20:,.0f} MB, hit rate {hit_rate}, {stats['evictions']} eviksi"
+        )
+    for error in summary["first_errors"]:
+        lines.append(f"Error: {error}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uji beban dashboard dengan banyak sesi simulasi bersamaan.")
+    parser.add_argument("--sessions", type=int, default=10, help="Jumlah sesi bersamaan (default: 10)")
+    parser.add_argument("--iterations", type=int, default=2, help="Putaran navigasi per sesi (default: 2)")
+    parser.add_argument("--data-dir", default=None, help="Folder CSV yang dipakai (default: dataset sintetis sementara)")
+    parser.add_argument("--orders", type=int, default=50_000, help="Jumlah pesanan dataset sintetis (default: 50000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed data sintetis dan skenario navigasi (default: 0)")
+    parser.add_argument("--timeout", type=float, default=120, help="Batas waktu satu rerun dalam detik (default: 120)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Rata-rata jeda antar aksi dalam detik (default: 0)")
+    parser.add_argument("--no-warmup", action="store_true", help="Ukur juga rerun pertama dengan cache dingin")
+    parser.add_argument("--json", default=None, help="Simpan ringkasan ke file JSON ini")
+    args = parser.parse_args(argv)
+
+    summary = run_load_test(
+        sessions=args.sessions, iterations=args.iterations, data_dir=args.data_dir,
+        orders=args.orders, seed=args.seed, timeout=args.timeout,
+        think_time=args.think_time, warmup=not args.no_warmup,
+    )
+    print(format_report(summary))
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
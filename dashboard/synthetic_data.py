@@ -0,0 +1,210 @@
+"""Pembuat dataset sintetis dengan skema yang sama dengan CSV dashboard.
+
+Dipakai oleh load_test.py agar uji beban bisa dijalankan tanpa data asli,
+dengan ukuran data yang bisa diatur. Contoh pemakaian:
+
+    python dashboard/synthetic_data.py --output-dir /tmp/dashboard-data --orders 200000
+    DASHBOARD_DATA_DIR=/tmp/dashboard-data streamlit run dashboard/app.py
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np           # Untuk operasi numerik
+import pandas as pd          # Untuk manipulasi dan analisis data
+
+import data_loader           # Nama file CSV yang dibaca dashboard
+
+STATES = ["SP", "RJ", "MG", "RS", "PR", "SC", "BA", "DF", "ES", "GO", "PE", "CE", "PA", "MT", "MA", "MS", "PB", "PI", "RN", "AL", "SE", "TO", "RO", "AM", "AC", "AP", "RR"]
+CATEGORIES = [
+    "bed_bath_table", "health_beauty", "sports_leisure", "furniture_decor", "computers_accessories",
+    "housewares", "watches_gifts", "telephony", "garden_tools", "auto", "toys", "cool_stuff",
+    "perfumery", "baby", "electronics", "stationery", "fashion_bags_accessories", "pet_shop",
+    "office_furniture", "consoles_games", "luggage_accessories", "construction_tools_construction",
+]
+SEGMENTS = ["Champions", "Loyal Customers", "Potential Loyalists", "New Customers", "At Risk", "Hibernating", "Lost"]
+ORDER_STATUSES = ["delivered", "shipped", "canceled", "unavailable", "invoiced", "processing"]
+ORDER_STATUS_WEIGHTS = [0.97, 0.011, 0.006, 0.006, 0.004, 0.003]
+REVIEW_WEIGHTS = [0.115, 0.032, 0.083, 0.193, 0.577]   # skor 1..5
+
+FIRST_PURCHASE = pd.Timestamp("2016-09-01")
+PURCHASE_DAYS = 760
+
+
+def _weights(n, rng):
+    # Bobot popularitas yang condong (beberapa kategori/negara bagian dominan)
+    weights = rng.pareto(1.2, n) + 0.05
+    return weights / weights.sum()
+
+
+def generate(n_orders=50_000, n_customers=None, seed=0):
+    # Kembalikan dict {nama DataFrame: DataFrame} dengan kolom yang sama seperti
+    # hasil notebook analisis, sebelum diproses data_loader.load_data()
+    rng = np.random.default_rng(seed)
+    if n_customers is None:
+        n_customers = max(1, int(n_orders * 0.93))   # sebagian besar pelanggan hanya belanja sekali
+
+    customer_ids = np.char.add("cust_", np.arange(n_customers).astype(str))
+    customer_states = rng.choice(STATES, n_customers, p=_weights(len(STATES), rng))
+    # Beberapa pelanggan berbelanja berulang kali: pilih pelanggan dengan distribusi condong
+    order_customers = np.concatenate([
+        np.arange(min(n_customers, n_orders)),
+        rng.zipf(2.0, max(0, n_orders - n_customers)) % n_customers,
+    ])
+    rng.shuffle(order_customers)
+
+    purchase = FIRST_PURCHASE + pd.to_timedelta(
+        np.sort(rng.triangular(0, PURCHASE_DAYS * 0.8, PURCHASE_DAYS, n_orders)) * 86_400, unit="s"
+    )
+    delivery_time_days = np.round(rng.gamma(2.2, 5.5, n_orders) + 1)
+    total_items = rng.geometric(0.85, n_orders)
+    total_price = np.round(rng.lognormal(4.4, 0.9, n_orders) * total_items, 2)
+    total_freight = np.round(rng.lognormal(2.8, 0.5, n_orders), 2)
+    order_status = rng.choice(ORDER_STATUSES, n_orders, p=ORDER_STATUS_WEIGHTS)
+    delivered = order_status == "delivered"
+
+    master_orders_df = pd.DataFrame({
+        "order_id": np.char.add("order_", np.arange(n_orders).astype(str)),
+        "customer_id": np.char.add("cid_", np.arange(n_orders).astype(str)),
+        "customer_unique_id": customer_ids[order_customers],
+        "customer_state": customer_states[order_customers],
+        "order_status": order_status,
+        "order_purchase_timestamp": purchase,
+        "order_approved_at": purchase + pd.to_timedelta(rng.exponential(0.5, n_orders), unit="D"),
+        "order_delivered_carrier_date": (purchase + pd.to_timedelta(delivery_time_days * 0.3, unit="D")).where(delivered),
+        "order_delivered_customer_date": (purchase + pd.to_timedelta(delivery_time_days, unit="D")).where(delivered),
+        "order_estimated_delivery_date": (purchase + pd.to_timedelta(delivery_time_days + rng.integers(3, 20, n_orders), unit="D")).normalize(),
+        "payment_value": np.round(total_price + total_freight, 2),
+        "total_price": total_price,
+        "total_freight": total_freight,
+        "delivery_time_days": np.where(delivered, delivery_time_days, np.nan),
+        "total_items": total_items,
+        "unique_sellers": np.minimum(total_items, rng.geometric(0.9, n_orders)),
+        # Pengiriman yang lama cenderung mendapat skor lebih rendah
+        "review_score": np.clip(rng.choice(np.arange(1, 6), n_orders, p=REVIEW_WEIGHTS) - (delivery_time_days > 25), 1, 5),
+        "payment_types": rng.choice([1, 2, 3], n_orders, p=[0.975, 0.023, 0.002]),
+    })
+
+    # --- Item per pesanan ---
+    item_orders = np.repeat(np.arange(n_orders), total_items)
+    n_items = len(item_orders)
+    items_products_df = pd.DataFrame({
+        "order_id": master_orders_df["order_id"].to_numpy()[item_orders],
+        "order_item_id": np.arange(n_items) - np.repeat(np.cumsum(total_items) - total_items, total_items) + 1,
+        "product_id": np.char.add("prod_", rng.integers(0, max(1, n_orders // 3), n_items).astype(str)),
+        "seller_id": np.char.add("seller_", rng.integers(0, max(1, n_orders // 30), n_items).astype(str)),
+        "price": np.round(total_price[item_orders] / total_items[item_orders], 2),
+        "freight_value": np.round(total_freight[item_orders] / total_items[item_orders], 2),
+        "product_category_name_english": rng.choice(CATEGORIES, n_items, p=_weights(len(CATEGORIES), rng)),
+    })
+
+    # --- Agregat per pelanggan dan RFM ---
+    per_customer = master_orders_df.groupby("customer_unique_id").agg(
+        last_purchase=("order_purchase_timestamp", "max"),
+        Frequency=("order_id", "nunique"),
+        Monetary=("payment_value", "sum"),
+        payment_types=("payment_types", "max"),
+    )
+    snapshot = master_orders_df["order_purchase_timestamp"].max() + pd.Timedelta(days=1)
+    rfm_segmentation_df = pd.DataFrame({
+        "customer_unique_id": per_customer.index,
+        "Recency": (snapshot - per_customer["last_purchase"]).dt.days.to_numpy(),
+        "Frequency": per_customer["Frequency"].to_numpy(),
+        "Monetary": per_customer["Monetary"].round(2).to_numpy(),
+    })
+    rfm_segmentation_df["R_Score"] = pd.qcut(-rfm_segmentation_df["Recency"].rank(method="first"), 5, labels=False) + 1
+    rfm_segmentation_df["M_Score"] = pd.qcut(rfm_segmentation_df["Monetary"].rank(method="first"), 5, labels=False) + 1
+    segment_codes = np.clip(10 - rfm_segmentation_df["R_Score"] - rfm_segmentation_df["M_Score"] + (rfm_segmentation_df["Frequency"] == 1), 0, None) * len(SEGMENTS) // 10
+    rfm_segmentation_df["Segment"] = np.asarray(SEGMENTS)[np.clip(segment_codes, 0, len(SEGMENTS) - 1)]
+
+    customer_value_df = pd.DataFrame({
+        "customer_unique_id": per_customer.index,
+        "total_orders": per_customer["Frequency"].to_numpy(),
+        "total_spent": per_customer["Monetary"].round(2).to_numpy(),
+        "avg_order_value": (per_customer["Monetary"] / per_customer["Frequency"]).round(2).to_numpy(),
+    })
+    payment_customer_df = pd.DataFrame({
+        "customer_unique_id": per_customer.index,
+        "payment_types": per_customer["payment_types"].to_numpy(),
+        "total_spent": per_customer["Monetary"].round(2).to_numpy(),
+    })
+
+    # --- Agregat bulanan (label akhir bulan, seperti CSV asli) ---
+    month_end = master_orders_df["order_purchase_timestamp"].dt.to_period("M").dt.to_timestamp(how="end").dt.normalize()
+    monthly = master_orders_df.groupby(month_end).agg(total_revenue=("payment_value", "sum"), order_count=("order_id", "count"))
+    monthly.index.name = "month"
+    monthly_revenue_df = monthly[["total_revenue"]].round(2).reset_index()
+    orders_monthly_df = monthly[["order_count"]].reset_index()
+
+    # --- Ringkasan ulasan per kategori dan negara bagian ---
+    order_reviews = master_orders_df.set_index("order_id")["review_score"]
+    category_review_scores_df = (
+        items_products_df.drop_duplicates("order_id")
+        .assign(review_score=lambda df: df["order_id"].map(order_reviews))
+        .groupby("product_category_name_english")
+        .agg(avg_review_score=("review_score", "mean"), total_reviews=("review_score", "count"))
+        .round({"avg_review_score": 2})
+        .sort_values("avg_review_score", ascending=False)
+        .reset_index()
+    )
+    state_review_summary_df = (
+        master_orders_df.groupby("customer_state")
+        .agg(avg_review_score=("review_score", "mean"), total_reviews=("review_score", "count"))
+        .round({"avg_review_score": 2})
+        .sort_values("avg_review_score", ascending=False)
+        .reset_index()
+    )
+
+    champions = rfm_segmentation_df.loc[rfm_segmentation_df["Segment"] == "Champions", "customer_unique_id"]
+    champion_orders = master_orders_df.loc[master_orders_df["customer_unique_id"].isin(champions), "order_id"]
+    high_value_product_preferences_df = (
+        items_products_df.loc[items_products_df["order_id"].isin(champion_orders), "product_category_name_english"]
+        .value_counts()
+        .rename_axis("product_category_name_english")
+        .reset_index(name="Number of Orders")
+    )
+    high_value_product_preferences_df["Percentage (%)"] = (
+        high_value_product_preferences_df["Number of Orders"]
+        / high_value_product_preferences_df["Number of Orders"].sum() * 100
+    ).round(1)
+
+    frames = {
+        "master_orders_df": master_orders_df,
+        "monthly_revenue_df": monthly_revenue_df,
+        "orders_monthly_df": orders_monthly_df,
+        "rfm_segmentation_df": rfm_segmentation_df,
+        "category_review_scores_df": category_review_scores_df,
+        "state_review_summary_df": state_review_summary_df,
+        "high_value_product_preferences_df": high_value_product_preferences_df,
+        "customer_value_df": customer_value_df,
+        "payment_customer_df": payment_customer_df,
+        "items_products_df": items_products_df,
+    }
+    return {name: frames[name] for name in data_loader.DATA_KEYS}
+
+
+def write_dataset(output_dir, n_orders=50_000, n_customers=None, seed=0):
+    # Tulis semua CSV ke output_dir dengan nama file yang dibaca data_loader
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    frames = generate(n_orders, n_customers, seed)
+    for name, filename in zip(data_loader.DATA_KEYS, data_loader.DATA_FILES):
+        frames[name].to_csv(output_dir / filename, index=False)
+    return output_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Buat dataset sintetis dengan skema CSV dashboard.")
+    parser.add_argument("--output-dir", required=True, help="Folder tujuan CSV")
+    parser.add_argument("--orders", type=int, default=50_000, help="Jumlah pesanan (default: 50000)")
+    parser.add_argument("--customers", type=int, default=None, help="Jumlah pelanggan unik (default: 93%% dari jumlah pesanan)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed generator acak (default: 0)")
+    args = parser.parse_args(argv)
+
+    output_dir = write_dataset(args.output_dir, args.orders, args.customers, args.seed)
+    print(f"Dataset sintetis {args.orders:,} pesanan ditulis ke {output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Modul dashboard saling mengimpor dengan nama modul biasa (seperti saat dijalankan
+# lewat `streamlit run dashboard/app.py`), jadi folder dashboard ditambahkan ke sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregates import ALL_CUSTOMERS, kpi_by_segment
+
+
+def _master_orders(n=20_000, seed=0):
+    # Segmen berasal dari RFM per pelanggan (seperti di notebook analisis), jadi
+    # setiap pelanggan punya tepat satu segmen; pelanggan yang tidak ada di RFM
+    # mendapat segmen NaN tetapi pesanannya tetap dihitung di 'All Customers'.
+    rng = np.random.default_rng(seed)
+    customers = np.array([f"c{i}" for i in range(6_000)])
+    segments = rng.choice(["Champions", "Loyal Customers", "At Risk", "Lost"], len(customers)).astype(object)
+    segments[rng.random(len(customers)) < 0.1] = np.nan
+    order_customers = rng.integers(0, len(customers), n)
+    review_score = rng.integers(1, 6, n).astype(float)
+    review_score[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        "order_id": [f"o{i}" for i in range(n)],
+        "customer_unique_id": customers[order_customers],
+        "payment_value": rng.lognormal(4, 1, n).round(2),
+        "review_score": review_score,
+        "Segment": segments[order_customers],
+    })
+
+
+def _old_kpis(kpi_data_df):
+    # Perhitungan sebelum kpi_by_segment: filter master_orders_df per segmen lalu hitung KPI
+    return {
+        "total_revenue": kpi_data_df['payment_value'].sum(),
+        "total_orders": kpi_data_df['order_id'].nunique(),
+        "avg_review_score": kpi_data_df['review_score'].mean(),
+        "total_customers": kpi_data_df['customer_unique_id'].nunique(),
+    }
+
+
+def test_kpi_by_segment_matches_filtered_computation():
+    master_orders_df = _master_orders()
+    assert master_orders_df["Segment"].isna().any()
+    kpi_df = kpi_by_segment(master_orders_df)
+
+    segments = list(master_orders_df['Segment'].dropna().unique())
+    assert sorted(kpi_df.index) == sorted([ALL_CUSTOMERS] + segments)
+    for segment in [ALL_CUSTOMERS] + segments:
+        if segment == ALL_CUSTOMERS:
+            kpi_data_df = master_orders_df
+        else:
+            kpi_data_df = master_orders_df[master_orders_df['Segment'] == segment]
+        expected = _old_kpis(kpi_data_df)
+        row = kpi_df.loc[segment]
+        assert row["total_revenue"] == pytest.approx(expected["total_revenue"])
+        assert row["total_orders"] == expected["total_orders"]
+        assert row["avg_review_score"] == pytest.approx(expected["avg_review_score"])
+        assert row["total_customers"] == expected["total_customers"]
+
+
+def test_kpi_by_segment_without_missing_segments():
+    master_orders_df = _master_orders(seed=1).dropna(subset=["Segment"])
+    kpi_df = kpi_by_segment(master_orders_df)
+    assert kpi_df.loc[ALL_CUSTOMERS, "total_orders"] == master_orders_df["order_id"].nunique()
+    assert kpi_df.loc[ALL_CUSTOMERS, "total_customers"] == master_orders_df["customer_unique_id"].nunique()
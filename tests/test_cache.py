@@ -0,0 +1,71 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from cache import BoundedCache, memoize
+
+
+def test_lru_eviction_respects_byte_budget():
+    store = BoundedCache("test", max_bytes=250)
+    for key in "abc":
+        store.set(key, b"", nbytes=100)
+    assert len(store) == 2
+    assert store.get("a") is None
+    assert store.get("c") == b""
+    stats = store.stats()
+    assert stats.resident_bytes == 200 and stats.evictions == 1
+
+
+def test_oversize_value_is_reported(caplog):
+    store = BoundedCache("data", max_bytes=10)
+    with caplog.at_level(logging.WARNING, logger="cache"):
+        assert store.get_or_compute("k", lambda: np.zeros(100)).shape == (100,)
+    stats = store.stats()
+    assert len(store) == 0 and stats.oversize == 1 and stats.largest_oversize == 800
+    assert "DASHBOARD_CACHE_DATA_MB" in caplog.text
+
+
+def test_memoize_returns_zero_copy_views():
+    store = BoundedCache("test", max_bytes=10**6)
+    calls = []
+
+    @memoize(store)
+    def frame(n):
+        calls.append(n)
+        return pd.DataFrame({"x": np.arange(n)})
+
+    first, second = frame(5), frame(5)
+    assert calls == [5]
+    assert np.shares_memory(first["x"].to_numpy(), second["x"].to_numpy())
+    first.loc[0, "x"] = 99   # copy-on-write: isi cache tidak ikut berubah
+    assert frame(5).loc[0, "x"] == 0
+    assert store.stats().hits == 2
+
+
+def test_dependents_are_dropped_with_their_source_data():
+    aggregates = BoundedCache("aggregates", max_bytes=10**6)
+    data = BoundedCache("data", max_bytes=10**6, max_entries=2, dependents=(aggregates,))
+
+    @memoize(data)
+    def load(fingerprint):
+        return np.zeros(10)
+
+    @memoize(aggregates)
+    def total(fingerprint, column):
+        return load(fingerprint).sum()
+
+    for fingerprint in ("v1", "v2"):
+        total(fingerprint, "a")
+        total(fingerprint, "b")
+    aggregates.set("untagged", b"")
+    assert len(data) == 2 and len(aggregates) == 5
+
+    # Versi ketiga menggeser v1 keluar dari DATA: agregat v1 ikut dibuang, agregat v2 tetap
+    load("v3")
+    assert len(data) == 2 and len(aggregates) == 3
+    assert aggregates.stats().evictions == 2
+    assert aggregates.get((total.__wrapped__.__code__, ("v2", "a"))) == 0
+
+    data.clear()
+    assert len(aggregates) == 0
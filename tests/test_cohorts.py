@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+import cohorts
+from customer_index import CustomerIndex
+
+
+def _orders(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = pd.Timestamp("2016-09-01") + pd.to_timedelta(rng.integers(0, 500 * 86_400, n), unit="s")
+    df = pd.DataFrame({
+        "order_id": [f"o{i}" for i in range(n)],
+        "customer_unique_id": rng.integers(0, 1500, n).astype(str),
+        "order_purchase_timestamp": timestamps,
+    })
+    df.loc[rng.choice(n, 20, replace=False), "order_purchase_timestamp"] = pd.NaT
+    return df
+
+
+def _naive_counts(df):
+    df = df.dropna(subset=["order_purchase_timestamp"])
+    month = df["order_purchase_timestamp"].dt.to_period("M")
+    first = month.groupby(df["customer_unique_id"]).transform("min")
+    offset = (month - first).apply(lambda d: d.n)
+    return (
+        pd.DataFrame({"cohort": first.astype(str), "offset": offset, "customer": df["customer_unique_id"]})
+        .groupby(["cohort", "offset"])["customer"].nunique()
+        .unstack(fill_value=0)
+    )
+
+
+def test_cohort_counts_match_naive_groupby():
+    df = _orders()
+    counts = cohorts.cohort_counts(df)
+    counts = counts[counts[0] > 0]
+    expected = _naive_counts(df).reindex(columns=counts.columns, fill_value=0)
+    np.testing.assert_array_equal(counts.index, expected.index)
+    np.testing.assert_array_equal(counts.to_numpy(), expected.to_numpy())
+
+
+def test_cohort_retention_with_index_codes():
+    df = _orders()
+    empty = pd.DataFrame({"order_id": [], "product_category_name_english": []})
+    rfm = pd.DataFrame({"customer_unique_id": []})
+    codes = CustomerIndex(df, empty, rfm).row_codes()
+    pd.testing.assert_frame_equal(cohorts.cohort_retention(df, codes), cohorts.cohort_retention(df))
+
+
+def test_cohort_retention_masks_unobservable_months():
+    retention = cohorts.cohort_retention(_orders())
+    assert (retention[0] == 100).all()
+    last_cohort = retention.iloc[-1].drop("cohort_size")
+    assert last_cohort.iloc[1:].isna().all()
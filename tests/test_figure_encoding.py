@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+import figure_encoding
+from figure_encoding import MIN_DPI, encode_figure, target_dpi
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    # Catat setiap percobaan encoding: (format, dpi, ukuran)
+    calls = []
+    render = figure_encoding._render
+
+    def recording_render(fig, fmt, dpi=None):
+        data = render(fig, fmt, dpi)
+        calls.append((fmt, dpi, len(data)))
+        return data
+
+    monkeypatch.setattr(figure_encoding, "_render", recording_render)
+    return calls
+
+
+def _bar_chart():
+    fig = Figure(figsize=(6, 4))
+    fig.add_subplot().bar(["a", "b", "c"], [3, 1, 2])
+    return fig
+
+
+def _noise_image():
+    # Derau acak hampir tidak bisa dikompresi: ukuran raster naik kira-kira sebanding DPI^2
+    fig = Figure(figsize=(8, 6))
+    fig.add_subplot().imshow(np.random.default_rng(0).random((300, 400)), interpolation="nearest")
+    return fig
+
+
+def test_simple_chart_uses_svg_when_it_fits(renders):
+    encoded = encode_figure(_bar_chart(), byte_budget=1_000_000, simple=True)
+    assert encoded.format == "svg" and encoded.dpi is None
+    assert encoded.nbytes == len(encoded.data) <= 1_000_000
+    assert [fmt for fmt, _, _ in renders] == ["svg"]
+
+
+def test_dpi_steps_down_until_raster_fits(renders):
+    fig = _noise_image()
+    start_dpi = target_dpi(fig, 1200)
+    # Anggaran di antara ukuran pada MIN_DPI dan pada DPI awal untuk format raster pertama
+    fmt = next(fmt for fmt in ("webp", "png") if figure_encoding._supports(fig, fmt))
+    budget = (len(figure_encoding._render(fig, fmt, MIN_DPI)) + len(figure_encoding._render(fig, fmt, start_dpi))) // 2
+    renders.clear()
+
+    encoded = encode_figure(fig, byte_budget=budget, viewport_width=1200)
+    assert encoded.format == fmt
+    assert encoded.nbytes <= budget
+    assert MIN_DPI <= encoded.dpi < start_dpi
+
+    attempts = [(dpi, size) for _, dpi, size in renders]
+    assert attempts[0][0] == start_dpi and attempts[0][1] > budget
+    dpis = [dpi for dpi, _ in attempts]
+    assert dpis == sorted(dpis, reverse=True) and len(set(dpis)) == len(dpis)
+    # Berhenti pada percobaan pertama yang muat, tanpa mencoba format lain
+    assert attempts[-1] == (encoded.dpi, encoded.nbytes)
+    assert all(size > budget for _, size in attempts[:-1])
+
+
+def test_smallest_encoding_returned_when_nothing_fits(renders):
+    encoded = encode_figure(_noise_image(), byte_budget=1_000, simple=True)
+    assert encoded.nbytes > 1_000
+
+    raster_attempts = [(fmt, dpi, size) for fmt, dpi, size in renders if fmt != "svg"]
+    assert renders[0][0] == "svg"
+    # Setiap format raster diturunkan sampai MIN_DPI, lalu yang terkecil dipilih
+    for fmt in {fmt for fmt, _, _ in raster_attempts}:
+        assert [dpi for f, dpi, _ in raster_attempts if f == fmt][-1] == MIN_DPI
+    assert encoded.nbytes == min(size for _, _, size in raster_attempts)
+    assert (encoded.format, encoded.dpi) in {(fmt, dpi) for fmt, dpi, size in raster_attempts if size == encoded.nbytes}
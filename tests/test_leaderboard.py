@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from customer_index import CustomerIndex
+from leaderboard import Leaderboard, top_k_positions
+
+
+def _frames():
+    master = pd.DataFrame({
+        "order_id": ["o1", "o2", "o3", "o4", "o5"],
+        "customer_unique_id": ["b", "a", "b", "c", "b"],
+        "customer_state": ["SP", "RJ", "MG", "SP", "RJ"],
+    })
+    items = pd.DataFrame({"order_id": ["o1", "o3", "o3", "o4"], "product_category_name_english": ["x", "y", "z", "x"]})
+    rfm = pd.DataFrame({
+        "customer_unique_id": ["a", "b", "c", "d"],
+        "Segment": ["Champions", "Champions", "Lost", "Lost"],
+        "Recency": [10, 20, 30, 40],
+        "Frequency": [1, 3, 1, 1],
+        "Monetary": [50.0, 300.0, 120.0, np.nan],
+    })
+    return master, items, rfm
+
+
+def test_top_k_positions_matches_full_sort():
+    values = np.random.default_rng(0).normal(size=1000)
+    for k in (0, 1, 10, 999, 1000, 5000):
+        expected = np.argsort(-values, kind="stable")[:k]
+        np.testing.assert_array_equal(top_k_positions(values, k), expected)
+
+
+def test_top_k_positions_puts_nan_last():
+    np.testing.assert_array_equal(top_k_positions([np.nan, 2.0, 5.0], 3), [2, 1, 0])
+
+
+def test_customer_index_vectorized_lookups():
+    master, items, rfm = _frames()
+    idx = CustomerIndex(master, items, rfm)
+    np.testing.assert_array_equal(idx.codes_for(["c", "zz", "a", "b"]), [2, -1, 0, 1])
+    np.testing.assert_array_equal(idx.order_counts(), [1, 3, 1])
+    np.testing.assert_array_equal(idx.first_order_values("customer_state"), ["RJ", "SP", "SP"])
+
+
+def test_leaderboard_top():
+    master, items, rfm = _frames()
+    board = Leaderboard(rfm, CustomerIndex(master, items, rfm))
+
+    top = board.top("Monetary", 2)
+    assert list(top["customer_unique_id"]) == ["b", "c"]
+    assert list(top["Jumlah Pesanan"]) == [3, 1]
+    assert list(top["customer_state"]) == ["SP", "SP"]
+
+    champions = board.top("Frequency", 5, "Segment", "Champions")
+    assert list(champions["customer_unique_id"]) == ["b", "a"]
+
+    # Pelanggan RFM tanpa pesanan tetap muncul, dengan 0 pesanan dan negara bagian kosong
+    customer_d = board.top("Jumlah Pesanan", 4).set_index("customer_unique_id").loc["d"]
+    assert customer_d["Jumlah Pesanan"] == 0
+    assert pd.isna(customer_d["customer_state"])
+
+    assert board.top("Monetary", 3, "Segment", "unknown").empty
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantile_sketch import SketchCube, TDigest
+
+QUANTILES = (0.001, 0.01, 0.1, 0.5, 0.9, 0.99, 0.999)
+
+
+def _lognormal(n=500_000, seed=0):
+    return np.random.default_rng(seed).lognormal(2, 0.8, n)
+
+
+def test_quantiles_match_numpy():
+    values = _lognormal()
+    digest = TDigest.from_values(values)
+    np.testing.assert_allclose(digest.quantile(QUANTILES), np.quantile(values, QUANTILES), rtol=0.01)
+    assert digest.total == len(values)
+    assert digest.min == values.min() and digest.max == values.max()
+    assert digest.mean() == pytest.approx(values.mean())
+
+
+def test_merge_all_matches_single_digest():
+    values = _lognormal(seed=1)
+    # Potongan dengan ukuran tidak rata, termasuk potongan kosong dan yang hanya berisi NaN
+    chunks = np.split(values, [10, 1_000, 1_000, 50_000, 300_000]) + [np.array([np.nan])]
+    merged = TDigest.merge_all([TDigest.from_values(chunk) for chunk in chunks])
+    single = TDigest.from_values(values)
+
+    assert merged.total == single.total == len(values)
+    assert merged.min == single.min and merged.max == single.max
+    assert merged.mean() == pytest.approx(single.mean())
+    np.testing.assert_allclose(merged.quantile(QUANTILES), np.quantile(values, QUANTILES), rtol=0.01)
+    np.testing.assert_allclose(merged.quantile(QUANTILES), single.quantile(QUANTILES), rtol=0.01)
+
+    incremental = TDigest()
+    for chunk in chunks:
+        incremental.merge(TDigest.from_values(chunk))
+    np.testing.assert_allclose(incremental.quantile(QUANTILES), np.quantile(values, QUANTILES), rtol=0.01)
+
+
+def test_empty_digest():
+    digest = TDigest.from_values([np.nan, np.nan])
+    assert digest.total == 0
+    assert np.isnan(digest.mean())
+    assert np.isnan(digest.quantile([0.5, 0.9])).all()
+    assert TDigest.merge_all([digest, TDigest()]).total == 0
+
+
+def _cube_frame(n=200_000, seed=2):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "review_score": rng.integers(1, 6, n),
+        "customer_state": rng.choice(["SP", "RJ", "MG"], n, p=[0.6, 0.3, 0.1]),
+        "delivery_time_days": rng.gamma(2.2, 5.5, n) + 1,
+    })
+
+
+def _expected(frame, by, quantiles):
+    grouped = frame.groupby(list(by))["delivery_time_days"] if by else frame["delivery_time_days"]
+    return np.atleast_2d(grouped.quantile(list(quantiles)).to_numpy().reshape(-1, len(quantiles)))
+
+
+def test_query_by_and_filters():
+    frame = _cube_frame()
+    cube = SketchCube(frame, "delivery_time_days", dims=("review_score", "customer_state"))
+    quantiles = (0.5, 0.9, 0.99)
+    columns = ["p50", "p90", "p99"]
+
+    # Tanpa pengelompokan (multiselect dikosongkan): satu baris untuk seluruh data
+    overall = cube.query(by=(), quantiles=quantiles)
+    assert len(overall) == 1
+    assert overall["total_orders"].iloc[0] == len(frame)
+    assert overall["mean"].iloc[0] == pytest.approx(frame["delivery_time_days"].mean())
+    np.testing.assert_allclose(overall[columns].to_numpy(), _expected(frame, (), quantiles), rtol=0.01)
+
+    by_state = cube.query(by=("customer_state",), quantiles=quantiles)
+    assert list(by_state["customer_state"]) == ["MG", "RJ", "SP"]
+    assert list(by_state["total_orders"]) == list(frame["customer_state"].value_counts().sort_index())
+    np.testing.assert_allclose(by_state[columns].to_numpy(), _expected(frame, ("customer_state",), quantiles), rtol=0.01)
+
+    # Nilai filter dibandingkan sebagai string, seperti key di dalam cube
+    filtered = frame[frame["review_score"] == 5]
+    by_state_5 = cube.query(by=("customer_state",), filters=(("review_score", 5),), quantiles=quantiles)
+    assert list(by_state_5["total_orders"]) == list(filtered["customer_state"].value_counts().sort_index())
+    np.testing.assert_allclose(by_state_5[columns].to_numpy(), _expected(filtered, ("customer_state",), quantiles), rtol=0.02)
+
+    only_sp = cube.query(by=(), filters=(("customer_state", "SP"),), quantiles=quantiles)
+    assert only_sp["total_orders"].iloc[0] == (frame["customer_state"] == "SP").sum()
+
+    both = cube.query(by=("review_score", "customer_state"), quantiles=quantiles)
+    assert len(both) == 15 and both["total_orders"].sum() == len(frame)
+
+    no_match = cube.query(by=("customer_state",), filters=(("review_score", 9),), quantiles=quantiles)
+    assert no_match.empty
+    assert list(no_match.columns) == ["customer_state", "total_orders", "mean"] + columns